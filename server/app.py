@@ -1,23 +1,64 @@
+import os
 import sys
+from functools import partial
 sys.path.append('.')
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from anomaly_detector import detect_spending_anomalies
 import pandas as pd
 
-# Import the feature_transformer module and add it to sys.modules
-# This tells Python where to find it when unpickling
-from ml import feature_transformer
-sys.modules['feature_transformer'] = feature_transformer
+# The ml modules import their siblings by bare name
+from ml import temporal_features
+sys.modules['temporal_features'] = temporal_features
+from ml import fused_lstm
+sys.modules['fused_lstm'] = fused_lstm
+from ml import model_artifact
+sys.modules['model_artifact'] = model_artifact
+from ml import inference_pipeline
+sys.modules['inference_pipeline'] = inference_pipeline
 
-# Now import ModelPipeline and load the model
-from ml.model_pipeline import ModelPipeline
+from ml.inference_pipeline import InferencePipeline
+from ml.forecast_cache import ForecastCache
+from ml.micro_batcher import MicroBatcher
+from ml.model_registry import ModelRegistry
+from ml.scenario_engine import ScenarioEngine
 
 app = Flask(__name__)
 CORS(app, supports_credentials=True)  # Allow all origins, headers, methods, with credentials support
 
 model_path = 'models/oracle_v1'
-predictor = ModelPipeline.load(model_path)
+# Per-user models live in models/users/<user_id>, other users get model_path
+user_models_path = 'models/users'
+# Precompute the next year of forecasts so most range requests are array slices
+horizon_days = 365
+
+
+def load_pipeline(model_dir):
+    # Serve from the torch-free single-file export when the model directory has one
+    if os.path.exists(os.path.join(model_dir, InferencePipeline.EXPORT_FILE)):
+        return InferencePipeline.load(model_dir, horizon_days=horizon_days)
+    
+    # Training-format models need torch and sklearn, only import them for those.
+    # feature_transformer is aliased so pickled transformers resolve when unpickling
+    from ml import feature_transformer
+    sys.modules['feature_transformer'] = feature_transformer
+    from ml import inference_backends
+    sys.modules['inference_backends'] = inference_backends
+    from ml.model_pipeline import ModelPipeline
+    # Category models load on first use, the rest (and the horizon) in the background
+    return ModelPipeline.load(model_dir, horizon_days=horizon_days, lazy=True, warm_up=True)
+
+
+registry = ModelRegistry(load_pipeline, root_dir=user_models_path, default_dir=model_path,
+                         max_bytes=512 * 1024 * 1024)
+# Load the default model up front
+registry.get()
+
+# Forecasts only depend on the model and the date
+forecast_cache = ForecastCache(max_entries=8192)
+
+# Cache misses from concurrent requests are merged into one inference per model
+batcher = MicroBatcher(window_ms=3, max_batch_size=32)
 
 
 @app.route('/api/anomalies', methods=['POST'])
@@ -64,7 +105,12 @@ def predict_spending():
             }), 400
             
         # Get predictions - returns a dictionary with dates as keys
-        predictions = predictor.predict(dates)
+        try:
+            predictor = registry.get(data['user_id'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        predictions = forecast_cache.predict(
+            predictor, dates, compute=partial(batcher.predict_by_category, predictor))
         
         # Format response
         response = {
@@ -88,10 +134,11 @@ def predict_params():
     try:
         data = request.json
         print(data)
-        # Validate required fields
-        if not all(key in data for key in ['user_id', 'time_range', 'scenario']):
+        # Validate required fields, either one scenario or a list of them
+        if not all(key in data for key in ['user_id', 'time_range']) or \
+                not any(key in data for key in ['scenario', 'scenarios']):
             return jsonify({
-                'error': 'Missing required parameters. Please provide user_id, time_range, and scenario.'
+                'error': 'Missing required parameters. Please provide user_id, time_range, and scenario or scenarios.'
             }), 400
         
         # Parse time range
@@ -106,56 +153,34 @@ def predict_params():
         print(dates)
             
         # Get predictions by category
-        predictions_by_category = predictor.predict_by_category(dates)
-        print(predictions_by_category)
-        # Calculate base predictions (sum of all categories for each date)
-        predictions_without_param = {}
-        for date in dates:
-            date_str = str(date.date())  # Convert to YYYY-MM-DD string format
-            predictions_without_param[date_str] = float(sum(
-                predictions.get(date, 0) 
-                for predictions in predictions_by_category.values()
-            ))
-
-        # Start with modified predictions equal to base predictions
-        predictions_with_param = predictions_without_param.copy()
-        print(predictions_with_param)
-        
-        # Apply scenario modifications
-        scenario = data['scenario']
-        
-        # Handle skip_expense
-        if scenario.get('skip_expense', {}).get('active'):
-            category = scenario['skip_expense']['category']
-            if category in predictions_by_category:
-                for date in dates:
-                    date_str = str(date.date())
-                    predictions_with_param[date_str] -= predictions_by_category[category].get(date, 0)
-        
-        # Handle new_expense
-        if scenario.get('new_expense', {}).get('active'):
-            category = scenario['new_expense']['category']
-            percent = float(scenario['new_expense']['percent'])
-            if category in predictions_by_category:
-                for date in dates:
-                    date_str = str(date.date())
-                    predictions_with_param[date_str] += predictions_by_category[category].get(date, 0) * percent
-        
-        # Handle reduce_expense
-        if scenario.get('reduce_expense', {}).get('active'):
-            category = scenario['reduce_expense']['category']
-            percent = float(scenario['reduce_expense']['percent'])
-            if category in predictions_by_category:
-                for date in dates:
-                    date_str = str(date.date())
-                    predictions_with_param[date_str] -= predictions_by_category[category].get(date, 0) * percent
-
+        try:
+            predictor = registry.get(data['user_id'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        predictions_by_category = forecast_cache.predict_by_category(
+            predictor, dates, compute=partial(batcher.predict_by_category, predictor))
+        
+        # One category x date forecast, every scenario is a row of category multipliers on it
+        engine = ScenarioEngine.from_predictions(predictions_by_category, dates)
+        scenarios = data['scenarios'] if 'scenarios' in data else [data['scenario']]
+        try:
+            predictions_with_params = engine.apply(scenarios)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return jsonify({'error': f'Invalid scenario: {str(e)}'}), 400
+        
+        date_strs = [str(date.date()) for date in dates]  # YYYY-MM-DD keys
+        
         # Format response
         response = {
             'user_id': data['user_id'],
-            'predictions_without_param': predictions_without_param,
-            'predictions_with_param': predictions_with_param
+            'predictions_without_param': dict(zip(date_strs, engine.baseline().tolist()))
         }
+        if 'scenarios' in data:
+            response['predictions_with_params'] = [
+                dict(zip(date_strs, predictions.tolist())) for predictions in predictions_with_params
+            ]
+        else:
+            response['predictions_with_param'] = dict(zip(date_strs, predictions_with_params[0].tolist()))
         
         return jsonify(response)
         
@@ -168,5 +193,14 @@ def predict_params():
 def health_check():
     return jsonify({'status': 'ok'})
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    return jsonify({
+        'model_registry': registry.stats(),
+        'forecast_cache': forecast_cache.stats(),
+        'micro_batcher': batcher.stats()
+    })
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
+    # Requests share the loaded model, the prediction path keeps no per-request state
+    app.run(host='0.0.0.0', port=8000, debug=True, threaded=True)
\ No newline at end of file
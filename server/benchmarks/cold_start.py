@@ -0,0 +1,69 @@
+"""Cold-start benchmark for the forecast serving path.
+
+Starts a fresh interpreter per backend, loads the model and serves one
+90-day forecast, then reports wall time and peak RSS.
+
+Usage (from server/):
+    python benchmarks/cold_start.py --model-dir models/oracle_v1
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOADERS = {
+    'torch': "from model_pipeline import ModelPipeline as Pipeline",
+    'numpy': "from inference_pipeline import InferencePipeline as Pipeline",
+}
+
+CHILD = """
+import time
+start = time.perf_counter()
+import resource, json, sys, io, contextlib
+sys.path.insert(0, 'ml')
+import pandas as pd
+{loader}
+with contextlib.redirect_stdout(io.StringIO()):
+    predictor = Pipeline.load({model_dir!r})
+loaded = time.perf_counter()
+predictor.predict(pd.date_range('2025-04-01', periods=90, freq='D'))
+done = time.perf_counter()
+print(json.dumps({{
+    'load_seconds': loaded - start,
+    'first_prediction_seconds': done - start,
+    'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'torch_imported': 'torch' in sys.modules
+}}))
+"""
+
+
+def measure(backend, model_dir, repeats):
+    """Best-of-N cold start for one backend"""
+    runs = []
+    for _ in range(repeats):
+        code = CHILD.format(loader=LOADERS[backend], model_dir=os.path.abspath(model_dir))
+        result = subprocess.run([sys.executable, '-c', code], cwd=SERVER_DIR,
+                                capture_output=True, text=True, check=True)
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run['first_prediction_seconds'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model-dir', default='models/oracle_v1')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    for backend in LOADERS:
+        stats = measure(backend, args.model_dir, args.repeats)
+        print(f"{backend:>6}: load {stats['load_seconds']:.2f}s, "
+              f"first prediction {stats['first_prediction_seconds']:.2f}s, "
+              f"peak RSS {stats['peak_rss_mb']:.0f} MB, "
+              f"torch imported: {stats['torch_imported']}")
+
+
+if __name__ == '__main__':
+    main()
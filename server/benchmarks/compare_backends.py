@@ -0,0 +1,27 @@
+"""Numerical parity and latency of each ModelPipeline inference backend.
+
+Usage (from server/):
+    python benchmarks/compare_backends.py --model-dir models/oracle_v1
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ml'))
+
+from inference_backends import BACKENDS
+from model_pipeline import ModelPipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model-dir', default='models/oracle_v1')
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    ModelPipeline.compare_backends(args.model_dir, backends=args.backends, repeats=args.repeats)
+
+
+if __name__ == '__main__':
+    main()
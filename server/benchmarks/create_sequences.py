@@ -0,0 +1,68 @@
+"""Speed and memory of training window construction on synthetic series.
+
+Compares the strided create_sequences against the per-window copy loop it
+replaced, through to the float32 training tensor.
+
+Usage (from server/):
+    python benchmarks/create_sequences.py --rows 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ml'))
+
+from model_pipeline import create_sequences, split_sequences, to_tensor
+import torch
+
+
+def create_sequences_loop(data, seq_length, n_features):
+    """Previous implementation: one copied slice per window, then np.array"""
+    xs, ys = [], []
+    for i in range(len(data) - seq_length):
+        xs.append(data[i:i+seq_length, :n_features])
+        ys.append(data[i+seq_length, -1])
+    return np.array(xs), np.array(ys)
+
+
+def measure(build, data, seq_length, n_features):
+    """Time and peak traced memory of building windows, and of the tensor copy"""
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    X, y = build(data, seq_length, n_features)
+    X_train, X_val, y_train, y_val = split_sequences(X, y)
+    windows_seconds = time.perf_counter() - start_time
+    windows_peak = tracemalloc.get_traced_memory()[1]
+
+    tensor = to_tensor(X_train, torch.device('cpu'))
+    total_seconds = time.perf_counter() - start_time
+    total_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del tensor
+    return windows_seconds, windows_peak, total_seconds, total_peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--features', type=int, default=12)
+    parser.add_argument('--seq-length', type=int, default=4)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        data = np.random.default_rng(0).uniform(size=(rows, args.features + 1))
+        print(f"{rows} rows x {args.features} features, seq_length {args.seq_length}")
+        for name, build in [('loop', create_sequences_loop), ('strided', create_sequences)]:
+            windows_seconds, windows_peak, total_seconds, total_peak = measure(
+                build, data, args.seq_length, args.features)
+            print(f"  {name:>8}: windows {windows_seconds * 1000:8.1f} ms, "
+                  f"peak {windows_peak / 2**20:7.1f} MB | "
+                  f"with tensor {total_seconds * 1000:8.1f} ms, peak {total_peak / 2**20:7.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
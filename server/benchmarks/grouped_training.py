@@ -0,0 +1,47 @@
+"""Wall-clock training time of one loop per category against grouped training.
+
+Usage (from server/):
+    python benchmarks/grouped_training.py --epochs 5
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ml'))
+
+import pandas as pd
+
+from model_pipeline import ModelPipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='data/financial_transactions.csv')
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data)
+    df['datetime'] = pd.to_datetime(df['date'] + ' ' + df['time'])
+    df = df[['amount', 'type', 'datetime', 'category']]
+    print(f"{df['category'].nunique()} categories, batch size {args.batch_size}")
+
+    baseline = None
+    for name, grouped in [('per-category', False), ('grouped', True)]:
+        predictor = ModelPipeline()
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            predictor.train(df, num_epochs=args.epochs, patience=args.epochs,
+                            batch_size=args.batch_size, grouped=grouped)
+        seconds = time.perf_counter() - start_time
+        baseline = baseline or seconds
+        mae = sum(history['mae'] for history in predictor.metadata['training_history'].values())
+        print(f"{name:>13}: {seconds:.1f}s, speedup {baseline / seconds:.2f}x, "
+              f"summed validation MAE {mae:.1f}")
+
+
+if __name__ == '__main__':
+    main()
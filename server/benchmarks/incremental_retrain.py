@@ -0,0 +1,59 @@
+"""Wall-clock time of a full retrain against an incremental one on the newest days.
+
+Trains on everything but the last --new-days days, then retrains with the
+full history both ways.
+
+Usage (from server/):
+    python benchmarks/incremental_retrain.py --epochs 20 --new-days 1
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ml'))
+
+import pandas as pd
+
+from model_pipeline import ModelPipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='data/financial_transactions.csv')
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--new-days', type=int, default=1)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data)
+    df['datetime'] = pd.to_datetime(df['date'] + ' ' + df['time'])
+    df = df[['amount', 'type', 'datetime', 'category']]
+    cutoff = df['datetime'].max().normalize() - pd.Timedelta(days=args.new_days - 1)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor = ModelPipeline()
+        predictor.train(df[df['datetime'] < cutoff], num_epochs=args.epochs)
+    print(f"{df['category'].nunique()} categories, {(df['datetime'] >= cutoff).sum()} "
+          f"new transactions since {cutoff.date()}")
+
+    save_dir = tempfile.mkdtemp()
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.save(save_dir)
+
+    baseline = None
+    for name, incremental in [('full', False), ('incremental', True)]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            retrained = ModelPipeline.load(save_dir)
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            retrained.retrain(df, num_epochs=args.epochs, incremental=incremental)
+        seconds = time.perf_counter() - start_time
+        baseline = baseline or seconds
+        print(f"{name:>12}: {seconds:.2f}s, speedup {baseline / seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
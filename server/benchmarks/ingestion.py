@@ -0,0 +1,96 @@
+"""Load time and memory of transaction CSVs: plain read_csv against the columnar cache.
+
+Writes a synthetic multi-user CSV in the simulator's layout, then loads it
+the way read_financial_transactions used to, on the first (parse and cache)
+and on later (cached) runs.
+
+Usage (from server/):
+    python benchmarks/ingestion.py --rows 100000 1000000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ml'))
+
+from transaction_store import cache_path, load_transactions
+
+TRAINING_COLUMNS = ['amount', 'type', 'datetime', 'category']
+
+
+def read_csv_default(path):
+    """Previous read_financial_transactions: default dtypes and datetime format inference"""
+    df = pd.read_csv(path)
+    df['datetime'] = pd.to_datetime(df['date'] + ' ' + df['time'])
+    df.drop(columns=['account_id', 'transaction_id', 'date', 'time'], inplace=True)
+    return df[TRAINING_COLUMNS]
+
+
+def write_synthetic_csv(path, rows, users=50, seed=0):
+    rng = np.random.default_rng(seed)
+    categories = ['food_and_drink', 'transportation', 'travel', 'entertainment', 'personal_care',
+                  'general_merchandise', 'general_services', 'loan_payments', 'income', 'savings']
+    days = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 5 * 365, rows), unit='D')
+    category = rng.choice(categories, rows)
+    pd.DataFrame({
+        'account_id': rng.choice([f'account_{index:04d}' for index in range(users)], rows),
+        'transaction_id': rng.integers(10**7, 10**8, rows),
+        'date': days.strftime('%Y-%m-%d'),
+        'time': [f"{hour}:{minute}" for hour, minute in zip(rng.integers(7, 22, rows), rng.integers(0, 60, rows))],
+        'activity': category,
+        'amount': rng.uniform(1, 500, rows).round(2),
+        'category': category,
+        'type': np.where(category == 'income', 'income', 'expense'),
+        'vendor_name': rng.choice([f'vendor_{index}' for index in range(200)], rows)
+    }).to_csv(path, index=False)
+
+
+def measure(load, path, cached):
+    """Wall time untraced, then peak traced memory of a second run, since tracing slows parsing"""
+    results = []
+    for trace in (False, True):
+        if not cached and os.path.exists(cache_path(path)):
+            os.remove(cache_path(path))
+        if trace:
+            tracemalloc.start()
+        start_time = time.perf_counter()
+        df = load(path)
+        results.append(time.perf_counter() - start_time)
+        if trace:
+            results.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return results[0], results[2], df.memory_usage(deep=True).sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp()
+    try:
+        for rows in args.rows:
+            path = os.path.join(data_dir, f'transactions_{rows}.csv')
+            write_synthetic_csv(path, rows)
+            print(f"{rows} transactions, {os.path.getsize(path) / 2**20:.1f} MB CSV")
+            load_cached = lambda path: load_transactions(path, TRAINING_COLUMNS)
+            for name, load, cached in [('read_csv', read_csv_default, False),
+                                       ('first run', load_cached, False),
+                                       ('cached', load_cached, True)]:
+                seconds, peak, frame_bytes = measure(load, path, cached)
+                print(f"  {name:>9}: {seconds * 1000:8.1f} ms, peak {peak / 2**20:7.1f} MB, "
+                      f"frame {frame_bytes / 2**20:6.1f} MB")
+            print(f"  cache file {os.path.getsize(cache_path(path)) / 2**20:.1f} MB")
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
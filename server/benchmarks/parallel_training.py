@@ -0,0 +1,46 @@
+"""Wall-clock training time of ModelPipeline.train for several worker counts.
+
+Usage (from server/):
+    python benchmarks/parallel_training.py --workers 1 2 4 8 --epochs 5
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ml'))
+
+import pandas as pd
+
+from model_pipeline import ModelPipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='data/financial_transactions.csv')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count()])
+    parser.add_argument('--threads-per-worker', type=int, default=1)
+    parser.add_argument('--epochs', type=int, default=5)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data)
+    df['datetime'] = pd.to_datetime(df['date'] + ' ' + df['time'])
+    df = df[['amount', 'type', 'datetime', 'category']]
+    print(f"{df['category'].nunique()} categories, {os.cpu_count()} cores")
+
+    baseline = None
+    for workers in args.workers:
+        predictor = ModelPipeline()
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            predictor.train(df, num_epochs=args.epochs, patience=args.epochs,
+                            workers=workers, threads_per_worker=args.threads_per_worker)
+        seconds = time.perf_counter() - start_time
+        baseline = baseline or seconds
+        print(f"{workers:>3} workers: {seconds:.1f}s, speedup {baseline / seconds:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Import-time benchmark for the API and training entry points.
+
+Imports each module graph in a fresh interpreter and reports the best
+wall time of several runs. Exits non-zero when a graph goes over its time
+budget or pulls in a module it should not, so it can gate CI.
+
+Usage (from server/):
+    python benchmarks/startup.py [--repeats 5] [--slack 1.0]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module graphs, their import time budgets and modules they must not import.
+# 'serving' is everything app.py imports before a model is loaded.
+GRAPHS = {
+    'serving': {
+        'imports': ['flask', 'flask_cors', 'anomaly_detector', 'inference_pipeline',
+                    'forecast_cache', 'micro_batcher', 'model_registry'],
+        'budget_ms': 1000,
+        'forbidden': ['torch', 'sklearn', 'scipy', 'matplotlib'],
+    },
+    'model_pipeline': {
+        'imports': ['model_pipeline'],
+        'budget_ms': 6000,
+        'forbidden': ['matplotlib', 'sklearn.model_selection', 'sklearn.metrics'],
+    },
+}
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, 'ml')
+sys.path.insert(1, '.')
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'import_ms': elapsed * 1000, 'modules': sorted(sys.modules)}}))
+"""
+
+
+def measure(graph, repeats):
+    """Best-of-N import time of a module graph, and the modules it loaded"""
+    code = CHILD.format(imports='\n'.join(f'import {name}' for name in graph['imports']))
+    runs = []
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, '-c', code], cwd=SERVER_DIR,
+                                capture_output=True, text=True, check=True)
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run['import_ms'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--slack', type=float, default=1.0,
+                        help='Multiply every budget, for slower machines')
+    args = parser.parse_args()
+
+    failures = []
+    for name, graph in GRAPHS.items():
+        stats = measure(graph, args.repeats)
+        budget_ms = graph['budget_ms'] * args.slack
+        leaked = [module for module in graph['forbidden'] if module in stats['modules']]
+        print(f"{name:>14}: {stats['import_ms']:.0f} ms (budget {budget_ms:.0f} ms), "
+              f"forbidden imports: {leaked or 'none'}")
+
+        if stats['import_ms'] > budget_ms:
+            failures.append(f"{name} import took {stats['import_ms']:.0f} ms, budget {budget_ms:.0f} ms")
+        if leaked:
+            failures.append(f"{name} imported {', '.join(leaked)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Speed and memory of training data preparation on synthetic transaction histories.
+
+Compares the single-pass daily matrix against the per-category merges it
+replaced, through to every category's training frame.
+
+Usage (from server/):
+    python benchmarks/training_matrix.py --rows 100000 1000000 --categories 10
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ml'))
+
+from feature_transformer import FeatureTransformer
+from model_pipeline import ModelPipeline
+
+
+def build_category_frame_merge(df_train, category):
+    """Previous implementation: deduplicate and merge the whole frame per category"""
+    feature_cols = [col for col in df_train.columns if col not in ['amount', 'category', 'datetime']]
+    full_dates_df = pd.DataFrame({'datetime': df_train['datetime'].unique()})
+    full_dates_df = full_dates_df.merge(
+        df_train[['datetime'] + feature_cols].drop_duplicates(), on='datetime', how='left')
+    category_data = df_train[df_train['category'] == category]
+    category_df = full_dates_df.merge(category_data[['datetime', 'amount']], on='datetime', how='left')
+    category_df = category_df.sort_values('datetime')
+    category_df['amount'] = category_df['amount'].fillna(0)
+    category_df['category'] = category
+    return category_df
+
+
+def merge_frames(pipeline, df_train, feature_transformer, categories):
+    return {category: build_category_frame_merge(df_train, category) for category in categories}
+
+
+def matrix_frames(pipeline, df_train, feature_transformer, categories):
+    matrix = pipeline._build_training_matrix(df_train, feature_transformer, categories)
+    return {category: pipeline._build_category_frame(matrix, category) for category in categories}
+
+
+def synthetic_transactions(rows, n_categories, seed=0):
+    """Transactions at random minutes over five years"""
+    rng = np.random.default_rng(seed)
+    minutes = rng.integers(0, 5 * 365 * 24 * 60, rows)
+    return pd.DataFrame({
+        'datetime': pd.Timestamp('2020-01-01') + pd.to_timedelta(minutes, unit='min'),
+        'amount': rng.uniform(1, 500, rows).round(2),
+        'type': 'expense',
+        'category': rng.choice([f'category_{index}' for index in range(n_categories)], rows)
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--categories', type=int, default=10)
+    args = parser.parse_args()
+
+    pipeline = ModelPipeline()
+    for rows in args.rows:
+        feature_transformer = FeatureTransformer()
+        df_train = feature_transformer.fit_transform(synthetic_transactions(rows, args.categories))
+        categories = df_train['category'].unique()
+        print(f"{rows} transactions, {len(categories)} categories")
+        for name, build in [('merge', merge_frames), ('matrix', matrix_frames)]:
+            tracemalloc.start()
+            start_time = time.perf_counter()
+            frames = build(pipeline, df_train, feature_transformer, categories)
+            seconds = time.perf_counter() - start_time
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            frame_rows = len(next(iter(frames.values())))
+            print(f"  {name:>7}: {seconds * 1000:8.1f} ms, peak {peak / 2**20:7.1f} MB, "
+                  f"{frame_rows} rows per category")
+
+
+if __name__ == '__main__':
+    main()
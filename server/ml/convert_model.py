@@ -0,0 +1,43 @@
+"""Convert a ModelPipeline save directory into the single-file serving artifact.
+
+Loads the per-category model.pth and scalers.pkl files once (this needs torch)
+and writes InferencePipeline.EXPORT_FILE next to them, which
+InferencePipeline.load then maps without torch or pickle.
+
+Usage (from server/):
+    python ml/convert_model.py models/oracle_v1 [models/users/<user_id> ...]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+# Pickles saved through app.py or the tests reference ml.feature_transformer
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_pipeline import ModelPipeline
+
+
+def convert_model_dir(save_dir):
+    """Write the serving artifact for a saved ModelPipeline, returns its path"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline = ModelPipeline.load(save_dir, backend='fused')
+    if pipeline.engine is None:
+        raise ValueError(f"Category models in {save_dir} cannot be fused into one artifact")
+    return pipeline.export_artifact(save_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('model_dirs', nargs='+')
+    args = parser.parse_args()
+
+    for model_dir in args.model_dirs:
+        path = convert_model_dir(model_dir)
+        size_kb = os.path.getsize(path) / 1024
+        print(f"Wrote {path} ({size_kb:.0f} KB)")
+
+
+if __name__ == '__main__':
+    main()
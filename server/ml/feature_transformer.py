@@ -2,6 +2,8 @@ import numpy as np
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.preprocessing import OneHotEncoder
 
+from temporal_features import add_temporal_features
+
 
 class FeatureTransformer(BaseEstimator, TransformerMixin):
     def __init__(self):
@@ -29,39 +31,43 @@ class FeatureTransformer(BaseEstimator, TransformerMixin):
         if self.std_year_ == 0:
             self.std_year_ = 1  # Prevent division by zero
             
-        return self.transform(X)
+        return self.transform_for_training(X)
         
     def transform(self, X):
         """Transform data differently based on training vs prediction mode"""
-        result = X.copy()
+        if self.training_mode:
+            return self.transform_for_training(X)
+        return self.transform_for_inference(X)
+    
+    def transform_for_training(self, X):
+        """Add temporal features and drop income and transfers.
         
-        # Always add these temporal features, regardless of mode
-        result.loc[:, 'day_of_week'] = result['datetime'].dt.dayofweek
-        result.loc[:, 'day_of_week_sin'] = np.sin(result['day_of_week'] * (2 * np.pi / 7))
-        result.loc[:, 'day_of_week_cos'] = np.cos(result['day_of_week'] * (2 * np.pi / 7))
+        Does not read or change the transformer mode, so it is safe to call
+        from several threads sharing one fitted transformer.
+        """
+        result = self._add_temporal_features(X)
         
-        result.loc[:, 'day_of_month'] = result['datetime'].dt.day
-        result.loc[:, 'day_of_month_sin'] = np.sin(result['day_of_month'] * (2 * np.pi / 31))
-        result.loc[:, 'day_of_month_cos'] = np.cos(result['day_of_month'] * (2 * np.pi / 31))
+        # Additional training-only transformations
+        return result[~result['type'].isin(['income', 'transfer'])]
+    
+    def transform_for_inference(self, X):
+        """Add temporal features for prediction dates.
         
-        result.loc[:, 'month'] = result['datetime'].dt.month
-        result.loc[:, 'month_sin'] = np.sin(result['month'] * (2 * np.pi / 12))
-        result.loc[:, 'month_cos'] = np.cos(result['month'] * (2 * np.pi / 12))
+        Does not read or change the transformer mode, so it is safe to call
+        from several threads sharing one fitted transformer.
+        """
+        result = self._add_temporal_features(X)
         
-        # Add normalized year feature
-        if self.mean_year_ is not None and self.std_year_ is not None:
-            result.loc[:, 'year_norm'] = (result['datetime'].dt.year - self.mean_year_) / self.std_year_
-        
-        if self.training_mode:
-            # Additional training-only transformations
-            result = result[~result['type'].isin(['income', 'transfer'])]
-        else:
-            # Add default type for prediction if needed
-            if 'type' not in result.columns:
-                result.loc[:, 'type'] = 'expense'
+        # Add default type for prediction if needed
+        if 'type' not in result.columns:
+            result.loc[:, 'type'] = 'expense'
         
         return result
     
+    def _add_temporal_features(self, X):
+        """Temporal features shared by training and prediction, on a copy of X"""
+        return add_temporal_features(X, self.mean_year_, self.std_year_)
+    
     def _transform_training_data(self, X):
         """Transform training data with full feature engineering"""
         # Filter out income and transfers
@@ -120,5 +126,5 @@ class FeatureTransformer(BaseEstimator, TransformerMixin):
         }
     
     def set_mode(self, training=True):
-        """Set the transformer mode"""
+        """Set the mode used by transform(), prefer the explicit transform_for_* methods"""
         self.training_mode = training
@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+class ForecastCache:
+    """In-process LRU cache of per-category daily forecasts.
+
+    Entries are keyed by (model_dir, model_version, date) and hold the forecast
+    of every category for that date, so overlapping date ranges only run inference for
+    the dates that are not cached yet. Memory is bounded by max_entries.
+    """
+
+    def __init__(self, max_entries=8192):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def predict_by_category(self, predictor, dates, compute=None):
+        """Same result as predictor.predict_by_category, computing only uncached dates"""
+        if compute is None:
+            compute = predictor.predict_by_category
+
+        model_key = (predictor.model_dir, predictor.metadata['model_version'])
+        dates = pd.DatetimeIndex(pd.to_datetime(dates)).unique()
+
+        forecasts = {}
+        missing_dates = []
+        with self._lock:
+            for date in dates:
+                key = model_key + (date,)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    forecasts[date] = self._entries[key]
+                    self.hits += 1
+                else:
+                    missing_dates.append(date)
+                    self.misses += 1
+
+        if missing_dates:
+            computed = compute(pd.DatetimeIndex(missing_dates))
+            new_forecasts = {date: {} for date in missing_dates}
+            for category, predictions in computed.items():
+                for date, amount in predictions.items():
+                    new_forecasts[pd.Timestamp(date)][category] = amount
+            forecasts.update(new_forecasts)
+
+            with self._lock:
+                for date, by_category in new_forecasts.items():
+                    self._entries[model_key + (date,)] = by_category
+                    self._entries.move_to_end(model_key + (date,))
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+        return {
+            category: {
+                date: forecasts[date][category]
+                for date in dates if category in forecasts[date]
+            }
+            for category in predictor.categories
+        }
+
+    def predict(self, predictor, dates, compute=None):
+        """Total forecast across categories for each date"""
+        predictions_by_category = self.predict_by_category(predictor, dates, compute)
+        dates = pd.DatetimeIndex(pd.to_datetime(dates)).unique()
+        return {
+            date: sum(predictions.get(date, 0) for predictions in predictions_by_category.values())
+            for date in dates
+        }
+
+    def clear(self):
+        """Drop every cached forecast"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
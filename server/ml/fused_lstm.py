@@ -0,0 +1,169 @@
+import numpy as np
+
+
+def _sigmoid(x):
+    # tanh form avoids overflow warnings for large negative gates
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+def _lstm_cell(gates, c):
+    """One LSTM step from the summed input and recurrent projections"""
+    # PyTorch gate order: input, forget, cell, output
+    i, f, g, o = np.split(gates, 4, axis=-1)
+    c = _sigmoid(f) * c + _sigmoid(i) * np.tanh(g)
+    h = _sigmoid(o) * np.tanh(c)
+    return h, c
+
+
+def _lstm_layer(x, weight_ih, weight_hh, bias):
+    """Run one stacked LSTM layer over x of shape [categories, batch, seq_len, input_size]"""
+    n_categories, batch_size, seq_length, _ = x.shape
+    hidden_size = weight_hh.shape[1]
+
+    # Input projections for every category, date and time step in one batched matmul
+    gates_x = np.matmul(x.reshape(n_categories, batch_size * seq_length, -1), weight_ih)
+    gates_x = gates_x.reshape(n_categories, batch_size, seq_length, 4 * hidden_size)
+    gates_x += bias[:, None, None, :]
+
+    h = np.zeros((n_categories, batch_size, hidden_size), dtype=x.dtype)
+    c = np.zeros((n_categories, batch_size, hidden_size), dtype=x.dtype)
+    out = np.empty((n_categories, batch_size, seq_length, hidden_size), dtype=x.dtype)
+
+    for t in range(seq_length):
+        gates = gates_x[:, :, t, :]
+        if t > 0:
+            # Initial state is zero, so the recurrent term only matters after the first step
+            gates = gates + np.matmul(h, weight_hh)
+        h, c = _lstm_cell(gates, c)
+        out[:, :, t, :] = h
+
+    return out
+
+
+class FusedLSTM:
+    """All category LSTMModels stacked into grouped arrays and evaluated together.
+
+    Every array carries a leading category axis, so a single batched matmul per
+    layer evaluates every category for every date. Scalers are folded in as
+    per-category min/scale vectors.
+    """
+
+    def __init__(self, categories, feature_columns, weights):
+        self.categories = list(categories)
+        self.feature_columns = list(feature_columns)
+        self.weights = weights
+        self.hidden_size = weights['lstm1_weight_hh'].shape[1]
+
+    @classmethod
+    def from_pipeline(cls, models, scalers):
+        """Stack the weights and scalers of every category model"""
+        categories = list(models.keys())
+        if not categories:
+            raise ValueError("No category models to fuse")
+
+        feature_columns = scalers[categories[0]]['feature_columns']
+        for category in categories:
+            if list(scalers[category]['feature_columns']) != list(feature_columns):
+                raise ValueError(f"Feature columns differ for category: {category}")
+
+        state_dicts = [
+            {name: tensor.detach().cpu().numpy() for name, tensor in models[category].state_dict().items()}
+            for category in categories
+        ]
+        shapes = {name: array.shape for name, array in state_dicts[0].items()}
+        for category, state_dict in zip(categories, state_dicts):
+            if {name: array.shape for name, array in state_dict.items()} != shapes:
+                raise ValueError(f"Model architecture differs for category: {category}")
+
+        def stack(values):
+            return np.ascontiguousarray(np.stack(values), dtype=np.float32)
+
+        weights = {}
+        for layer in ['lstm1', 'lstm2']:
+            # Transpose so inputs multiply on the left: [categories, in_features, 4 * hidden]
+            weights[f'{layer}_weight_ih'] = stack([sd[f'{layer}.weight_ih_l0'].T for sd in state_dicts])
+            weights[f'{layer}_weight_hh'] = stack([sd[f'{layer}.weight_hh_l0'].T for sd in state_dicts])
+            weights[f'{layer}_bias'] = stack([sd[f'{layer}.bias_ih_l0'] + sd[f'{layer}.bias_hh_l0']
+                                              for sd in state_dicts])
+        weights['fc_weight'] = stack([sd['fc.weight'].T for sd in state_dicts])
+        weights['fc_bias'] = stack([sd['fc.bias'] for sd in state_dicts])
+
+        # MinMaxScaler.transform is X * scale_ + min_
+        weights['feature_scale'] = np.stack([scalers[c]['feature_scaler'].scale_ for c in categories])
+        weights['feature_min'] = np.stack([scalers[c]['feature_scaler'].min_ for c in categories])
+        weights['target_scale'] = np.stack([scalers[c]['target_scaler'].scale_[0] for c in categories])
+        weights['target_min'] = np.stack([scalers[c]['target_scaler'].min_[0] for c in categories])
+
+        return cls(categories, feature_columns, weights)
+
+    def _scale_features(self, features):
+        """Scale per category in float64 like MinMaxScaler, the network then runs in float32"""
+        w = self.weights
+        return (features[None] * w['feature_scale'][:, None, None, :]
+                + w['feature_min'][:, None, None, :]).astype(np.float32)
+
+    def _output(self, h):
+        """fc head and inverse target scaling on the last hidden state [categories, batch, hidden]"""
+        w = self.weights
+        prediction = np.matmul(h, w['fc_weight']) + w['fc_bias'][:, None, :]
+        prediction = prediction[:, :, 0]
+
+        # MinMaxScaler.inverse_transform is (X - min_) / scale_
+        prediction -= w['target_min'][:, None].astype(np.float32)
+        prediction /= w['target_scale'][:, None].astype(np.float32)
+        return prediction
+
+    def predict(self, features):
+        """Predict amounts for every category.
+
+        Args:
+            features: Unscaled features, [num_dates, n_features] for length-1
+                sequences or [num_dates, seq_len, n_features]
+
+        Returns:
+            Array of shape [categories, num_dates] in the original amount units
+        """
+        w = self.weights
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim == 2:
+            features = features[:, None, :]
+
+        x = self._scale_features(features)
+        out = _lstm_layer(x, w['lstm1_weight_ih'], w['lstm1_weight_hh'], w['lstm1_bias'])
+        out = _lstm_layer(out, w['lstm2_weight_ih'], w['lstm2_weight_hh'], w['lstm2_bias'])
+
+        # Last time step through the fc head: [categories, num_dates]
+        return self._output(out[:, :, -1, :])
+
+    def initial_state(self):
+        """Zero (h, c) of both layers, each of shape [categories, hidden_size]"""
+        shape = (len(self.categories), self.hidden_size)
+        return {name: np.zeros(shape, dtype=np.float32) for name in ['h1', 'c1', 'h2', 'c2']}
+
+    def step(self, features, state):
+        """Advance every category's LSTM state by one time step.
+
+        Stepping through a sequence from initial_state() gives the same outputs
+        as predict() on that sequence, one step at a time.
+
+        Args:
+            features: Unscaled features of one time step, [n_features]
+            state: Dictionary from initial_state() or a previous step, not modified
+
+        Returns:
+            prediction: Array of shape [categories] in the original amount units
+            state: The advanced state
+        """
+        w = self.weights
+        x = self._scale_features(np.asarray(features, dtype=np.float64)[None, None, :])[:, 0]
+
+        gates = np.matmul(x, w['lstm1_weight_ih']) + w['lstm1_bias'][:, None, :]
+        gates += np.matmul(state['h1'][:, None, :], w['lstm1_weight_hh'])
+        h1, c1 = _lstm_cell(gates, state['c1'][:, None, :])
+
+        gates = np.matmul(h1, w['lstm2_weight_ih']) + w['lstm2_bias'][:, None, :]
+        gates += np.matmul(state['h2'][:, None, :], w['lstm2_weight_hh'])
+        h2, c2 = _lstm_cell(gates, state['c2'][:, None, :])
+
+        state = {'h1': h1[:, 0], 'c1': c1[:, 0], 'h2': h2[:, 0], 'c2': c2[:, 0]}
+        return self._output(h2)[:, 0], state
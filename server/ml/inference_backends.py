@@ -0,0 +1,108 @@
+import copy
+import io
+import warnings
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+
+# Backends selectable in ModelPipeline.load. 'fused' is the NumPy engine over all
+# categories, the others run one model per category. 'eager' comes first as the
+# parity reference for ModelPipeline.compare_backends. 'quantized' runs dynamic
+# int8 copies of the eager models on CPU.
+BACKENDS = ('eager', 'fused', 'torchscript', 'onnx', 'quantized')
+
+TORCHSCRIPT_FILE = 'model.pt'
+ONNX_FILE = 'model.onnx'
+
+
+def export_torchscript(model, n_features, path):
+    """Trace and freeze a category model into a TorchScript file"""
+    model.eval()
+    example = torch.zeros(2, 1, n_features)
+    with warnings.catch_warnings():
+        # torch.jit is deprecated upstream but still the lightest serving format here
+        warnings.simplefilter('ignore', FutureWarning)
+        # nn.LSTM's hidden state shape checks trace as constants, the batch size stays dynamic
+        warnings.simplefilter('ignore', torch.jit.TracerWarning)
+        with torch.no_grad():
+            traced = torch.jit.freeze(torch.jit.trace(copy.deepcopy(model).cpu(), example))
+        torch.jit.save(traced, path)
+
+
+def export_onnx(model, n_features, path):
+    """Export a category model to ONNX with dynamic batch and sequence length"""
+    model.eval()
+    example = torch.zeros(2, 1, n_features)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        torch.onnx.export(copy.deepcopy(model).cpu(), (example,), path,
+                          input_names=['x'], output_names=['amount'],
+                          dynamic_axes={'x': {0: 'batch', 1: 'seq'}, 'amount': {0: 'batch'}},
+                          dynamo=False)
+
+
+def quantize_dynamic(model):
+    """int8 dynamic quantization of the LSTM and Linear layers, CPU only"""
+    with warnings.catch_warnings():
+        # torch.ao.quantization is deprecated upstream in favour of torchao
+        warnings.simplefilter('ignore', DeprecationWarning)
+        warnings.simplefilter('ignore', UserWarning)
+        return torch.ao.quantization.quantize_dynamic(
+            copy.deepcopy(model).cpu().eval(), {nn.LSTM, nn.Linear}, dtype=torch.qint8)
+
+
+def module_bytes(model):
+    """Resident size of a module's weights, including int8 packed weights"""
+    def tensor_bytes(value):
+        if isinstance(value, torch.Tensor):
+            return value.numel() * value.element_size()
+        if isinstance(value, (tuple, list)):
+            return sum(tensor_bytes(item) for item in value)
+        if isinstance(value, torch.ScriptObject):
+            # Packed quantized LSTM and Linear parameters
+            return tensor_bytes(value.__getstate__())
+        return 0
+    return sum(tensor_bytes(value) for value in model.state_dict().values())
+
+
+def state_dict_bytes(model):
+    """Serialized size of a model's weights"""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes
+
+
+def eager_runner(model, device):
+    """Run the torch module as is"""
+    model.eval()
+
+    def run(X):
+        with torch.no_grad():
+            return model(torch.from_numpy(X).to(device)).cpu().numpy()
+    return run
+
+
+def torchscript_runner(path, device):
+    """Run a frozen TorchScript export under inference mode"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        module = torch.jit.load(path, map_location=device)
+
+    def run(X):
+        with torch.inference_mode():
+            return module(torch.from_numpy(X).to(device)).cpu().numpy()
+    return run
+
+
+def onnx_runner(path):
+    """Run an ONNX export with onnxruntime on CPU"""
+    # Optional dependency, only needed when the onnx backend is selected
+    import onnxruntime as ort
+
+    session = ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+
+    def run(X):
+        return session.run(None, {'x': np.ascontiguousarray(X, dtype=np.float32)})[0]
+    return run
@@ -0,0 +1,278 @@
+import mmap
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from fused_lstm import FusedLSTM
+from model_artifact import read_artifact, write_artifact
+from temporal_features import InferenceFeatureTransformer
+
+
+class InferencePipeline:
+    """Inference-only forecasting pipeline backed by the fused NumPy engine.
+    
+    Serves predict and predict_by_category from the single-file artifact
+    written by ModelPipeline.save, so it needs neither torch, sklearn nor pickle.
+    ModelPipeline extends it with training and the torch models.
+    """
+    
+    EXPORT_FILE = 'model.oracle'
+    
+    def __init__(self):
+        self.feature_transformer = None
+        
+        # Directory the pipeline was loaded from, None if trained in process
+        self.model_dir = None
+        
+        # Fused engine evaluating every category at once
+        self.engine = None
+        
+        # Optional precomputed category x date forecast table
+        self.forecast_horizon = None
+        
+        # True when the engine weights are read-only views into the mapped export file
+        self.file_mapped = False
+        
+        self.metadata = {
+            'last_trained': None,
+            'training_history': {},
+            'model_version': '1.0'
+        }
+    
+    @property
+    def categories(self):
+        """Categories the pipeline predicts, in prediction order"""
+        return list(self.engine.categories) if self.engine is not None else []
+    
+    def _prepare_prediction_data(self, dates):
+        """Transform the requested dates once into the feature frame shared by all categories"""
+        if not isinstance(dates, pd.DataFrame):
+            dates = pd.DataFrame({'datetime': pd.to_datetime(dates)})
+        
+        # Stateless call, concurrent requests can share one transformer
+        transformed_data = self.feature_transformer.transform_for_inference(dates)
+        
+        # One row per date, in the order the dates were requested
+        return transformed_data.drop_duplicates(subset='datetime')
+
+    def _predict_all_categories(self, transformed_data, categories=None):
+        """Predict every category, or only the given ones, for every date
+        
+        Returns:
+            Dictionary with categories as keys and arrays of amounts as values
+        """
+        features = transformed_data[self.engine.feature_columns].to_numpy()
+        predictions = dict(zip(self.engine.categories, self.engine.predict(features)))
+        if categories is not None:
+            predictions = {category: predictions[category] for category in categories
+                           if category in predictions}
+        return predictions
+
+    def _forecast_categories(self, dates, categories=None):
+        """Forecast every category, or only the given ones, for the unique requested dates.
+        
+        Dates inside the precomputed horizon are sliced from the table, the rest
+        go through live inference.
+        
+        Returns:
+            unique_dates: Requested dates in order, without duplicates
+            predictions: Dictionary with categories as keys and arrays of amounts as values
+        """
+        if not isinstance(dates, pd.DataFrame):
+            dates = pd.DataFrame({'datetime': pd.to_datetime(dates)})
+        unique_dates = dates['datetime'].unique()
+        
+        if self.forecast_horizon is None:
+            return unique_dates, self._predict_all_categories(self._prepare_prediction_data(dates),
+                                                              categories)
+        
+        horizon = self.forecast_horizon
+        positions = horizon['dates'].get_indexer(unique_dates)
+        in_horizon = positions >= 0
+        
+        if in_horizon.all():
+            return unique_dates, {
+                category: horizon['values'][index, positions]
+                for index, category in enumerate(horizon['categories'])
+                if categories is None or category in categories
+            }
+        
+        # Fall back to live inference for dates outside the horizon
+        live_dates = dates[dates['datetime'].isin(unique_dates[~in_horizon])]
+        live_predictions = self._predict_all_categories(self._prepare_prediction_data(live_dates),
+                                                        categories)
+        
+        predictions = {}
+        for index, category in enumerate(horizon['categories']):
+            if category not in live_predictions:
+                continue
+            category_predictions = np.empty(len(unique_dates), dtype=np.float32)
+            category_predictions[in_horizon] = horizon['values'][index, positions[in_horizon]]
+            category_predictions[~in_horizon] = live_predictions[category]
+            predictions[category] = category_predictions
+        return unique_dates, predictions
+
+    def predict(self, dates):
+        """Make predictions for all categories for given dates"""
+        unique_dates, category_predictions = self._forecast_categories(dates)
+        
+        # Sum category predictions date by date, in category order
+        total_predictions = np.zeros(len(unique_dates), dtype=np.float32)
+        for predictions in category_predictions.values():
+            total_predictions += predictions
+        
+        predictions_by_date = dict(zip(unique_dates, total_predictions))
+        
+        # Create and save prediction plot
+        # self._create_prediction_plot(predictions_by_date)
+        
+        return predictions_by_date
+
+    def predict_by_category(self, dates, categories=None):
+        """Make predictions for each category separately for given dates
+        
+        Args:
+            dates: Dates to predict
+            categories: Only predict these categories, defaults to all of them
+        """
+        if categories is None:
+            categories = self.categories
+        else:
+            categories = [category for category in self.categories if category in categories]
+        unique_dates, category_predictions = self._forecast_categories(dates, categories)
+        
+        # Store predictions for each category
+        predictions_by_category = {}
+        
+        for category in categories:
+            predictions_by_category[category] = {
+                date: float(prediction)
+                for date, prediction in zip(unique_dates, category_predictions.get(category, []))
+            }
+        
+        return predictions_by_category
+
+    def build_forecast_horizon(self, horizon_days=365, start_date=None):
+        """Precompute a dense category x date forecast table.
+        
+        Args:
+            horizon_days: Number of consecutive days to precompute
+            start_date: First day of the horizon, defaults to today
+        """
+        if start_date is None:
+            start_date = pd.Timestamp.now().normalize()
+        
+        start_time = time.perf_counter()
+        self.forecast_horizon = None
+        dates = pd.date_range(start=start_date, periods=horizon_days, freq='D')
+        unique_dates, category_predictions = self._forecast_categories(dates)
+        
+        categories = list(category_predictions.keys())
+        values = np.vstack([category_predictions[category] for category in categories]) \
+            if categories else np.empty((0, len(unique_dates)), dtype=np.float32)
+        
+        self.forecast_horizon = {
+            'dates': pd.DatetimeIndex(unique_dates),
+            'categories': categories,
+            'values': values
+        }
+        
+        # Report build cost alongside the model metadata
+        self.metadata['forecast_horizon'] = {
+            'start_date': str(dates[0].date()),
+            'end_date': str(dates[-1].date()),
+            'horizon_days': horizon_days,
+            'categories': len(categories),
+            'build_seconds': time.perf_counter() - start_time,
+            'memory_bytes': int(values.nbytes + self.forecast_horizon['dates'].nbytes)
+        }
+        print(f"Built {horizon_days}-day forecast horizon in "
+              f"{self.metadata['forecast_horizon']['build_seconds']:.3f}s")
+
+    def memory_bytes(self):
+        """Approximate resident size of the arrays held for serving"""
+        total = 0
+        if self.engine is not None:
+            total += sum(array.nbytes for array in self.engine.weights.values())
+        if self.forecast_horizon is not None:
+            total += self.forecast_horizon['values'].nbytes
+        return total
+    
+    def share_memory(self):
+        """Move the engine weights and forecast table into one read-only shared mapping
+        
+        Processes forked afterwards read the same physical pages instead of each
+        holding a private copy of the arrays.
+        """
+        slots = []
+        # Weights mapped from the export file already share the page cache
+        if self.engine is not None and not self.file_mapped:
+            slots += [(self.engine.weights, name) for name in self.engine.weights]
+        if self.forecast_horizon is not None:
+            slots.append((self.forecast_horizon, 'values'))
+        
+        # 64-byte aligned blocks in a single anonymous shared mapping
+        sizes = [-(-container[name].nbytes // 64) * 64 for container, name in slots]
+        buffer = mmap.mmap(-1, max(sum(sizes), 1))
+        offset = 0
+        for (container, name), size in zip(slots, sizes):
+            array = container[name]
+            shared = np.ndarray(array.shape, dtype=array.dtype, buffer=buffer, offset=offset)
+            shared[...] = array
+            shared.flags.writeable = False
+            container[name] = shared
+            offset += size
+        
+        self._shared_buffer = buffer
+        return sum(sizes)
+    
+    def export_artifact(self, save_dir, engine=None):
+        """Write the fused engine, transformer parameters and metadata as one mappable file
+        
+        Args:
+            engine: FusedLSTM to export, defaults to self.engine
+        """
+        engine = engine or self.engine
+        metadata = {key: value for key, value in self.metadata.items() if key != 'forecast_horizon'}
+        header = {
+            'metadata': metadata,
+            'categories': engine.categories,
+            'feature_columns': engine.feature_columns,
+            'feature_transformer': {
+                'mean_year': float(self.feature_transformer.mean_year_),
+                'std_year': float(self.feature_transformer.std_year_)
+            }
+        }
+        path = os.path.join(save_dir, self.EXPORT_FILE)
+        write_artifact(path, engine.weights, header)
+        return path
+    
+    @classmethod
+    def load(cls, save_dir='../models/oracle_v1', horizon_days=None):
+        """Map the artifact written by ModelPipeline.save or convert_model.py
+        
+        Args:
+            save_dir: Directory holding the export file
+            horizon_days: If set, precompute forecasts for this many days from today
+        """
+        predictor = cls()
+        predictor.model_dir = save_dir
+        
+        header, weights = read_artifact(os.path.join(save_dir, cls.EXPORT_FILE))
+        predictor.metadata = header['metadata']
+        
+        # Rebuild the feature transformer from its fitted statistics, without sklearn
+        predictor.feature_transformer = InferenceFeatureTransformer(
+            header['feature_transformer']['mean_year'], header['feature_transformer']['std_year'])
+        
+        predictor.engine = FusedLSTM(header['categories'], header['feature_columns'], weights)
+        predictor.file_mapped = True
+        
+        if horizon_days:
+            predictor.build_forecast_horizon(horizon_days)
+        
+        print(f"Loaded inference pipeline from {save_dir}")
+        print(f"Last trained: {predictor.metadata['last_trained']}")
+        return predictor
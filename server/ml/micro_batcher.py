@@ -0,0 +1,156 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+
+
+class Histogram:
+    """Fixed-bucket histogram, counts[i] holds observations <= bounds[i]"""
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = next((i for i, bound in enumerate(self.bounds) if value <= bound), len(self.bounds))
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+
+    def snapshot(self):
+        with self._lock:
+            buckets = {f'le_{bound}': count for bound, count in zip(self.bounds, self.counts)}
+            buckets['le_inf'] = self.counts[-1]
+            return {
+                'count': self.count,
+                'mean': self.total / self.count if self.count else 0.0,
+                'buckets': buckets
+            }
+
+
+class MicroBatcher:
+    """Coalesces concurrent forecast requests into one inference per pipeline.
+
+    Requests that arrive within window_ms of the first queued request, up to
+    max_batch_size of them, are merged: each pipeline predicts the union of
+    their dates once and every caller gets back its own dates. The window
+    only opens while another request for the same pipeline is in flight, a
+    request for an idle pipeline is run without waiting.
+    Each pipeline's share of a batch runs on one of `workers` threads.
+    """
+
+    def __init__(self, window_ms=3, max_batch_size=32, workers=4):
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+        self.workers = workers
+        self.queue_wait_ms = Histogram([0.5, 1, 2, 5, 10, 25, 50, 100])
+        self.batch_size = Histogram([1, 2, 4, 8, 16, 32, 64])
+        self._lock = threading.Lock()
+        self._queue = None
+        self._executor = None
+        self._pid = None
+        # Requests not yet answered, by id of their pipeline
+        self._pending = {}
+
+    def predict_by_category(self, predictor, dates):
+        """Same result as predictor.predict_by_category, batched with concurrent callers"""
+        future = Future()
+        requests = self._ensure_worker()
+        with self._lock:
+            self._pending[id(predictor)] = self._pending.get(id(predictor), 0) + 1
+        try:
+            requests.put((predictor, pd.DatetimeIndex(pd.to_datetime(dates)),
+                          time.perf_counter(), future))
+            return future.result()
+        finally:
+            with self._lock:
+                remaining = self._pending.pop(id(predictor), 1) - 1
+                if remaining:
+                    self._pending[id(predictor)] = remaining
+
+    def _others_pending(self, predictor):
+        with self._lock:
+            return self._pending.get(id(predictor), 0) > 1
+
+    def _ensure_worker(self):
+        # Threads do not survive fork, so each worker process starts its own
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix='micro-batcher')
+                self._pending = {}
+                self._pid = os.getpid()
+                threading.Thread(target=self._run, args=(self._queue,), daemon=True).start()
+            return self._queue
+
+    def _run(self, requests):
+        while True:
+            batch = [requests.get()]
+            # Later requests are likely while the pipeline is busy, a lone one runs at once
+            wait = self._others_pending(batch[0][0])
+            deadline = batch[0][2] + self.window_ms / 1000
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter() if wait else 0
+                if remaining <= 0:
+                    try:
+                        batch.append(requests.get_nowait())
+                        continue
+                    except queue.Empty:
+                        break
+                try:
+                    batch.append(requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        started = time.perf_counter()
+        for _, _, enqueued, _ in batch:
+            self.queue_wait_ms.observe((started - enqueued) * 1000)
+        self.batch_size.observe(len(batch))
+
+        # One inference over the union of dates for each pipeline in the batch
+        by_predictor = {}
+        for request in batch:
+            by_predictor.setdefault(id(request[0]), []).append(request)
+
+        # Pipelines run concurrently, a slow one does not hold up the others
+        for requests in by_predictor.values():
+            self._executor.submit(self._run_predictor, requests)
+
+    @staticmethod
+    def _run_predictor(requests):
+        predictor = requests[0][0]
+        try:
+            all_dates = requests[0][1]
+            for request in requests[1:]:
+                all_dates = all_dates.append(request[1])
+            predictions = predictor.predict_by_category(all_dates.unique())
+        except Exception as e:
+            for _, _, _, future in requests:
+                future.set_exception(e)
+            return
+
+        for _, dates, _, future in requests:
+            future.set_result({
+                category: {date: by_date[date] for date in dates if date in by_date}
+                for category, by_date in predictions.items()
+            })
+
+    def stats(self):
+        """Queue-wait and batch-size histograms"""
+        return {
+            'window_ms': self.window_ms,
+            'max_batch_size': self.max_batch_size,
+            'workers': self.workers,
+            'queue_wait_ms': self.queue_wait_ms.snapshot(),
+            'batch_size': self.batch_size.snapshot()
+        }
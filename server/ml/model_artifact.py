@@ -0,0 +1,84 @@
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+
+# File layout:
+#   8 bytes   magic
+#   8 bytes   header length, little-endian uint64
+#   header    UTF-8 JSON, padded with spaces to a multiple of ALIGNMENT
+#   blocks    one contiguous block per array, each starting on an ALIGNMENT boundary
+MAGIC = b'ORACLE01'
+ALIGNMENT = 64
+PREFIX = struct.Struct('<8sQ')
+
+
+def _aligned(size):
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def write_artifact(path, arrays, header=None):
+    """Write named arrays and a JSON header into a single mappable file
+
+    Args:
+        path: Destination file, replaced atomically
+        arrays: Dictionary of numeric numpy arrays
+        header: JSON-serializable dictionary stored next to the array index
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+
+    index = {}
+    offset = 0
+    for name, array in arrays.items():
+        if array.dtype.hasobject or array.dtype.kind in 'USV':
+            raise ValueError(f"Array {name} is not numeric, store it in the header instead")
+        index[name] = {
+            'dtype': array.dtype.newbyteorder('<').str,
+            'shape': list(array.shape),
+            'offset': offset
+        }
+        offset += _aligned(array.nbytes)
+
+    header_bytes = json.dumps({**(header or {}), 'arrays': index}).encode('utf-8')
+    header_bytes += b' ' * (_aligned(PREFIX.size + len(header_bytes)) - PREFIX.size - len(header_bytes))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(PREFIX.pack(MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            data = array.astype(index[name]['dtype'], copy=False).tobytes()
+            f.write(data)
+            f.write(b'\0' * (_aligned(len(data)) - len(data)))
+    os.replace(tmp_path, path)
+
+
+def read_artifact(path):
+    """Map an artifact written by write_artifact
+
+    Arrays are read-only views into the file mapping, so nothing is copied
+    and processes mapping the same file share its pages.
+
+    Returns:
+        header: The JSON header, without the array index
+        arrays: Dictionary of read-only numpy arrays
+    """
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, header_length = PREFIX.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not a model artifact: {path}")
+    header = json.loads(bytes(buffer[PREFIX.size:PREFIX.size + header_length]))
+    data_start = PREFIX.size + header_length
+
+    arrays = {}
+    for name, entry in header.pop('arrays').items():
+        dtype = np.dtype(entry['dtype'])
+        count = int(np.prod(entry['shape'], dtype=np.int64))
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                     offset=data_start + entry['offset']).reshape(entry['shape'])
+    return header, arrays
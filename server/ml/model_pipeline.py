@@ -1,37 +1,91 @@
 import torch
 import torch.nn as nn
-import torch.optim as optim
-from torch.utils.data import TensorDataset, DataLoader
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.model_selection import train_test_split
 import numpy as np
 from datetime import datetime
 import os
 import json
+import hashlib
+import time
 import pickle
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+import threading
 import pandas as pd
 from feature_transformer import FeatureTransformer
-import matplotlib.pyplot as plt
+from fused_lstm import FusedLSTM
+from inference_pipeline import InferencePipeline
+from temporal_features import add_temporal_features
+import inference_backends
+
+# Training and plotting dependencies (torch.optim, torch.utils.data, the sklearn
+# scalers and metrics, training_plots and with it matplotlib) are imported
+# inside the methods that use them, so loading a pipeline for serving does not
+# pay for them.
 
 
 def create_sequences(data, seq_length, n_features):
-    xs, ys = [], []
-    for i in range(len(data) - seq_length):
-        # Input features (all columns except the last one)
-        x = data[i:i+seq_length, :n_features]
-        # Target variable (last column)
-        y = data[i+seq_length, -1]
-        xs.append(x)
-        ys.append(y)
-    return np.array(xs), np.array(ys)
+    """Sliding windows over data as strided views, without copying any window
+    
+    Args:
+        data: Array of shape [num_rows, n_features + 1], target in the last column
+        seq_length: Rows per window
+        n_features: Leading feature columns of each window
+    
+    Returns:
+        X: Read-only view of shape [num_rows - seq_length, seq_length, n_features]
+        y: View of the target following each window, [num_rows - seq_length]
+    """
+    data = np.asarray(data)
+    n_windows = max(len(data) - seq_length, 0)
+    if n_windows == 0:
+        return np.empty((0, seq_length, n_features), dtype=data.dtype), np.empty(0, dtype=data.dtype)
+    
+    # [windows, n_features, seq_length] -> [windows, seq_length, n_features]
+    windows = np.lib.stride_tricks.sliding_window_view(data[:, :n_features], seq_length, axis=0)
+    X = windows[:n_windows].transpose(0, 2, 1)
+    # Target variable (last column) of the row after each window
+    y = data[seq_length:, -1]
+    return X, y
+
+
+def split_sequences(X, y, test_size=0.2):
+    """Chronological train/validation split as views
+    
+    Same split sizes as train_test_split(X, y, test_size=test_size, shuffle=False),
+    which would copy both halves.
+    """
+    n_test = int(np.ceil(test_size * len(X)))
+    n_train = len(X) - n_test
+    if n_train <= 0 or n_test <= 0:
+        raise ValueError(f"Not enough sequences to split: {len(X)}")
+    return X[:n_train], X[n_train:], y[:n_train], y[n_train:]
+
+
+def to_tensor(array, device):
+    """The one copy of a (possibly strided) array: contiguous float32 on device"""
+    return torch.from_numpy(np.ascontiguousarray(array, dtype=np.float32)).to(device)
+
+
+def stack_to_tensor(arrays, device):
+    """to_tensor of arrays of one shape stacked on a new first axis, still one copy"""
+    stacked = np.empty((len(arrays),) + arrays[0].shape, dtype=np.float32)
+    for index, array in enumerate(arrays):
+        stacked[index] = array
+    return torch.from_numpy(stacked).to(device)
+
+
+def category_fingerprint(df, category):
+    """Content hash of one category's transaction dates and amounts, independent of row order"""
+    category_data = df.loc[df['category'] == category, ['datetime', 'amount']].sort_values(
+        ['datetime', 'amount'])
+    digest = hashlib.sha256()
+    digest.update(category_data['datetime'].to_numpy(dtype='datetime64[ns]').view(np.int64).tobytes())
+    digest.update(category_data['amount'].to_numpy(dtype=np.float64).tobytes())
+    return digest.hexdigest()
 
 
-def read_financial_transactions():
-    df = pd.read_csv('../data/financial_transactions.csv')
-    df['datetime'] = pd.to_datetime(df['date'] + ' ' + df['time'])
-    df.drop(columns=['account_id', 'transaction_id', 'date', 'time'], inplace=True)
-    return df
+def read_financial_transactions(columns=('activity', 'amount', 'category', 'type', 'vendor_name', 'datetime')):
+    """Sample transactions through the columnar cache, see transaction_store"""
+    from transaction_store import load_transactions
+    return load_transactions('../data/financial_transactions.csv', list(columns))
 
 
 # Define LSTM model using PyTorch
@@ -47,27 +101,127 @@ class LSTMModel(nn.Module):
         self.dropout2 = nn.Dropout(0.2)
         self.fc = nn.Linear(hidden_size, output_size)
         
-    def forward(self, x):
+    def forward(self, x, dropout_generator=None):
+        """
+        Args:
+            x: Input of shape [batch_size, seq_len, input_size]
+            dropout_generator: If given, sample dropout masks from it even in eval
+                mode (Monte-Carlo dropout) without touching the module state
+        """
         h0_1 = torch.zeros(1, x.size(0), self.hidden_size).to(x.device)
         c0_1 = torch.zeros(1, x.size(0), self.hidden_size).to(x.device)
         
         out, _ = self.lstm1(x, (h0_1, c0_1))
-        out = self.dropout1(out)
+        out = self._dropout(self.dropout1, out, dropout_generator)
         
         h0_2 = torch.zeros(1, x.size(0), self.hidden_size).to(x.device)
         c0_2 = torch.zeros(1, x.size(0), self.hidden_size).to(x.device)
         
         out, _ = self.lstm2(out, (h0_2, c0_2))
-        out = self.dropout2(out)
+        out = self._dropout(self.dropout2, out, dropout_generator)
         
         # Take only the last time step output
         out = out[:, -1, :]  # Shape: [batch_size, hidden_size]
         out = self.fc(out)   # Shape: [batch_size, output_size]
         return out
+    
+    @staticmethod
+    def _dropout(dropout, out, generator):
+        if generator is None:
+            return dropout(out)
+        keep = 1 - dropout.p
+        return out * torch.bernoulli(torch.full_like(out, keep), generator=generator) / keep
+
+
+class GroupedLSTMModel(nn.Module):
+    """Several LSTMModels with their weights stacked along a leading category axis.
+
+    One forward/backward pass trains every category: each layer is a batched
+    matmul over the category axis, so the Python and optimizer overhead of a
+    step is paid once instead of once per category. Parameters of different
+    categories never mix, each category's gradient comes from its own loss.
+    """
+    
+    def __init__(self, models):
+        """
+        Args:
+            models: LSTMModels with the same sizes, their current weights are the starting point
+        """
+        super(GroupedLSTMModel, self).__init__()
+        self.keys = list(models[0].state_dict().keys())
+        self.hidden_size = models[0].hidden_size
+        self.dropout = models[0].dropout1.p
+        for key in self.keys:
+            stacked = torch.stack([model.state_dict()[key] for model in models])
+            self.register_parameter(key.replace('.', '_'), nn.Parameter(stacked.clone()))
+    
+    def category_state_dict(self, index):
+        """Copy of one category's weights, loadable into an LSTMModel"""
+        return {key: getattr(self, key.replace('.', '_'))[index].detach().clone() for key in self.keys}
+    
+    def _lstm(self, x, name):
+        """One single-layer LSTM over x of shape [categories, batch, seq_len, input_size]"""
+        weight_ih = getattr(self, f'{name}_weight_ih_l0')
+        weight_hh = getattr(self, f'{name}_weight_hh_l0')
+        bias = getattr(self, f'{name}_bias_ih_l0') + getattr(self, f'{name}_bias_hh_l0')
+        
+        # Input projections of every time step in one batched matmul
+        gates_x = torch.matmul(x, weight_ih.transpose(1, 2).unsqueeze(1)) + bias[:, None, None, :]
+        
+        h = x.new_zeros(x.size(0), x.size(1), self.hidden_size)
+        c = torch.zeros_like(h)
+        outputs = []
+        for t in range(x.size(2)):
+            gates = gates_x[:, :, t] + torch.bmm(h, weight_hh.transpose(1, 2))
+            # PyTorch gate order: input, forget, cell, output
+            i, f, g, o = gates.chunk(4, dim=-1)
+            c = torch.sigmoid(f) * c + torch.sigmoid(i) * torch.tanh(g)
+            h = torch.sigmoid(o) * torch.tanh(c)
+            outputs.append(h)
+        return torch.stack(outputs, dim=2)
+    
+    def forward(self, x):
+        """
+        Args:
+            x: Input of shape [categories, batch_size, seq_len, input_size]
+        
+        Returns:
+            Predictions of shape [categories, batch_size]
+        """
+        out = nn.functional.dropout(self._lstm(x, 'lstm1'), self.dropout, self.training)
+        out = nn.functional.dropout(self._lstm(out, 'lstm2'), self.dropout, self.training)
+        
+        # Last time step of every category through its own output layer
+        out = torch.bmm(out[:, :, -1, :], self.fc_weight.transpose(1, 2)) + self.fc_bias[:, None, :]
+        return out.squeeze(-1)
+
+
+def _train_category_worker(config, category_df, category, num_epochs, batch_size, patience, threads,
+                           plots):
+    """Process pool entry point of ModelPipeline._train_parallel"""
+    torch.set_num_threads(threads)
+    pipeline = ModelPipeline(**config)
+    pipeline.device = torch.device('cpu')
+    if plots:
+        pipeline._plot_series = {}
+    pipeline._train_category(category_df, category, num_epochs, batch_size, patience)
+    return (pipeline.models[category].state_dict(), pipeline.scalers[category],
+            pipeline.metadata['training_history'][category],
+            pipeline._plot_series[category] if plots else None)
 
 
-class ModelPipeline:
+def _render_training_plots(series, metrics, save_dir):
+    """Plotting process entry point of ModelPipeline.create_training_plots"""
+    import training_plots
+    training_plots.render_training_plots(series, metrics, save_dir)
+
+
+class ModelPipeline(InferencePipeline):
+    # Fewest training windows of an incremental retrain, see _train_incremental
+    INCREMENTAL_MIN_SEQUENCES = 10
+    
     def __init__(self, sequence_length=4, hidden_size=50, num_layers=2):
+        super(ModelPipeline, self).__init__()
         self.sequence_length = sequence_length
         self.hidden_size = hidden_size
         self.num_layers = num_layers
@@ -76,16 +230,48 @@ class ModelPipeline:
         # Dictionaries to store models and scalers for each category
         self.models = {}
         self.scalers = {}
+        # Widened copies of self.scalers entries by preprocess_data(refit=False),
+        # swapped in with the new weights by _record_training
+        self._staged_scalers = {}
+        
+        # Inference backend, see inference_backends.BACKENDS
+        self.backend = 'fused'
+        # Per-category callables for the non-fused backends
+        self.runners = {}
+        # Model directories of categories whose self.models entry is the int8
+        # module of the 'quantized' backend, and the fp32 modules reloaded from
+        # them for dropout quantiles, see _fp32_model
+        self._quantized_paths = {}
+        self._fp32_models = {}
+        
+        # Categories listed by load(lazy=True) in directory order, and the
+        # directories of those not materialized yet
+        self._lazy_categories = []
+        self._pending_categories = {}
+        self._materialize_lock = threading.Lock()
+        self._warm_up_thread = None
+        
+        # Training and validation series recorded for plotting, None unless
+        # train(plots=True), and the process rendering them
+        self._plot_series = None
+        self._plot_process = None
+        
+    @property
+    def categories(self):
+        """Categories the pipeline predicts, in prediction order"""
+        return list(dict.fromkeys(self._lazy_categories + list(self.models.keys())))
+        
+    def preprocess_data(self, df, category, refit=True):
+        """Preprocess data for a specific category
+        
+        Args:
+            refit: Fit new scalers. Otherwise widen copies of the category's fitted
+                scalers where df falls outside their ranges. The copies replace the
+                scalers in use only once the category's training is recorded
+        """
+        import copy
+        from sklearn.preprocessing import MinMaxScaler
         
-         # Add metadata tracking
-        self.metadata = {
-            'last_trained': None,
-            'training_history': {},
-            'model_version': '1.0'
-        }
-        
-    def preprocess_data(self, df, category):
-        """Preprocess data for a specific category"""
         # Filter data for category and sort by datetime
         category_data = df[df['category'] == category].sort_values('datetime')
         category_data = category_data.drop(columns=['category'])
@@ -102,6 +288,17 @@ class ModelPipeline:
         if not feature_columns:
             raise ValueError(f"No numeric feature columns found for category: {category}")
         
+        if not refit and category in self.scalers:
+            # Serving keeps the current scalers, paired with the current weights
+            scalers = copy.deepcopy(self.scalers[category])
+            feature_columns = scalers['feature_columns']
+            # partial_fit keeps the running min/max, so ranges only ever widen
+            scalers['feature_scaler'].partial_fit(category_data[feature_columns])
+            scalers['target_scaler'].partial_fit(category_data[['amount']])
+            self._staged_scalers[category] = scalers
+            return np.hstack((scalers['feature_scaler'].transform(category_data[feature_columns]),
+                              scalers['target_scaler'].transform(category_data[['amount']])))
+        
         # Scale features and target
         feature_scaler = MinMaxScaler(feature_range=(0, 1))
         target_scaler = MinMaxScaler(feature_range=(0, 1))
@@ -110,6 +307,7 @@ class ModelPipeline:
         scaled_target = target_scaler.fit_transform(category_data[['amount']])
         
         # Store scalers
+        self._staged_scalers.pop(category, None)
         self.scalers[category] = {
             'feature_scaler': feature_scaler,
             'target_scaler': target_scaler,
@@ -118,319 +316,549 @@ class ModelPipeline:
         
         return np.hstack((scaled_features, scaled_target))
     
-    def train(self, df_train, categories=None, num_epochs=100, batch_size=32, patience=10):
-        """Train models for all categories or specified categories"""
+    def _build_training_matrix(self, df_train, feature_transformer, categories=None):
+        """Pivot transformed transactions once into daily calendar features and amounts
+        
+        Amounts are summed per day and category in a single bincount over the
+        rows, on a continuous calendar from the first to the last day, so days
+        without a transaction are zero for every category.
+        
+        Args:
+            df_train: Transformed training data
+            feature_transformer: Fitted FeatureTransformer, for the year statistics
+            categories: Columns of the amount matrix, defaults to the categories in df_train
+        
+        Returns:
+            (features, amounts): features is a frame of the calendar features with a
+            datetime column, one row per day, amounts a [days, categories] frame
+        """
+        if categories is None:
+            categories = df_train['category'].unique()
+        categories = list(categories)
+        
+        days = df_train['datetime'].dt.normalize()
+        calendar = pd.date_range(days.min(), days.max(), freq='D')
+        
+        # Same calendar features as prediction builds for its dates
+        features = add_temporal_features(pd.DataFrame({'datetime': calendar}),
+                                         feature_transformer.mean_year_, feature_transformer.std_year_)
+        
+        day_index = ((days - calendar[0]) // pd.Timedelta(days=1)).to_numpy()
+        category_index = pd.Index(categories).get_indexer(df_train['category'])
+        known = category_index >= 0
+        cells = day_index[known] * len(categories) + category_index[known]
+        amounts = np.bincount(cells, weights=df_train['amount'].to_numpy(dtype=np.float64)[known],
+                              minlength=len(calendar) * len(categories))
+        amounts = pd.DataFrame(amounts.reshape(len(calendar), len(categories)),
+                               index=calendar, columns=categories)
+        return features, amounts
+    
+    def _build_category_frame(self, matrix, category, start=0):
+        """One category's training frame sliced from _build_training_matrix output
+        
+        Args:
+            start: First day of the frame, as a row of the matrix
+        """
+        features, amounts = matrix
+        category_df = features.iloc[start:].copy()
+        category_df['amount'] = amounts[category].to_numpy()[start:]
+        category_df['category'] = category
+        return category_df
+    
+    def train(self, df_train, categories=None, num_epochs=100, batch_size=32, patience=10,
+              workers=1, threads_per_worker=1, grouped=True, refit_transformer=True,
+              plots=False, plot_dir='../models/oracle_v1'):
+        """Train models for all categories or specified categories
+        
+        Args:
+            plots: Render training plots into plot_dir/plots in a background
+                process, see create_training_plots
+            refit_transformer: Fit a new FeatureTransformer on df_train, otherwise
+                keep the current one so untouched category models stay valid
+            workers: Train this many categories at once in a process pool, 1 trains in process
+            threads_per_worker: torch intra-op threads of each pool worker
+            grouped: In process, train all categories in one optimization loop
+                (GroupedLSTMModel) instead of one loop per category
+        """
         # Apply feature transformation
-        feature_transformer = FeatureTransformer()
-        df_train = feature_transformer.fit_transform(df_train)
-        
-        # Store all unique dates and get all columns except 'amount', 'category', and 'datetime'
-        feature_cols = [col for col in df_train.columns if col not in ['amount', 'category', 'datetime']]
-        all_dates = df_train['datetime'].unique()
+        if refit_transformer or self.feature_transformer is None:
+            feature_transformer = FeatureTransformer()
+            df_train = feature_transformer.fit_transform(df_train)
+        else:
+            feature_transformer = self.feature_transformer
+            df_train = feature_transformer.transform_for_training(df_train)
         
         if categories is None:
             categories = df_train['category'].unique()
-            
+        
+        self._plot_series = {} if plots else None
+        start_time = time.perf_counter()
+        matrix = self._build_training_matrix(df_train, feature_transformer, categories)
+        if workers > 1:
+            self._train_parallel(matrix, categories, num_epochs, batch_size, patience,
+                                 workers, threads_per_worker)
+        elif grouped:
+            category_dfs = {category: self._build_category_frame(matrix, category)
+                            for category in categories}
+            self._train_grouped(category_dfs, num_epochs, batch_size, patience)
+        else:
+            for category in categories:
+                print(f"\nTraining model for category: {category}")
+                category_df = self._build_category_frame(matrix, category)
+                self._train_category(category_df, category, num_epochs, batch_size, patience)
+        training_seconds = time.perf_counter() - start_time
+        
+        # Plots render in the background while the caller goes on, e.g. to save()
+        if plots:
+            self.create_training_plots(plot_dir)
+        
+        # Store the feature transformer for later use
+        self.feature_transformer = feature_transformer
+        self._finish_training(df_train, categories, training_seconds)
+    
+    def _finish_training(self, df_train, categories, training_seconds):
+        """Record fingerprints and the newest trained transaction, refresh what depends on the models
+        
+        Args:
+            df_train: Transformed training data
+            categories: Categories just trained
+            training_seconds: Wall time of training them, split evenly in the history
+        """
         for category in categories:
-            print(f"\nTraining model for category: {category}")
-            
-            # Create base DataFrame with all dates
-            full_dates_df = pd.DataFrame({'datetime': all_dates})
-            # print(f"Full dates df shape: {full_dates_df.shape}")
-            # print(f"Full dates df columns: {full_dates_df.columns}")
-            # print(f"Full dates df: {full_dates_df}")
-            # First merge with df_train to get all feature values for each datetime
-            full_dates_df = full_dates_df.merge(
-                df_train[['datetime'] + feature_cols].drop_duplicates(),
-                on='datetime',
-                how='left'
-            )
-            
-            # Then merge with category specific data to get amounts
-            category_data = df_train[df_train['category'] == category]
-            category_df = full_dates_df.merge(
-                category_data[['datetime', 'amount']],
-                on='datetime',
-                how='left'
-            )
-            # print(f"Category df shape: {category_df.shape}")
-            # print(f"Category df columns: {category_df.columns}")
-            # print(f"Category df: {category_df}")
-            
-            # Sort by datetime to ensure temporal order
-            category_df = category_df.sort_values('datetime')
-            
-            # Fill missing amount with 0
-            category_df['amount'] = category_df['amount'].fillna(0)
-            
-            # print(f"Missing values:{category_df[category_df.isna().any(axis=1)]}")
-            
-            # Add category column back
-            category_df['category'] = category
-            
-            # print(f'Category columns: {category_df.columns}')
-            # print(f"Category df shape: {category_df.shape}")
-            
-            # Preprocess data
-            scaled_data = self.preprocess_data(category_df, category)
-            n_features = scaled_data.shape[1] - 1  # Exclude target column
+            self.metadata['training_history'][category].update({
+                'fingerprint': category_fingerprint(df_train, category),
+                'training_seconds': training_seconds / len(categories)
+            })
+        self.metadata['trained_through'] = df_train['datetime'].max().isoformat()
+        
+        # Exported runners are stale once the models change, use the eager models until saved
+        self.runners = {}
+        if self.backend == 'fused':
+            self._build_engine()
+        
+        # Precomputed forecasts are stale once the models change
+        if self.forecast_horizon is not None:
+            self.build_forecast_horizon(len(self.forecast_horizon['dates']))
+
+    def _train_category(self, category_df, category, num_epochs, batch_size, patience):
+        """Preprocess and train one category, storing its model, scalers and training history"""
+        import torch.optim as optim
+        from torch.utils.data import TensorDataset, DataLoader
+        
+        # Preprocess data
+        scaled_data = self.preprocess_data(category_df, category)
+        n_features = scaled_data.shape[1] - 1  # Exclude target column
+        
+        # Create sequences
+        X, y = create_sequences(scaled_data, self.sequence_length, n_features)
+        X_train, X_val, y_train, y_val = split_sequences(X, y, test_size=0.2)
+        
+        # Convert to tensors, the only copy of the windows
+        X_train_tensor = to_tensor(X_train, self.device)
+        y_train_tensor = to_tensor(y_train, self.device)
+        X_val_tensor = to_tensor(X_val, self.device)
+        y_val_tensor = to_tensor(y_val, self.device)
+        
+        # Create model and training components
+        model = LSTMModel(input_size=n_features, 
+                        hidden_size=self.hidden_size, 
+                        num_layers=self.num_layers).to(self.device)
+        criterion = nn.MSELoss()
+        optimizer = optim.Adam(model.parameters(), lr=0.001)
+        
+        # Training loop with early stopping
+        best_val_loss = float('inf')
+        counter = 0
+        best_model_state = None
+        
+        train_dataset = TensorDataset(X_train_tensor, y_train_tensor)
+        train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True)
+        
+        print(f"Starting training with {len(X_train)} training samples")
+        print(f"Input feature size: {n_features}")
+        
+        for epoch in range(num_epochs):
+            model.train()
+            epoch_loss = 0.0
             
-            # Create sequences
-            X, y = create_sequences(scaled_data, self.sequence_length, n_features)
-            X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, shuffle=False)
+            for batch_X, batch_y in train_loader:
+                # Reshape batch_y to match output shape
+                batch_y = batch_y.view(-1, 1)
+                
+                outputs = model(batch_X)
+                loss = criterion(outputs, batch_y)
+                
+                optimizer.zero_grad()
+                loss.backward()
+                optimizer.step()
+                
+                epoch_loss += loss.item()
             
-            # Convert to tensors
-            X_train_tensor = torch.FloatTensor(X_train).to(self.device)
-            y_train_tensor = torch.FloatTensor(y_train).to(self.device)
-            X_val_tensor = torch.FloatTensor(X_val).to(self.device)
-            y_val_tensor = torch.FloatTensor(y_val).to(self.device)
+            # Validation
+            model.eval()
+            with torch.no_grad():
+                val_outputs = model(X_val_tensor)
+                # Reshape validation targets
+                y_val_tensor_reshaped = y_val_tensor.view(-1, 1)
+                val_loss = criterion(val_outputs, y_val_tensor_reshaped)
             
-            # Create model and training components
-            model = LSTMModel(input_size=n_features, 
-                            hidden_size=self.hidden_size, 
-                            num_layers=self.num_layers).to(self.device)
-            criterion = nn.MSELoss()
-            optimizer = optim.Adam(model.parameters(), lr=0.001)
+            print(f"Epoch {epoch+1}/{num_epochs}, "
+                  f"Training Loss: {epoch_loss/len(train_loader):.4f}, "
+                  f"Validation Loss: {val_loss:.4f}")
+        
+            # Always save the first state
+            if best_model_state is None:
+                best_val_loss = val_loss
+                best_model_state = model.state_dict().copy()
+                print("Saved initial model state")
+            elif val_loss < best_val_loss:
+                best_val_loss = val_loss
+                best_model_state = model.state_dict().copy()
+                counter = 0
+                print("Found better model state")
+            else:
+                counter += 1
+                if counter >= patience:
+                    print(f"Early stopping triggered after {epoch+1} epochs")
+                    break
+        
+        # Save best model
+        model.load_state_dict(best_model_state)
+        self._record_training(category, model, epoch + 1, best_val_loss,
+                              X_train_tensor, y_train, X_val_tensor, y_val)
+    
+    def _record_training(self, category, model, epochs_trained, best_val_loss,
+                         X_train_tensor, y_train, X_val_tensor, y_val):
+        """Store a trained category model with its training history and validation metrics
+        
+        With plots requested, also keeps the training and validation series in
+        amounts for create_training_plots.
+        """
+        from sklearn.metrics import mean_absolute_error, mean_squared_error
+        
+        self.models[category] = model
+        if category in self._staged_scalers:
+            self.scalers[category] = self._staged_scalers.pop(category)
+        self._quantized_paths.pop(category, None)
+        self._fp32_models.pop(category, None)
+        
+        # Track training metrics
+        self.metadata['training_history'][category] = {
+            'trained_at': datetime.now().isoformat(),
+            'epochs_trained': epochs_trained,
+            'final_validation_loss': float(best_val_loss),
+            'training_samples': len(y_train),
+            'validation_samples': len(y_val)
+        }
+        
+        # Calculate and store validation metrics
+        model.eval()
+        with torch.no_grad():
+            val_predictions = model(X_val_tensor).cpu().numpy()
+            val_predictions = self.scalers[category]['target_scaler'].inverse_transform(
+                val_predictions.reshape(-1, 1)
+            )
+            y_val_actual = self.scalers[category]['target_scaler'].inverse_transform(
+                y_val.reshape(-1, 1)
+            )
             
-            # Training loop with early stopping
-            best_val_loss = float('inf')
-            counter = 0
-            best_model_state = None
+            mae = mean_absolute_error(y_val_actual, val_predictions)
+            rmse = np.sqrt(mean_squared_error(y_val_actual, val_predictions))
             
-            train_dataset = TensorDataset(X_train_tensor, y_train_tensor)
-            train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True)
+            self.metadata['training_history'][category].update({
+                'mae': float(mae),
+                'rmse': float(rmse)
+            })
             
-            print(f"Starting training with {len(X_train)} training samples")
-            print(f"Input feature size: {n_features}")
+            if self._plot_series is not None:
+                train_predictions = model(X_train_tensor).cpu().numpy()
+                target_scaler = self.scalers[category]['target_scaler']
+                self._plot_series[category] = {
+                    'y_train': target_scaler.inverse_transform(y_train.reshape(-1, 1)).ravel(),
+                    'train_predictions': target_scaler.inverse_transform(train_predictions.reshape(-1, 1)).ravel(),
+                    'y_val': y_val_actual.ravel(),
+                    'val_predictions': val_predictions.ravel()
+                }
+    
+    def _train_grouped(self, category_dfs, num_epochs, batch_size, patience, initial_models=None):
+        """Train every category in one optimization loop over a GroupedLSTMModel
+        
+        Categories share the batch order and the optimizer step but keep their
+        own loss, best state and early stopping: a category that stops keeps
+        its best weights while the others continue.
+        
+        Args:
+            category_dfs: {category: frame from _build_category_frame}, all the same length
+            initial_models: {category: LSTMModel} to continue training from, keeping
+                the categories' fitted scalers. Trains new models with new scalers if None
+        """
+        import copy
+        import torch.optim as optim
+        
+        categories = list(category_dfs.keys())
+        windows = {}
+        for category, category_df in category_dfs.items():
+            scaled_data = self.preprocess_data(category_df, category, refit=initial_models is None)
+            X, y = create_sequences(scaled_data, self.sequence_length, scaled_data.shape[1] - 1)
+            windows[category] = split_sequences(X, y, test_size=0.2)
+        
+        shapes = {(X_train.shape, X_val.shape) for X_train, X_val, _, _ in windows.values()}
+        if len(shapes) > 1:
+            raise ValueError("Grouped training needs the same number of sequences and features "
+                             f"for every category, got {sorted(shapes)}")
+        
+        # Stacked [categories, samples, ...] tensors, the one copy of the windows
+        X_train_tensor, X_val_tensor, y_train_tensor, y_val_tensor = (
+            stack_to_tensor([windows[category][part] for category in categories], self.device)
+            for part in range(4)
+        )
+        n_categories, n_train, _, n_features = X_train_tensor.shape
+        
+        if initial_models is not None:
+            # Warm start, the existing models and scalers stay untouched until
+            # training succeeds
+            models = [copy.deepcopy(initial_models[category]).to(self.device) for category in categories]
+        else:
+            # Start from the same initialization as one LSTMModel per category
+            models = [LSTMModel(input_size=n_features,
+                                hidden_size=self.hidden_size,
+                                num_layers=self.num_layers).to(self.device) for _ in categories]
+        grouped_model = GroupedLSTMModel(models).to(self.device)
+        # Adam is elementwise, so one optimizer over the stacked weights steps
+        # each category exactly as its own optimizer would
+        optimizer = optim.Adam(grouped_model.parameters(), lr=0.001)
+        
+        best_val_loss = [float('inf')] * n_categories
+        best_model_state = [None] * n_categories
+        counter = [0] * n_categories
+        epochs_trained = [None] * n_categories
+        n_batches = (n_train + batch_size - 1) // batch_size
+        
+        print(f"Starting grouped training of {n_categories} categories "
+              f"with {n_train} training samples each")
+        print(f"Input feature size: {n_features}")
+        
+        for epoch in range(num_epochs):
+            grouped_model.train()
+            epoch_loss = torch.zeros(n_categories, device=self.device)
             
-            for epoch in range(num_epochs):
-                model.train()
-                epoch_loss = 0.0
+            permutation = torch.randperm(n_train, device=self.device)
+            for start in range(0, n_train, batch_size):
+                batch = permutation[start:start + batch_size]
+                outputs = grouped_model(X_train_tensor[:, batch])
+                # Per-category MSE, summed so every category gets its own gradient
+                loss = ((outputs - y_train_tensor[:, batch]) ** 2).mean(dim=1)
                 
-                for batch_X, batch_y in train_loader:
-                    # Reshape batch_y to match output shape
-                    batch_y = batch_y.view(-1, 1)
-                    
-                    outputs = model(batch_X)
-                    loss = criterion(outputs, batch_y)
-                    
-                    optimizer.zero_grad()
-                    loss.backward()
-                    optimizer.step()
-                    
-                    epoch_loss += loss.item()
+                optimizer.zero_grad()
+                loss.sum().backward()
+                optimizer.step()
                 
-                # Validation
-                model.eval()
-                with torch.no_grad():
-                    val_outputs = model(X_val_tensor)
-                    # Reshape validation targets
-                    y_val_tensor_reshaped = y_val_tensor.view(-1, 1)
-                    val_loss = criterion(val_outputs, y_val_tensor_reshaped)
-                
-                print(f"Epoch {epoch+1}/{num_epochs}, "
-                      f"Training Loss: {epoch_loss/len(train_loader):.4f}, "
-                      f"Validation Loss: {val_loss:.4f}")
+                epoch_loss += loss.detach()
+            
+            # Validation
+            grouped_model.eval()
+            with torch.no_grad():
+                val_loss = ((grouped_model(X_val_tensor) - y_val_tensor) ** 2).mean(dim=1).tolist()
             
+            for index in range(n_categories):
+                if epochs_trained[index] is not None:
+                    continue
                 # Always save the first state
-                if best_model_state is None:
-                    best_val_loss = val_loss
-                    best_model_state = model.state_dict().copy()
-                    print("Saved initial model state")
-                elif val_loss < best_val_loss:
-                    best_val_loss = val_loss
-                    best_model_state = model.state_dict().copy()
-                    counter = 0
-                    print("Found better model state")
+                if best_model_state[index] is None or val_loss[index] < best_val_loss[index]:
+                    best_val_loss[index] = val_loss[index]
+                    best_model_state[index] = grouped_model.category_state_dict(index)
+                    counter[index] = 0
                 else:
-                    counter += 1
-                    if counter >= patience:
-                        print(f"Early stopping triggered after {epoch+1} epochs")
-                        break
-            
-            # Save best model
-            model.load_state_dict(best_model_state)
-            self.models[category] = model
+                    counter[index] += 1
+                    if counter[index] >= patience:
+                        epochs_trained[index] = epoch + 1
+                        print(f"Early stopping triggered for {categories[index]} after {epoch+1} epochs")
             
-             # Track training metrics
-            self.metadata['training_history'][category] = {
-                'trained_at': datetime.now().isoformat(),
-                'epochs_trained': epoch + 1,
-                'final_validation_loss': float(best_val_loss),
-                'training_samples': len(X_train),
-                'validation_samples': len(X_val)
+            active = epochs_trained.count(None)
+            print(f"Epoch {epoch+1}/{num_epochs}, "
+                  f"Training Loss: {epoch_loss.mean().item() / n_batches:.4f}, "
+                  f"Validation Loss: {np.mean(val_loss):.4f}, "
+                  f"Active categories: {active}/{n_categories}")
+            if active == 0:
+                break
+        
+        # Save each category's best model
+        for index, (category, model) in enumerate(zip(categories, models)):
+            model.load_state_dict(best_model_state[index])
+            self._record_training(category, model, epochs_trained[index] or epoch + 1,
+                                  best_val_loss[index], X_train_tensor[index], windows[category][2],
+                                  X_val_tensor[index], windows[category][3])
+    
+    def _train_parallel(self, matrix, categories, num_epochs, batch_size, patience,
+                        workers, threads_per_worker):
+        """Train categories concurrently in forked worker processes
+        
+        Each worker trains one category at a time with its own torch thread
+        count and sends back the state dict, scalers and training history.
+        """
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        import multiprocessing
+        
+        config = {
+            'sequence_length': self.sequence_length,
+            'hidden_size': self.hidden_size,
+            'num_layers': self.num_layers
+        }
+        # Fork so workers inherit the imported modules, training runs on CPU
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=min(workers, len(categories)), mp_context=context) as pool:
+            futures = {
+                pool.submit(_train_category_worker, config, self._build_category_frame(matrix, category),
+                            category, num_epochs, batch_size, patience, threads_per_worker,
+                            self._plot_series is not None): category
+                for category in categories
             }
+            results = {}
+            for future in as_completed(futures):
+                category = futures[future]
+                results[category] = future.result()
+                print(f"Trained category {category}: validation MAE {results[category][2]['mae']:.2f}")
+        
+        # Collect in category order, independent of which worker finished first
+        for category in categories:
+            state_dict, scalers, history, series = results[category]
+            model = LSTMModel(input_size=len(scalers['feature_columns']),
+                              hidden_size=self.hidden_size,
+                              num_layers=self.num_layers).to(self.device)
+            model.load_state_dict(state_dict)
+            model.eval()
             
-            # Calculate and store validation metrics
+            self.scalers[category] = scalers
+            self._staged_scalers.pop(category, None)
+            self.models[category] = model
+            self._quantized_paths.pop(category, None)
+            self._fp32_models.pop(category, None)
+            self.metadata['training_history'][category] = history
+            if series is not None:
+                self._plot_series[category] = series
+    
+    def _predict_category_batch(self, category, transformed_data):
+        """Predict every date for one category with a single forward pass"""
+        self._materialize(category)
+        model = self.models[category]
+        scalers = self.scalers[category]
+        feature_columns = scalers['feature_columns']
+        
+        # Scale all dates as one matrix
+        scaled_features = scalers['feature_scaler'].transform(transformed_data[feature_columns])
+        
+        # Each date is a length-1 sequence: [num_dates, 1, n_features]
+        X = scaled_features.astype(np.float32)[:, None, :]
+        
+        if category in self.runners:
+            prediction = self.runners[category](X)
+        else:
             model.eval()
             with torch.no_grad():
-                val_predictions = model(X_val_tensor).cpu().numpy()
-                val_predictions = self.scalers[category]['target_scaler'].inverse_transform(
-                    val_predictions.reshape(-1, 1)
-                )
-                y_val_actual = self.scalers[category]['target_scaler'].inverse_transform(
-                    y_val.reshape(-1, 1)
-                )
-                
-                mae = mean_absolute_error(y_val_actual, val_predictions)
-                rmse = np.sqrt(mean_squared_error(y_val_actual, val_predictions))
-                
-                self.metadata['training_history'][category].update({
-                    'mae': float(mae),
-                    'rmse': float(rmse)
-                })
-            
-        # After training is complete, create and save plots
-        self.create_training_plots(df_train, save_dir='../models/oracle_v1')
-        
-        # Store the feature transformer for later use
-        self.feature_transformer = feature_transformer
-
-    def predict(self, dates):
-        """Make predictions for all categories for given dates"""
-        if not isinstance(dates, pd.DataFrame):
-            dates = pd.DataFrame({'datetime': pd.to_datetime(dates)})
-        
-        # Set feature transformer to prediction mode
-        self.feature_transformer.set_mode(training=False)
-        transformed_data = self.feature_transformer.transform(dates)
-        
-        # Store predictions for each category
-        predictions_by_date = {}
-        
-        for date in transformed_data['datetime'].unique():
-            date_data = transformed_data[transformed_data['datetime'] == date]
-            total_prediction = 0
-            
-            for category in self.models.keys():
-                try:
-                    # Filter data for category
-                    category_data = date_data.copy()
-                    category_data['category'] = category
-                    
-                    # Get prediction for this category
-                    model = self.models[category]
-                    scalers = self.scalers[category]
-                    feature_columns = scalers['feature_columns']
-                    
-                    # Preprocess input data
-                    scaled_features = scalers['feature_scaler'].transform(category_data[feature_columns])
-                    
-                    # Create sequence
-                    X = torch.FloatTensor(scaled_features).unsqueeze(0).to(self.device)
-                    
-                    # Make prediction
-                    model.eval()
-                    with torch.no_grad():
-                        prediction = model(X)
-                        
-                    # Inverse transform prediction
-                    prediction = scalers['target_scaler'].inverse_transform(
-                        prediction.cpu().numpy().reshape(-1, 1)
-                    )
-                    
-                    total_prediction += prediction[0][0]
-                    
-                except Exception as e:
-                    print(f"Warning: Error predicting for category {category} on {date}: {str(e)}")
-                    continue
-            
-            predictions_by_date[date] = total_prediction
-        
-        # Reset feature transformer to training mode
-        self.feature_transformer.set_mode(training=True)
+                prediction = model(torch.from_numpy(X).to(self.device)).cpu().numpy()
         
-        # Create and save prediction plot
-        # self._create_prediction_plot(predictions_by_date)
-        
-        return predictions_by_date
+        # Inverse transform predictions
+        prediction = scalers['target_scaler'].inverse_transform(prediction.reshape(-1, 1))
+        return prediction[:, 0]
 
-    def predict_by_category(self, dates):
-        """Make predictions for each category separately for given dates"""
-        if not isinstance(dates, pd.DataFrame):
-            dates = pd.DataFrame({'datetime': pd.to_datetime(dates)})
-        
-        # Set feature transformer to prediction mode
-        self.feature_transformer.set_mode(training=False)
-        transformed_data = self.feature_transformer.transform(dates)
+    def _predict_all_categories(self, transformed_data, categories=None):
+        """Predict every category, or only the given ones, for every date
         
-        # Store predictions for each category
-        predictions_by_category = {}
+        Returns:
+            Dictionary with categories as keys and arrays of amounts as values
+        """
+        if self.engine is not None:
+            return super(ModelPipeline, self)._predict_all_categories(transformed_data, categories)
         
-        for category in self.models.keys():
-            predictions_by_category[category] = {}
+        predictions = {}
+        for category in self.categories if categories is None else categories:
             try:
-                for date in transformed_data['datetime'].unique():
-                    date_data = transformed_data[transformed_data['datetime'] == date].copy()
-                    date_data['category'] = category
-                    
-                    # Get prediction for this category
-                    model = self.models[category]
-                    scalers = self.scalers[category]
-                    feature_columns = scalers['feature_columns']
-                    
-                    # Preprocess input data
-                    scaled_features = scalers['feature_scaler'].transform(date_data[feature_columns])
-                    
-                    # Create sequence
-                    X = torch.FloatTensor(scaled_features).unsqueeze(0).to(self.device)
-                    
-                    # Make prediction
-                    model.eval()
-                    with torch.no_grad():
-                        prediction = model(X)
-                        
-                    # Inverse transform prediction
-                    prediction = scalers['target_scaler'].inverse_transform(
-                        prediction.cpu().numpy().reshape(-1, 1)
-                    )
-                    
-                    predictions_by_category[category][date] = float(prediction[0][0])
-                    
+                predictions[category] = self._predict_category_batch(category, transformed_data)
             except Exception as e:
                 print(f"Warning: Error predicting for category {category}: {str(e)}")
                 continue
-        
-        # Reset feature transformer to training mode
-        self.feature_transformer.set_mode(training=True)
-        
-        return predictions_by_category
+        return predictions
+
+    def predict_by_category(self, dates, categories=None, quantiles=None, samples=50, seed=None):
+        """Make predictions for each category separately for given dates
+        
+        Args:
+            dates: Dates to predict
+            categories: Only predict these categories, defaults to all of them
+            quantiles: If set, e.g. (0.05, 0.95), add Monte-Carlo dropout quantile bands
+            samples: Dropout samples per date, evaluated as one batched forward pass per category
+            seed: Seed for the dropout masks, for reproducible bands
+        
+        Returns:
+            {category: {date: amount}}, or with quantiles
+            {category: {date: {'prediction': amount, 'quantiles': {quantile: amount}}}}
+        """
+        predictions_by_category = super(ModelPipeline, self).predict_by_category(dates, categories)
+        if quantiles is None:
+            return predictions_by_category
+        
+        bands = self._dropout_quantiles(dates, list(predictions_by_category), quantiles, samples, seed)
+        return {
+            category: {
+                date: {
+                    'prediction': prediction,
+                    'quantiles': {float(q): float(bands[category][q_index, date_index])
+                                  for q_index, q in enumerate(quantiles)}
+                }
+                for date_index, (date, prediction) in enumerate(predictions.items())
+            }
+            for category, predictions in predictions_by_category.items()
+        }
+    
+    def _dropout_quantiles(self, dates, categories, quantiles, samples, seed):
+        """Quantiles of Monte-Carlo dropout samples, {category: array [quantiles, dates]}
+        
+        The samples x dates inputs of a category go through the model as a single
+        batch, so the cost grows with the batch size rather than with K sequential calls.
+        """
+        transformed_data = self._prepare_prediction_data(dates)
+        generator = torch.Generator(device=self.device)
+        if seed is None:
+            generator.seed()
+        else:
+            generator.manual_seed(seed)
+        
+        bands = {}
+        for category in categories:
+            model = self._fp32_model(category, cache=True)
+            scalers = self.scalers[category]
+            
+            scaled_features = scalers['feature_scaler'].transform(
+                transformed_data[scalers['feature_columns']])
+            X = torch.from_numpy(scaled_features.astype(np.float32)[:, None, :]).to(self.device)
+            
+            # [samples * num_dates, 1, n_features], one dropout mask per row
+            model.eval()
+            with torch.no_grad():
+                prediction = model(X.repeat(samples, 1, 1), dropout_generator=generator).cpu().numpy()
+            
+            prediction = scalers['target_scaler'].inverse_transform(prediction.reshape(-1, 1))
+            bands[category] = np.quantile(prediction.reshape(samples, len(X)), quantiles, axis=0)
+        return bands
+    
+    def _build_engine(self):
+        """Stack the category models into the fused inference engine"""
+        self.materialize()
+        models = {category: self.models[category] for category in self.categories}
+        try:
+            self.engine = FusedLSTM.from_pipeline(models, self.scalers)
+        except ValueError as e:
+            print(f"Warning: Falling back to per-category inference: {str(e)}")
+            self.engine = None
 
     def _create_prediction_plot(self, predictions_by_date, save_dir='../models/oracle_v1'):
         """Create and save plot of predictions"""
-        plt.figure(figsize=(15, 8))
-        plt.style.use('ggplot')
-        
-        dates = list(predictions_by_date.keys())
-        values = list(predictions_by_date.values())
-        
-        plt.plot(dates, values, marker='o', linestyle='-', linewidth=2)
-        plt.title('Predicted Total Transaction Amount')
-        plt.xlabel('Date')
-        plt.ylabel('Predicted Amount')
-        plt.grid(True, alpha=0.3)
-        
-        # Rotate x-axis labels for better readability
-        plt.xticks(rotation=45)
-        
-        # Add prediction statistics
-        stats_text = f"Prediction Statistics:\n"
-        stats_text += f"Mean: {np.mean(values):.2f}\n"
-        stats_text += f"Min: {np.min(values):.2f}\n"
-        stats_text += f"Max: {np.max(values):.2f}"
-        
-        plt.figtext(0.02, 0.02, stats_text, fontsize=10,
-                    bbox=dict(facecolor='white', alpha=0.8))
-        
-        # Adjust layout and save
-        plt.tight_layout()
-        os.makedirs(os.path.join(save_dir, 'plots'), exist_ok=True)
-        plt.savefig(os.path.join(save_dir, 'plots', 'future_predictions.png'), 
-                    dpi=300, bbox_inches='tight')
-        plt.close()
+        import training_plots
+        training_plots.plot_future_predictions(predictions_by_date, save_dir)
 
     def save(self, save_dir='../models/oracle_v1', ):
         """Save the trained models, scalers, and metadata"""
+        self.materialize()
         os.makedirs(save_dir, exist_ok=True)
         
         # Save feature transformer
@@ -438,38 +866,191 @@ class ModelPipeline:
         with open(transformer_path, 'wb') as f:
             pickle.dump(self.feature_transformer, f)
         
-        # Save metadata
+        # Save metadata, the forecast horizon is rebuilt on load
         self.metadata['last_trained'] = datetime.now().isoformat()
+        metadata = {key: value for key, value in self.metadata.items() if key != 'forecast_horizon'}
         with open(os.path.join(save_dir, 'metadata.json'), 'w') as f:
-            json.dump(self.metadata, f, indent=4)
+            json.dump(metadata, f, indent=4)
         
         # Save models and scalers for each category
-        for category in self.models:
+        models = {category: self._fp32_model(category) for category in self.categories}
+        for category, model in models.items():
             category_dir = os.path.join(save_dir, 'category', category)
             os.makedirs(category_dir, exist_ok=True)
             
             # Save model state
             model_path = os.path.join(category_dir, 'model.pth')
-            torch.save(self.models[category].state_dict(), model_path)
+            torch.save(model.state_dict(), model_path)
+            
+            # Export serving formats for the torchscript and onnx backends
+            n_features = len(self.scalers[category]['feature_columns'])
+            inference_backends.export_torchscript(
+                model, n_features,
+                os.path.join(category_dir, inference_backends.TORCHSCRIPT_FILE))
+            try:
+                inference_backends.export_onnx(
+                    model, n_features,
+                    os.path.join(category_dir, inference_backends.ONNX_FILE))
+            except Exception as e:
+                print(f"Warning: Skipping ONNX export for category {category}: {str(e)}")
             
             # Save scalers
             scalers_path = os.path.join(category_dir, 'scalers.pkl')
             with open(scalers_path, 'wb') as f:
                 pickle.dump(self.scalers[category], f)
+        
+        # Single-file torch-free export served by InferencePipeline. Fused from the
+        # models whatever the backend, so it never lags behind model.pth
+        try:
+            engine = FusedLSTM.from_pipeline(models, self.scalers)
+        except ValueError as e:
+            print(f"Warning: Skipping {self.EXPORT_FILE} export: {str(e)}")
+            # A stale export would keep serving the previous models
+            export_path = os.path.join(save_dir, self.EXPORT_FILE)
+            if os.path.exists(export_path):
+                os.remove(export_path)
+        else:
+            self.export_artifact(save_dir, engine)
                 
         # Create plots directory if it doesn't exist
         plots_dir = os.path.join(save_dir, 'plots')
         os.makedirs(plots_dir, exist_ok=True)
         
-        # # Create and save aggregated plot
-        # self.create_aggregated_plot(df_train, save_dir)
-        
         print(f"Models and metadata saved to {save_dir}")
     
+    def memory_bytes(self):
+        """Approximate resident size of the serving arrays and torch model weights"""
+        total = super(ModelPipeline, self).memory_bytes()
+        for model in list(self.models.values()) + list(self._fp32_models.values()):
+            total += inference_backends.module_bytes(model)
+        return total
+    
+    def share_memory(self):
+        """Move engine arrays and torch model weights into shared memory before forking
+        
+        Lazy pipelines are fully materialized first, so forked workers do not
+        each load their own copy of the remaining categories.
+        """
+        self.wait_for_warm_up()
+        self.materialize()
+        shared_bytes = super(ModelPipeline, self).share_memory()
+        for model in self.models.values():
+            model.share_memory()
+        return shared_bytes
+    
+    def _load_category(self, category, category_path):
+        """Load one category's scalers, model and backend runner"""
+        # Load scalers first to get feature information
+        scalers_path = os.path.join(category_path, 'scalers.pkl')
+        with open(scalers_path, 'rb') as f:
+            self.scalers[category] = pickle.load(f)
+        
+        # Initialize and load model
+        n_features = len(self.scalers[category]['feature_columns'])
+        model = LSTMModel(input_size=n_features,
+                        hidden_size=self.hidden_size,
+                        num_layers=self.num_layers).to(self.device)
+        
+        model_path = os.path.join(category_path, 'model.pth')
+        model.load_state_dict(torch.load(model_path, 
+                            map_location=self.device))
+        model.eval()
+        
+        if self.backend == 'eager':
+            self.runners[category] = inference_backends.eager_runner(model, self.device)
+        elif self.backend == 'torchscript':
+            self.runners[category] = inference_backends.torchscript_runner(
+                os.path.join(category_path, inference_backends.TORCHSCRIPT_FILE), self.device)
+        elif self.backend == 'onnx':
+            self.runners[category] = inference_backends.onnx_runner(
+                os.path.join(category_path, inference_backends.ONNX_FILE))
+        elif self.backend == 'quantized':
+            # Only the int8 copy stays resident, _fp32_model reloads the weights when needed
+            model = inference_backends.quantize_dynamic(model)
+            self.runners[category] = inference_backends.eager_runner(model, torch.device('cpu'))
+            self._quantized_paths[category] = category_path
+            self._fp32_models.pop(category, None)
+        
+        self.models[category] = model
+    
+    def _fp32_model(self, category, cache=False):
+        """The category's fp32 LSTMModel, loaded from disk if only its int8 module is resident
+        
+        Args:
+            cache: Keep a loaded model resident for later calls, for serving requests.
+                One-off callers such as save() leave only the int8 module resident
+        """
+        self._materialize(category)
+        if category not in self._quantized_paths:
+            return self.models[category]
+        if category in self._fp32_models:
+            return self._fp32_models[category]
+        
+        model = LSTMModel(input_size=len(self.scalers[category]['feature_columns']),
+                          hidden_size=self.hidden_size,
+                          num_layers=self.num_layers).to(self.device)
+        model.load_state_dict(torch.load(os.path.join(self._quantized_paths[category], 'model.pth'),
+                                         map_location=self.device))
+        model.eval()
+        if cache:
+            model = self._fp32_models.setdefault(category, model)
+        return model
+    
+    def _materialize(self, category):
+        """Load a category listed by load(lazy=True) on first access"""
+        if category not in self._pending_categories:
+            return
+        with self._materialize_lock:
+            category_path = self._pending_categories.get(category)
+            if category_path is None:
+                return
+            self._load_category(category, category_path)
+            del self._pending_categories[category]
+            
+            # The fused engine needs every category, build it once the last one is in
+            if not self._pending_categories and self.backend == 'fused':
+                self._build_engine()
+    
+    def materialize(self, categories=None):
+        """Load every pending category of a lazy pipeline, or only the given ones"""
+        for category in list(self._pending_categories) if categories is None else categories:
+            self._materialize(category)
+    
+    def _warm_up(self, horizon_days):
+        start_time = time.perf_counter()
+        self.materialize()
+        if horizon_days:
+            self.build_forecast_horizon(horizon_days)
+        print(f"Warmed up {len(self.models)} categories from {self.model_dir} "
+              f"in {time.perf_counter() - start_time:.2f}s")
+    
+    def wait_for_warm_up(self, timeout=None):
+        """Block until the background warm-up started by load(warm_up=True) is done"""
+        if self._warm_up_thread is not None:
+            self._warm_up_thread.join(timeout)
+    
     @classmethod
-    def load(cls, save_dir='../models/oracle_v1'):
-        """Load a saved predictor instance"""
+    def load(cls, save_dir='../models/oracle_v1', horizon_days=None, backend='fused',
+             lazy=False, warm_up=False):
+        """Load a saved predictor instance
+        
+        Args:
+            save_dir: Directory written by save()
+            horizon_days: If set, precompute forecasts for this many days from today
+            backend: One of inference_backends.BACKENDS
+            lazy: Only list the category directories, each category's model and
+                scalers load on first use. The fused engine is built once every
+                category is loaded, until then predictions run per category.
+            warm_up: With lazy, load the remaining categories (and build the
+                forecast horizon) in a background thread
+        """
+        if backend not in inference_backends.BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}. "
+                             f"Expected one of {inference_backends.BACKENDS}")
+        
         predictor = cls()
+        predictor.model_dir = save_dir
+        predictor.backend = backend
         
         # Load feature transformer
         transformer_path = os.path.join(save_dir, 'feature_transformer.pkl')
@@ -480,54 +1061,189 @@ class ModelPipeline:
         with open(os.path.join(save_dir, 'metadata.json'), 'r') as f:
             predictor.metadata = json.load(f)
         
-        # Load models and scalers for each category
+        # Index the category directories
         category_dir = os.path.join(save_dir, 'category')
+        category_paths = {}
         for category in os.listdir(category_dir):
             category_path = os.path.join(category_dir, category)
-            if not os.path.isdir(category_path):
-                continue
+            if os.path.isdir(category_path):
+                category_paths[category] = category_path
+        
+        if lazy:
+            predictor._lazy_categories = list(category_paths)
+            predictor._pending_categories = category_paths
+            if warm_up:
+                predictor._warm_up_thread = threading.Thread(
+                    target=predictor._warm_up, args=(horizon_days,), daemon=True)
+                predictor._warm_up_thread.start()
+                horizon_days = None
+        else:
+            for category, category_path in category_paths.items():
+                predictor._load_category(category, category_path)
+            if backend == 'fused':
+                predictor._build_engine()
+        
+        if horizon_days:
+            predictor.build_forecast_horizon(horizon_days)
+            
+        print(f"Loaded predictor from {save_dir}")
+        print(f"Last trained: {predictor.metadata['last_trained']}")
+        return predictor
+    
+    @classmethod
+    def compare_backends(cls, save_dir='../models/oracle_v1', dates=None,
+                         backends=inference_backends.BACKENDS, repeats=20):
+        """Check numerical parity and latency of each inference backend
+        
+        Args:
+            save_dir: Directory written by save()
+            dates: Dates to predict, defaults to the next 90 days
+            backends: Backends to compare, the first one is the parity reference
+            repeats: Timed predict_by_category calls per backend
+        
+        Returns:
+            Dictionary with backends as keys and max_abs_diff, p50_ms, p99_ms as values
+        """
+        if dates is None:
+            dates = pd.date_range(start=pd.Timestamp.now().normalize(), periods=90, freq='D')
+        
+        results = {}
+        reference = None
+        for backend in backends:
+            predictor = cls.load(save_dir, backend=backend)
+            predictions = predictor.predict_by_category(dates)
             
-            # Load scalers first to get feature information
-            scalers_path = os.path.join(category_path, 'scalers.pkl')
-            with open(scalers_path, 'rb') as f:
-                predictor.scalers[category] = pickle.load(f)
+            timings = []
+            for _ in range(repeats):
+                start_time = time.perf_counter()
+                predictor.predict_by_category(dates)
+                timings.append(time.perf_counter() - start_time)
             
-            # Initialize and load model
-            n_features = len(predictor.scalers[category]['feature_columns'])
-            model = LSTMModel(input_size=n_features,
-                            hidden_size=predictor.hidden_size,
-                            num_layers=predictor.num_layers).to(predictor.device)
+            if reference is None:
+                reference = predictions
+            max_abs_diff = max(
+                (abs(amount - reference[category][date])
+                 for category in reference for date, amount in predictions[category].items()),
+                default=0.0
+            )
             
-            model_path = os.path.join(category_path, 'model.pth')
-            model.load_state_dict(torch.load(model_path, 
-                                map_location=predictor.device))
-            model.eval()
+            results[backend] = {
+                'max_abs_diff': float(max_abs_diff),
+                'p50_ms': float(np.percentile(timings, 50) * 1000),
+                'p99_ms': float(np.percentile(timings, 99) * 1000)
+            }
+            print(f"{backend}: max abs diff {max_abs_diff:.2e}, "
+                  f"p50 {results[backend]['p50_ms']:.2f}ms, p99 {results[backend]['p99_ms']:.2f}ms")
+        
+        return results
+    
+    def quantization_report(self, df):
+        """Compare int8 dynamic quantization against the fp32 models on validation data
+        
+        Rebuilds each category's sequences from df with the fitted transformer and
+        scalers, and evaluates the held-out tail of the size recorded in training_history.
+        
+        Args:
+            df: Transactions the models were trained on, same columns as for train()
+        
+        Returns:
+            Dictionary with categories as keys and fp32/int8 MAE and model sizes as values
+        """
+        from sklearn.metrics import mean_absolute_error
+        
+        self.materialize()
+        df = self.feature_transformer.transform_for_training(df)
+        matrix = self._build_training_matrix(df, self.feature_transformer)
+        report = {}
+        
+        for category in self.categories:
+            model = self._fp32_model(category)
+            scalers = self.scalers[category]
+            category_df = self._build_category_frame(matrix, category)
+            scaled_data = np.hstack((
+                scalers['feature_scaler'].transform(category_df[scalers['feature_columns']]),
+                scalers['target_scaler'].transform(category_df[['amount']])
+            ))
+            X, y = create_sequences(scaled_data, self.sequence_length, len(scalers['feature_columns']))
             
-            predictor.models[category] = model
+            # Same held-out tail as the train/validation split in train()
+            history = self.metadata['training_history'].get(category, {})
+            validation_samples = history.get('validation_samples') or int(np.ceil(len(X) * 0.2))
+            X_val = to_tensor(X[-validation_samples:], torch.device('cpu'))
+            y_val = scalers['target_scaler'].inverse_transform(y[-validation_samples:].reshape(-1, 1))
             
-        print(f"Loaded predictor from {save_dir}")
-        print(f"Last trained: {predictor.metadata['last_trained']}")
-        return predictor
+            quantized = inference_backends.quantize_dynamic(model)
+            model.eval()
+            with torch.no_grad():
+                fp32_predictions = model(X_val.to(self.device)).cpu().numpy()
+                int8_predictions = quantized(X_val).numpy()
+            fp32_predictions = scalers['target_scaler'].inverse_transform(fp32_predictions)
+            int8_predictions = scalers['target_scaler'].inverse_transform(int8_predictions)
+            
+            report[category] = {
+                'validation_samples': int(validation_samples),
+                'recorded_mae': history.get('mae'),
+                'fp32_mae': float(mean_absolute_error(y_val, fp32_predictions)),
+                'int8_mae': float(mean_absolute_error(y_val, int8_predictions)),
+                'max_abs_diff': float(np.abs(fp32_predictions - int8_predictions).max()),
+                'fp32_bytes': inference_backends.state_dict_bytes(model),
+                'int8_bytes': inference_backends.state_dict_bytes(quantized)
+            }
+            print(f"{category}: fp32 MAE {report[category]['fp32_mae']:.2f}, "
+                  f"int8 MAE {report[category]['int8_mae']:.2f}, "
+                  f"size {report[category]['fp32_bytes']} -> {report[category]['int8_bytes']} bytes")
+        
+        return report
     
     def retrain(self, df_train, categories=None, num_epochs=100, 
-                batch_size=32, patience=10, retain_history=True):
-        """Retrain models with new data while optionally keeping training history"""
+                batch_size=32, patience=10, retain_history=True, incremental=False,
+                skip_unchanged=True):
+        """Retrain models with new data while optionally keeping training history
+        
+        Args:
+            incremental: Continue from the current weights, scalers and feature
+                transformer on the transactions after the last training only,
+                see _train_incremental
+            skip_unchanged: Keep the models of categories whose transactions match
+                the fingerprint recorded when they were trained, see _unchanged_categories
+        """
+        if incremental and not retain_history:
+            raise ValueError("Incremental retraining continues from the current models, "
+                             "it needs retain_history=True")
         if not retain_history:
             # Reset models and scalers if not retaining history
             self.models = {}
             self.scalers = {}
+            self._staged_scalers = {}
+            self._quantized_paths = {}
+            self._fp32_models = {}
+            self._lazy_categories = []
+            self._pending_categories = {}
         
         # Store previous performance metrics if retaining history
         previous_metrics = self.metadata.get('training_history', {}).copy()
         
+        unchanged = []
+        if retain_history and skip_unchanged:
+            categories, unchanged = self._unchanged_categories(df_train, categories)
+            if not categories:
+                print("No category changed since the last training, models unchanged")
+                return
+        
         # Train models with new data
-        self.train(df_train, categories, num_epochs, batch_size, patience)
+        if incremental:
+            if not self._train_incremental(df_train, categories, num_epochs, batch_size, patience):
+                return
+        else:
+            # Skipped models were trained on the current transformer's features
+            self.train(df_train, categories, num_epochs, batch_size, patience,
+                       refit_transformer=not unchanged)
         
         # Update metadata
         if retain_history and previous_metrics:
             # Merge previous metrics with new ones
             for category, metrics in previous_metrics.items():
-                if category in self.metadata['training_history']:
+                if category in self.metadata['training_history'] and category not in unchanged:
                     self.metadata['training_history'][category]['retraining_history'] = metrics
         
         # Update version
@@ -536,205 +1252,115 @@ class ModelPipeline:
         
         print(f"Models retrained. New version: {self.metadata['model_version']}")
     
-    def create_training_plots(self, df_train, save_dir):
-        """Create and save training plots for each category"""
+    def _unchanged_categories(self, df_train, categories=None):
+        """Split the categories to retrain by whether their fingerprint changed
         
-        os.makedirs(os.path.join(save_dir, 'plots'), exist_ok=True)
-        plt.style.use('ggplot')
+        Skips are counted in each unchanged category's training_history, with the
+        training time they saved.
         
-        for category in self.models.keys():
-            print(f"Creating plots for category: {category}")
-            
-            # Prepare data
-            category_data = df_train[df_train['category'] == category].copy()
-            scaled_data = self.preprocess_data(df_train, category)
-            n_features = scaled_data.shape[1] - 1
-            
-            # Create sequences
-            X, y = create_sequences(scaled_data, self.sequence_length, n_features)
-            X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, shuffle=False)
-            
-            # Convert to tensors and get predictions
-            X_train_tensor = torch.FloatTensor(X_train).to(self.device)
-            X_val_tensor = torch.FloatTensor(X_val).to(self.device)
-            
-            model = self.models[category]
-            model.eval()
-            with torch.no_grad():
-                train_predictions = model(X_train_tensor).cpu().numpy()
-                val_predictions = model(X_val_tensor).cpu().numpy()
-            
-            # Inverse transform predictions and actual values
-            train_predictions = self.scalers[category]['target_scaler'].inverse_transform(
-                train_predictions.reshape(-1, 1)
-            )
-            val_predictions = self.scalers[category]['target_scaler'].inverse_transform(
-                val_predictions.reshape(-1, 1)
-            )
-            y_train_actual = self.scalers[category]['target_scaler'].inverse_transform(
-                y_train.reshape(-1, 1)
-            )
-            y_val_actual = self.scalers[category]['target_scaler'].inverse_transform(
-                y_val.reshape(-1, 1)
-            )
-            
-            # Calculate prediction intervals (using standard deviation)
-            train_std = np.std(np.abs(train_predictions - y_train_actual))
-            val_std = np.std(np.abs(val_predictions - y_val_actual))
-            
-            # Create confidence bands (±2 standard deviations for ~95% confidence)
-            train_upper = train_predictions + 2 * train_std
-            train_lower = train_predictions - 2 * train_std
-            val_upper = val_predictions + 2 * val_std
-            val_lower = val_predictions - 2 * val_std
-            
-            # Create figure
-            plt.figure(figsize=(15, 8))
-            
-            # Plot training data with confidence interval
-            plt.plot(range(len(y_train_actual)), y_train_actual, 
-                    label='Train Actual', alpha=0.5, color='blue')
-            plt.plot(range(len(train_predictions)), train_predictions, 
-                    label='Train Predicted', alpha=0.5, color='lightblue')
-            plt.fill_between(range(len(train_predictions)), 
-                            train_lower.flatten(), 
-                            train_upper.flatten(), 
-                            color='lightblue', alpha=0.2, 
-                            label='Train Prediction Range')
-            
-            # Plot validation data with confidence interval
-            offset = len(y_train_actual)
-            plt.plot(range(offset, offset + len(y_val_actual)), y_val_actual, 
-                    label='Val Actual', color='red')
-            plt.plot(range(offset, offset + len(val_predictions)), val_predictions, 
-                    label='Val Predicted', color='lightcoral')
-            plt.fill_between(range(offset, offset + len(val_predictions)), 
-                            val_lower.flatten(), 
-                            val_upper.flatten(), 
-                            color='red', alpha=0.2, 
-                            label='Val Prediction Range')
-            
-            plt.title(f'Actual vs Predicted Values for {category}')
-            plt.xlabel('Time Steps')
-            plt.ylabel('Amount')
-            plt.legend()
-            plt.grid(True)
-            
-            # Add metrics as text
-            metrics = self.metadata['training_history'][category]
-            metrics_text = f"MAE: {metrics['mae']:.2f}\n"
-            metrics_text += f"RMSE: {metrics['rmse']:.2f}\n"
-            metrics_text += f"Training Samples: {metrics['training_samples']}\n"
-            metrics_text += f"Validation Samples: {metrics['validation_samples']}\n"
-            metrics_text += f"Prediction Range: ±{2*val_std:.2f}"  # Added prediction range info
-            
-            plt.figtext(0.02, 0.02, metrics_text, fontsize=10, 
-                       bbox=dict(facecolor='white', alpha=0.8))
-            
-            # Adjust layout and save
-            plt.tight_layout()
-            plt.savefig(os.path.join(save_dir, 'plots', f'{category}_prediction.png'), 
-                       dpi=300, bbox_inches='tight')
-            plt.close()
-            
-        print(f"Plots saved in {os.path.join(save_dir, 'plots')}")
-
-    def create_aggregated_plot(self, df_train, save_dir):
-        """Create a plot showing sum of predictions across all categories"""
+        Returns:
+            (categories to train, unchanged categories)
+        """
+        if self.feature_transformer is None:
+            return categories, []
         
-        plt.figure(figsize=(20, 10))
-        plt.style.use('ggplot')
+        # Same rows train() sees, the year statistics do not affect the fingerprint
+        df_train = self.feature_transformer.transform_for_training(df_train)
+        if categories is None:
+            categories = df_train['category'].unique()
         
-        # First, find the minimum length across all predictions
-        min_length = float('inf')
-        predictions_by_category = {}
-        actuals_by_category = {}
+        history = self.metadata['training_history']
+        changed, unchanged = [], []
+        for category in categories:
+            fingerprint = history.get(category, {}).get('fingerprint')
+            if category in self.categories and fingerprint == category_fingerprint(df_train, category):
+                unchanged.append(category)
+            else:
+                changed.append(category)
+        
+        for category in unchanged:
+            history[category]['skipped_retrains'] = history[category].get('skipped_retrains', 0) + 1
+            history[category]['last_skipped_at'] = datetime.now().isoformat()
+            history[category]['skipped_seconds'] = (history[category].get('skipped_seconds', 0.0)
+                                                    + history[category].get('training_seconds', 0.0))
+        if unchanged:
+            saved_seconds = sum(history[category].get('training_seconds', 0.0) for category in unchanged)
+            print(f"Skipping {len(unchanged)} unchanged categories ({', '.join(unchanged)}), "
+                  f"saving about {saved_seconds:.1f}s of training")
+        return changed, unchanged
+    
+    def _train_incremental(self, df_train, categories, num_epochs, batch_size, patience):
+        """Warm-start training on the transactions newer than the last training
+        
+        Each window needs sequence_length earlier days, so the newest
+        sequence_length days already trained on are kept as context, more
+        if there are fewer than INCREMENTAL_MIN_SEQUENCES new days. The
+        fitted feature transformer is reused and scaler ranges only widen.
+        Categories without a model are trained from new weights on the full
+        df_train.
+        
+        Returns:
+            False if df_train has no transactions after the last training
+        """
+        cutoff = self.metadata.get('trained_through') or self.metadata.get('last_trained')
+        if cutoff is None or self.feature_transformer is None:
+            raise ValueError("Incremental retraining needs a trained or loaded pipeline")
+        cutoff = pd.Timestamp(cutoff)
+        
+        self.materialize()
+        df_train = self.feature_transformer.transform_for_training(df_train)
+        if categories is None:
+            categories = df_train['category'].unique()
         
-        for category in self.models.keys():
-            print(f"Processing category: {category}")
-            
-            # Prepare data
-            scaled_data = self.preprocess_data(df_train, category)
-            n_features = scaled_data.shape[1] - 1
-            
-            # Create sequences
-            X, y = create_sequences(scaled_data, self.sequence_length, n_features)
-            X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, shuffle=False)
-            
-            # Get predictions
-            model = self.models[category]
-            model.eval()
-            with torch.no_grad():
-                val_predictions = model(torch.FloatTensor(X_val).to(self.device)).cpu().numpy()
-            
-            # Inverse transform predictions and actual values
-            val_predictions = self.scalers[category]['target_scaler'].inverse_transform(
-                val_predictions.reshape(-1, 1)
-            )
-            y_val_actual = self.scalers[category]['target_scaler'].inverse_transform(
-                y_val.reshape(-1, 1)
-            )
-            
-            # Store predictions and actuals
-            predictions_by_category[category] = val_predictions
-            actuals_by_category[category] = y_val_actual
-            
-            # Update minimum length
-            min_length = min(min_length, len(val_predictions))
-        
-        # Truncate all predictions and actuals to minimum length and sum them
-        all_predictions = []
-        all_actuals = []
-        
-        for category in self.models.keys():
-            all_predictions.append(predictions_by_category[category][:min_length])
-            all_actuals.append(actuals_by_category[category][:min_length])
-        
-        # Convert to numpy arrays and sum
-        summed_predictions = np.sum(all_predictions, axis=0)
-        summed_actuals = np.sum(all_actuals, axis=0)
-        
-        # Calculate prediction intervals for summed values
-        prediction_std = np.std(np.abs(summed_predictions - summed_actuals))
-        
-        # Create confidence bands
-        upper_bound = summed_predictions + 2 * prediction_std
-        lower_bound = summed_predictions - 2 * prediction_std
-        
-        # Plot summed data
-        plt.plot(range(len(summed_actuals)), summed_actuals, 
-                label='Actual Total', color='blue', alpha=0.5)
-        plt.plot(range(len(summed_predictions)), summed_predictions, 
-                label='Predicted Total', color='red', linewidth=2)
-        plt.fill_between(range(len(summed_predictions)), 
-                        lower_bound.flatten(), 
-                        upper_bound.flatten(), 
-                        color='red', alpha=0.2,
-                        label='Prediction Range')
-        
-        plt.title('Total Transaction Amount: Actual vs Predicted')
-        plt.xlabel('Time Steps')
-        plt.ylabel('Total Amount')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        
-        # Calculate and add overall metrics
-        mae = mean_absolute_error(summed_actuals, summed_predictions)
-        rmse = np.sqrt(mean_squared_error(summed_actuals, summed_predictions))
-        
-        metrics_text = f"Overall Metrics:\n"
-        metrics_text += f"MAE: {mae:.2f}\n"
-        metrics_text += f"RMSE: {rmse:.2f}\n"
-        metrics_text += f"Prediction Range: ±{2*prediction_std:.2f}"
-        
-        plt.figtext(0.02, 0.02, metrics_text, fontsize=10,
-                    bbox=dict(facecolor='white', alpha=0.8))
-        
-        # Adjust layout and save
-        plt.tight_layout()
-        plt.savefig(os.path.join(save_dir, 'plots', 'total_predictions.png'), 
-                    dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"Total predictions plot saved in {os.path.join(save_dir, 'plots')}")
-
+        matrix = self._build_training_matrix(df_train, self.feature_transformer, categories)
+        calendar = matrix[1].index
+        first_new = calendar.searchsorted(cutoff, side='right')
+        if first_new == len(calendar):
+            print(f"No transactions after {cutoff}, models unchanged")
+            return False
+        
+        # Context for the first new window, extended back so the train/validation
+        # split still has something on both sides after a quiet day
+        first_kept = min(first_new, len(calendar) - self.INCREMENTAL_MIN_SEQUENCES) - self.sequence_length
+        print(f"Incremental training on {len(calendar) - first_new} new days after {cutoff}")
+        
+        existing = [category for category in categories if category in self.models]
+        new = [category for category in categories if category not in self.models]
+        start_time = time.perf_counter()
+        if existing:
+            category_dfs = {category: self._build_category_frame(matrix, category, max(first_kept, 0))
+                            for category in existing}
+            self._train_grouped(category_dfs, num_epochs, batch_size, patience,
+                                initial_models={category: self._fp32_model(category)
+                                                for category in existing})
+        if new:
+            category_dfs = {category: self._build_category_frame(matrix, category)
+                            for category in new}
+            self._train_grouped(category_dfs, num_epochs, batch_size, patience)
+        
+        self._finish_training(df_train, categories, time.perf_counter() - start_time)
+        return True
+    
+    def create_training_plots(self, save_dir):
+        """Render the plots of the last train(plots=True) in a background process
+        
+        Draws from the training and validation series recorded with the
+        validation metrics, so nothing is preprocessed or predicted again.
+        """
+        import multiprocessing
+        
+        if not self._plot_series:
+            return
+        metrics = {category: dict(self.metadata['training_history'][category])
+                   for category in self._plot_series}
+        # Fork like _train_parallel, the child imports matplotlib on its own
+        context = multiprocessing.get_context('fork')
+        self._plot_process = context.Process(target=_render_training_plots,
+                                             args=(self._plot_series, metrics, save_dir))
+        self._plot_process.start()
+        self._plot_series = None
+    
+    def wait_for_plots(self, timeout=None):
+        """Block until the plotting process started by create_training_plots is done"""
+        if self._plot_process is not None:
+            self._plot_process.join(timeout)
@@ -0,0 +1,136 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+USER_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+class ModelRegistry:
+    """Per-user forecasting pipelines, loaded on first use and kept in a memory-bounded LRU.
+
+    A user's model lives in root_dir/<user_id>. Users without one share the
+    default model, which stays resident. Concurrent first requests for the
+    same model directory wait on a single load.
+    """
+
+    def __init__(self, loader, root_dir='models/users', default_dir='models/oracle_v1',
+                 max_bytes=512 * 1024 * 1024):
+        """
+        Args:
+            loader: Callable taking a model directory and returning a loaded pipeline
+            root_dir: Directory holding one model directory per user_id
+            default_dir: Model served to users without their own directory
+            max_bytes: Memory budget for resident per-user pipelines, the
+                default model is not counted against it
+        """
+        self.loader = loader
+        self.root_dir = root_dir
+        self.default_dir = default_dir
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()  # model_dir -> pipeline
+        self._loading = {}  # model_dir -> Future of an in-flight load
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.loads = 0
+        self.load_seconds_total = 0.0
+        self.load_seconds_max = 0.0
+
+    def model_dir(self, user_id):
+        """Directory of the model serving user_id"""
+        if user_id is not None:
+            user_id = str(user_id)
+            if not USER_ID_PATTERN.match(user_id):
+                raise ValueError(f"Invalid user_id: {user_id}")
+            user_dir = os.path.join(self.root_dir, user_id)
+            if os.path.isdir(user_dir):
+                return user_dir
+        return self.default_dir
+
+    def get(self, user_id=None):
+        """Pipeline for user_id, loading it on first use"""
+        model_dir = self.model_dir(user_id)
+
+        with self._lock:
+            if model_dir in self._entries:
+                self._entries.move_to_end(model_dir)
+                self.hits += 1
+                return self._entries[model_dir]
+
+            self.misses += 1
+            future = self._loading.get(model_dir)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._loading[model_dir] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            start_time = time.perf_counter()
+            pipeline = self.loader(model_dir)
+            load_seconds = time.perf_counter() - start_time
+        except Exception as e:
+            with self._lock:
+                del self._loading[model_dir]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self.loads += 1
+            self.load_seconds_total += load_seconds
+            self.load_seconds_max = max(self.load_seconds_max, load_seconds)
+            self._entries[model_dir] = pipeline
+            self._evict(keep=model_dir)
+            del self._loading[model_dir]
+        future.set_result(pipeline)
+        return pipeline
+
+    def _evict(self, keep):
+        # Least recently used first. The default model is never evicted and is
+        # outside the budget, keep is the model just loaded for the caller
+        for model_dir in list(self._entries):
+            if self._budgeted_bytes() <= self.max_bytes:
+                break
+            if model_dir in (self.default_dir, keep):
+                continue
+            del self._entries[model_dir]
+            self.evictions += 1
+
+    def _budgeted_bytes(self):
+        return sum(pipeline.memory_bytes() for model_dir, pipeline in self._entries.items()
+                   if model_dir != self.default_dir)
+
+    def resident_bytes(self):
+        # Measured on demand, lazily loaded pipelines grow after they are registered
+        return sum(pipeline.memory_bytes() for pipeline in self._entries.values())
+
+    def resident(self):
+        """Currently loaded pipelines"""
+        with self._lock:
+            return list(self._entries.values())
+
+    def stats(self):
+        """Hit rate, load latency and resident model count"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'resident_models': len(self._entries),
+                'resident_bytes': self.resident_bytes(),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'loads': self.loads,
+                'load_seconds_mean': self.load_seconds_total / self.loads if self.loads else 0.0,
+                'load_seconds_max': self.load_seconds_max
+            }
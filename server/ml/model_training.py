@@ -1,17 +1,16 @@
 from model_pipeline import ModelPipeline, read_financial_transactions
 
 def main():
-    df = read_financial_transactions()
-    columns = ['amount', 'type', 'datetime', 'category']
-    df = df[columns]
+    df = read_financial_transactions(columns=['amount', 'type', 'datetime', 'category'])
 
     df_train = df[df['datetime'] < '2024-08-29']
     # df_test = df[df['datetime'] >= '2024-08-29']
 
     # Initialize and train
     predictor = ModelPipeline()
-    predictor.train(df_train)
+    predictor.train(df_train, plots=True, plot_dir='../models/oracle_v1')
     predictor.save('../models/oracle_v1')
+    predictor.wait_for_plots()
 
     # Load the predictor later
     # loaded_predictor = ModelPipeline.load('../models/oracle_v1')
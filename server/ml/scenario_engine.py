@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+
+class ScenarioEngine:
+    """What-if scenarios applied to a category x date forecast matrix.
+
+    Every scenario is linear in the category forecasts: skip_expense drops a
+    category, new_expense adds a percentage of it and reduce_expense removes a
+    percentage of it. A scenario is therefore one row of per-category
+    multipliers, and any number of scenarios cost a single
+    [scenarios, categories] x [categories, dates] matmul.
+    """
+
+    SCENARIO_TYPES = ('skip_expense', 'new_expense', 'reduce_expense')
+
+    def __init__(self, categories, dates, forecasts):
+        """
+        Args:
+            categories: Category names, one per row of forecasts
+            dates: DatetimeIndex, one per column of forecasts
+            forecasts: Array of shape [categories, dates]
+        """
+        self.categories = list(categories)
+        self.dates = pd.DatetimeIndex(dates)
+        self.forecasts = np.asarray(forecasts, dtype=np.float64)
+        self._category_index = {category: index for index, category in enumerate(self.categories)}
+
+    @classmethod
+    def from_predictions(cls, predictions_by_category, dates):
+        """Build the matrix from predict_by_category output, missing dates count as 0"""
+        dates = pd.DatetimeIndex(pd.to_datetime(dates))
+        forecasts = np.zeros((len(predictions_by_category), len(dates)))
+        for row, predictions in enumerate(predictions_by_category.values()):
+            forecasts[row] = [predictions.get(date, 0) for date in dates]
+        return cls(predictions_by_category.keys(), dates, forecasts)
+
+    def baseline(self):
+        """Total forecast across categories for each date"""
+        return self.forecasts.sum(axis=0)
+
+    def multipliers(self, scenarios):
+        """Per-category multipliers, array of shape [scenarios, categories]
+
+        Inactive scenario types and categories without a forecast are ignored.
+        """
+        multipliers = np.ones((len(scenarios), len(self.categories)))
+        for row, scenario in enumerate(scenarios):
+            for scenario_type in self.SCENARIO_TYPES:
+                settings = scenario.get(scenario_type) or {}
+                if not settings.get('active'):
+                    continue
+                index = self._category_index.get(settings.get('category'))
+                if index is None:
+                    continue
+                
+                if scenario_type == 'skip_expense':
+                    multipliers[row, index] -= 1.0
+                elif scenario_type == 'new_expense':
+                    multipliers[row, index] += float(settings['percent'])
+                else:
+                    multipliers[row, index] -= float(settings['percent'])
+        return multipliers
+
+    def apply(self, scenarios):
+        """Total forecast for each scenario and date, array of shape [scenarios, dates]"""
+        return self.multipliers(scenarios) @ self.forecasts
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from model_artifact import read_artifact, write_artifact
+
+
+class StatefulForecaster:
+    """Carries every category's LSTM (h, c) state forward one day at a time.
+
+    Each new day is fed to the fused engine as one more LSTM step, so keeping
+    a user's forecaster current costs one step per category per day instead
+    of recomputing from a zero state. Forecasts roll a copy of the state
+    forward over the horizon, the stored state only moves with update().
+    """
+
+    STATE_FILE = 'forecast_state.oracle'
+
+    def __init__(self, pipeline):
+        """
+        Args:
+            pipeline: InferencePipeline or ModelPipeline with a fused engine
+        """
+        if pipeline.engine is None:
+            raise ValueError("Stateful forecasting needs the fused engine")
+        self.pipeline = pipeline
+        self.engine = pipeline.engine
+        self.state = self.engine.initial_state()
+
+        # Last day folded into the state, None before the first update
+        self.last_date = None
+
+    def _features(self, dates):
+        transformed_data = self.pipeline._prepare_prediction_data(dates)
+        return transformed_data[self.engine.feature_columns].to_numpy()
+
+    def _next_dates(self, end_date=None, periods=None):
+        start_date = pd.Timestamp.now().normalize() if self.last_date is None \
+            else self.last_date + pd.Timedelta(days=1)
+        return pd.date_range(start=start_date, end=end_date, periods=periods, freq='D')
+
+    def update(self, date):
+        """Advance the state through every day after last_date up to date
+
+        Days already in the state are ignored, so calling this for each new
+        transaction only costs a step on the first one of a day.
+
+        Returns:
+            Number of days the state advanced
+        """
+        date = pd.Timestamp(date).normalize()
+        if self.last_date is None:
+            dates = pd.DatetimeIndex([date])
+        else:
+            dates = self._next_dates(end_date=date)
+        if len(dates) == 0:
+            return 0
+
+        for features in self._features(dates):
+            _, self.state = self.engine.step(features, self.state)
+        self.last_date = date
+        return len(dates)
+
+    def forecast(self, horizon_days):
+        """Forecast each category for the horizon_days days after last_date
+
+        Returns:
+            Dictionary with categories as keys and {date: amount} as values
+        """
+        dates = self._next_dates(periods=horizon_days)
+        predictions = np.empty((len(self.engine.categories), len(dates)), dtype=np.float32)
+
+        state = self.state
+        for index, features in enumerate(self._features(dates)):
+            predictions[:, index], state = self.engine.step(features, state)
+
+        return {
+            category: {date: float(amount) for date, amount in zip(dates, category_predictions)}
+            for category, category_predictions in zip(self.engine.categories, predictions)
+        }
+
+    def save(self, path):
+        """Persist the state, e.g. to the user's model directory as STATE_FILE"""
+        header = {
+            'categories': self.engine.categories,
+            'model_version': self.pipeline.metadata.get('model_version'),
+            'last_date': None if self.last_date is None else str(self.last_date.date())
+        }
+        write_artifact(path, self.state, header)
+
+    @classmethod
+    def load(cls, pipeline, path):
+        """Restore a state saved for the same model"""
+        forecaster = cls(pipeline)
+        header, state = read_artifact(path)
+        if header['categories'] != forecaster.engine.categories or \
+                header['model_version'] != pipeline.metadata.get('model_version'):
+            raise ValueError(f"Forecast state in {path} was saved for a different model")
+
+        forecaster.state = state
+        forecaster.last_date = None if header['last_date'] is None else pd.Timestamp(header['last_date'])
+        return forecaster
@@ -0,0 +1,46 @@
+import numpy as np
+
+
+def add_temporal_features(X, mean_year=None, std_year=None):
+    """Cyclical calendar features and the normalized year, on a copy of X"""
+    result = X.copy()
+
+    result.loc[:, 'day_of_week'] = result['datetime'].dt.dayofweek
+    result.loc[:, 'day_of_week_sin'] = np.sin(result['day_of_week'] * (2 * np.pi / 7))
+    result.loc[:, 'day_of_week_cos'] = np.cos(result['day_of_week'] * (2 * np.pi / 7))
+
+    result.loc[:, 'day_of_month'] = result['datetime'].dt.day
+    result.loc[:, 'day_of_month_sin'] = np.sin(result['day_of_month'] * (2 * np.pi / 31))
+    result.loc[:, 'day_of_month_cos'] = np.cos(result['day_of_month'] * (2 * np.pi / 31))
+
+    result.loc[:, 'month'] = result['datetime'].dt.month
+    result.loc[:, 'month_sin'] = np.sin(result['month'] * (2 * np.pi / 12))
+    result.loc[:, 'month_cos'] = np.cos(result['month'] * (2 * np.pi / 12))
+
+    # Add normalized year feature
+    if mean_year is not None and std_year is not None:
+        result.loc[:, 'year_norm'] = (result['datetime'].dt.year - mean_year) / std_year
+
+    return result
+
+
+class InferenceFeatureTransformer:
+    """Prediction-time half of FeatureTransformer, without the sklearn dependency.
+
+    Holds the fitted year statistics and produces the same features as
+    FeatureTransformer.transform_for_inference.
+    """
+
+    def __init__(self, mean_year, std_year):
+        self.mean_year_ = mean_year
+        self.std_year_ = std_year
+
+    def transform_for_inference(self, X):
+        """Add temporal features for prediction dates"""
+        result = add_temporal_features(X, self.mean_year_, self.std_year_)
+
+        # Add default type for prediction if needed
+        if 'type' not in result.columns:
+            result.loc[:, 'type'] = 'expense'
+
+        return result
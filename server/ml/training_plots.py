@@ -0,0 +1,186 @@
+"""Training plots drawn from the series ModelPipeline records while training.
+
+Only imported by the background plotting process started from
+ModelPipeline.create_training_plots and by ModelPipeline._create_prediction_plot,
+so training and inference never load matplotlib themselves.
+"""
+import os
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+
+def plot_category(category, series, metrics, save_dir):
+    """Actual vs predicted training and validation amounts of one category"""
+    train_predictions = series['train_predictions']
+    val_predictions = series['val_predictions']
+    y_train_actual = series['y_train']
+    y_val_actual = series['y_val']
+    
+    # Calculate prediction intervals (using standard deviation)
+    train_std = np.std(np.abs(train_predictions - y_train_actual))
+    val_std = np.std(np.abs(val_predictions - y_val_actual))
+    
+    # Create confidence bands (±2 standard deviations for ~95% confidence)
+    train_upper = train_predictions + 2 * train_std
+    train_lower = train_predictions - 2 * train_std
+    val_upper = val_predictions + 2 * val_std
+    val_lower = val_predictions - 2 * val_std
+    
+    # Create figure
+    plt.figure(figsize=(15, 8))
+    
+    # Plot training data with confidence interval
+    plt.plot(range(len(y_train_actual)), y_train_actual, 
+            label='Train Actual', alpha=0.5, color='blue')
+    plt.plot(range(len(train_predictions)), train_predictions, 
+            label='Train Predicted', alpha=0.5, color='lightblue')
+    plt.fill_between(range(len(train_predictions)), 
+                    train_lower, 
+                    train_upper, 
+                    color='lightblue', alpha=0.2, 
+                    label='Train Prediction Range')
+    
+    # Plot validation data with confidence interval
+    offset = len(y_train_actual)
+    plt.plot(range(offset, offset + len(y_val_actual)), y_val_actual, 
+            label='Val Actual', color='red')
+    plt.plot(range(offset, offset + len(val_predictions)), val_predictions, 
+            label='Val Predicted', color='lightcoral')
+    plt.fill_between(range(offset, offset + len(val_predictions)), 
+                    val_lower, 
+                    val_upper, 
+                    color='red', alpha=0.2, 
+                    label='Val Prediction Range')
+    
+    plt.title(f'Actual vs Predicted Values for {category}')
+    plt.xlabel('Time Steps')
+    plt.ylabel('Amount')
+    plt.legend()
+    plt.grid(True)
+    
+    # Add metrics as text
+    metrics_text = f"MAE: {metrics['mae']:.2f}\n"
+    metrics_text += f"RMSE: {metrics['rmse']:.2f}\n"
+    metrics_text += f"Training Samples: {metrics['training_samples']}\n"
+    metrics_text += f"Validation Samples: {metrics['validation_samples']}\n"
+    metrics_text += f"Prediction Range: ±{2*val_std:.2f}"
+    
+    plt.figtext(0.02, 0.02, metrics_text, fontsize=10, 
+               bbox=dict(facecolor='white', alpha=0.8))
+    
+    # Adjust layout and save
+    plt.tight_layout()
+    plt.savefig(os.path.join(save_dir, 'plots', f'{category}_prediction.png'), 
+               dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def plot_total(series, save_dir):
+    """Sum of the validation predictions across all categories against the actual total"""
+    # Categories share the daily calendar, truncate in case a series is shorter
+    min_length = min(len(category_series['val_predictions']) for category_series in series.values())
+    summed_predictions = np.sum([category_series['val_predictions'][:min_length]
+                                 for category_series in series.values()], axis=0)
+    summed_actuals = np.sum([category_series['y_val'][:min_length]
+                             for category_series in series.values()], axis=0)
+    
+    # Calculate prediction intervals for summed values
+    prediction_std = np.std(np.abs(summed_predictions - summed_actuals))
+    
+    # Create confidence bands
+    upper_bound = summed_predictions + 2 * prediction_std
+    lower_bound = summed_predictions - 2 * prediction_std
+    
+    plt.figure(figsize=(20, 10))
+    
+    # Plot summed data
+    plt.plot(range(len(summed_actuals)), summed_actuals, 
+            label='Actual Total', color='blue', alpha=0.5)
+    plt.plot(range(len(summed_predictions)), summed_predictions, 
+            label='Predicted Total', color='red', linewidth=2)
+    plt.fill_between(range(len(summed_predictions)), 
+                    lower_bound, 
+                    upper_bound, 
+                    color='red', alpha=0.2,
+                    label='Prediction Range')
+    
+    plt.title('Total Transaction Amount: Actual vs Predicted')
+    plt.xlabel('Time Steps')
+    plt.ylabel('Total Amount')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    
+    # Calculate and add overall metrics
+    mae = np.mean(np.abs(summed_actuals - summed_predictions))
+    rmse = np.sqrt(np.mean((summed_actuals - summed_predictions) ** 2))
+    
+    metrics_text = f"Overall Metrics:\n"
+    metrics_text += f"MAE: {mae:.2f}\n"
+    metrics_text += f"RMSE: {rmse:.2f}\n"
+    metrics_text += f"Prediction Range: ±{2*prediction_std:.2f}"
+    
+    plt.figtext(0.02, 0.02, metrics_text, fontsize=10,
+                bbox=dict(facecolor='white', alpha=0.8))
+    
+    # Adjust layout and save
+    plt.tight_layout()
+    plt.savefig(os.path.join(save_dir, 'plots', 'total_predictions.png'), 
+                dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def plot_future_predictions(predictions_by_date, save_dir):
+    """Predicted total amount by date, into save_dir/plots/future_predictions.png"""
+    plt.figure(figsize=(15, 8))
+    plt.style.use('ggplot')
+    
+    dates = list(predictions_by_date.keys())
+    values = list(predictions_by_date.values())
+    
+    plt.plot(dates, values, marker='o', linestyle='-', linewidth=2)
+    plt.title('Predicted Total Transaction Amount')
+    plt.xlabel('Date')
+    plt.ylabel('Predicted Amount')
+    plt.grid(True, alpha=0.3)
+    
+    # Rotate x-axis labels for better readability
+    plt.xticks(rotation=45)
+    
+    # Add prediction statistics
+    stats_text = f"Prediction Statistics:\n"
+    stats_text += f"Mean: {np.mean(values):.2f}\n"
+    stats_text += f"Min: {np.min(values):.2f}\n"
+    stats_text += f"Max: {np.max(values):.2f}"
+    
+    plt.figtext(0.02, 0.02, stats_text, fontsize=10,
+                bbox=dict(facecolor='white', alpha=0.8))
+    
+    # Adjust layout and save
+    plt.tight_layout()
+    os.makedirs(os.path.join(save_dir, 'plots'), exist_ok=True)
+    plt.savefig(os.path.join(save_dir, 'plots', 'future_predictions.png'), 
+                dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def render_training_plots(series, metrics, save_dir):
+    """Every category plot and the total plot into save_dir/plots
+    
+    Args:
+        series: {category: {'y_train', 'train_predictions', 'y_val', 'val_predictions'}},
+            1-D arrays in amounts
+        metrics: {category: training_history entry}
+    """
+    os.makedirs(os.path.join(save_dir, 'plots'), exist_ok=True)
+    plt.style.use('ggplot')
+    
+    for category, category_series in series.items():
+        print(f"Creating plots for category: {category}")
+        plot_category(category, category_series, metrics[category], save_dir)
+    if series:
+        plot_total(series, save_dir)
+    
+    print(f"Plots saved in {os.path.join(save_dir, 'plots')}")
@@ -0,0 +1,165 @@
+import glob
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from model_artifact import read_artifact, write_artifact
+
+
+# Column types of the transaction CSVs. String columns with few distinct
+# values are categorical, date and time are combined into datetime.
+SCHEMA = {
+    'account_id': 'category',
+    'transaction_id': np.int64,
+    'date': str,
+    'time': str,
+    'activity': 'category',
+    'amount': np.float32,
+    'category': 'category',
+    'type': 'category',
+    'vendor_name': 'category'
+}
+DATETIME_FORMAT = '%Y-%m-%d %H:%M'
+
+CACHE_DIR = '.cache'
+CACHE_VERSION = 1
+
+
+def cache_path(csv_path):
+    """Columnar cache of a CSV, in a .cache directory next to it"""
+    directory, name = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(directory, CACHE_DIR, f"{os.path.splitext(name)[0]}.oracle")
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_key(csv_path, sha256=None):
+    stat = os.stat(csv_path)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha256 or _file_sha256(csv_path)
+    }
+
+
+def parse_transactions(csv_path):
+    """Parse a transaction CSV with the explicit SCHEMA, without the cache"""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    df = pd.read_csv(csv_path, dtype={column: SCHEMA[column] for column in header if column in SCHEMA})
+    df['datetime'] = pd.to_datetime(df['date'] + ' ' + df['time'], format=DATETIME_FORMAT)
+    return df.drop(columns=['date', 'time'])
+
+
+def write_cache(df, path, source):
+    """Store parsed transactions column by column, categoricals as codes"""
+    arrays, categories = {}, {}
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            arrays[column] = values.cat.codes.to_numpy()
+            categories[column] = values.cat.categories.tolist()
+        elif column == 'datetime':
+            arrays[column] = values.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        else:
+            arrays[column] = values.to_numpy()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_artifact(path, arrays, {
+        'version': CACHE_VERSION,
+        'source': source,
+        'columns': list(df.columns),
+        'categories': categories
+    })
+
+
+def _read_cache(path, columns):
+    """Build a frame of the requested columns, the others are never paged in"""
+    header, arrays = read_artifact(path)
+    columns = header['columns'] if columns is None else columns
+    missing = [column for column in columns if column not in arrays]
+    if missing:
+        raise ValueError(f"Columns not in transactions: {missing}")
+
+    data = {}
+    for column in columns:
+        if column in header['categories']:
+            data[column] = pd.Categorical.from_codes(arrays[column], header['categories'][column])
+        elif column == 'datetime':
+            data[column] = arrays[column].view('datetime64[ns]')
+        else:
+            data[column] = arrays[column]
+    return pd.DataFrame(data)
+
+
+def _cache_is_current(path, csv_path):
+    """Same size and mtime as when cached, or same content after a touch
+    
+    After a touch the new mtime is recorded, so later loads skip the hash again.
+    """
+    if not os.path.exists(path):
+        return False
+    header, arrays = read_artifact(path)
+    source = header.get('source', {})
+    if header.get('version') != CACHE_VERSION:
+        return False
+    stat = os.stat(csv_path)
+    if source.get('size') != stat.st_size:
+        return False
+    if source.get('mtime_ns') == stat.st_mtime_ns:
+        return True
+    
+    sha256 = _file_sha256(csv_path)
+    if source.get('sha256') != sha256:
+        return False
+    try:
+        write_artifact(path, arrays, {**header, 'source': _source_key(csv_path, sha256)})
+    except OSError as error:
+        print(f"Could not update cache of {csv_path}: {error}")
+    return True
+
+
+def load_transactions(csv_path, columns=None):
+    """Transactions of a CSV, parsed once and then read from the columnar cache
+
+    Args:
+        csv_path: Transaction CSV, e.g. data/financial_transactions.csv
+        columns: Columns to load, all by default. datetime replaces date and time
+
+    Returns:
+        DataFrame with categorical string columns, float32 amount and datetime64 datetime
+    """
+    path = cache_path(csv_path)
+    if not _cache_is_current(path, csv_path):
+        df = parse_transactions(csv_path)
+        try:
+            write_cache(df, path, _source_key(csv_path))
+        except OSError as error:
+            print(f"Could not cache {csv_path}: {error}")
+            return df if columns is None else df[columns]
+    return _read_cache(path, columns)
+
+
+def load_transactions_dir(data_dir, columns=None, pattern='*.csv'):
+    """Transactions of every CSV in data_dir, concatenated in file name order
+
+    Categoricals are unioned, so they stay categorical across files.
+    """
+    frames = [load_transactions(path, columns) for path in sorted(glob.glob(os.path.join(data_dir, pattern)))]
+    if not frames:
+        raise ValueError(f"No transaction files matching {pattern} in {data_dir}")
+
+    data = {}
+    for column in frames[0].columns:
+        if isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+            data[column] = pd.api.types.union_categoricals([frame[column] for frame in frames])
+        else:
+            data[column] = np.concatenate([frame[column].to_numpy() for frame in frames])
+    return pd.DataFrame(data)
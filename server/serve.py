@@ -0,0 +1,101 @@
+"""Pre-fork production entry point for the Flask API.
+
+The parent process loads the default model once (by importing app), moves
+its weights into shared memory and binds the listening socket. It then forks
+worker processes that accept on that socket and read the same weight
+pages, so each extra worker only adds its own interpreter state.
+
+Usage:
+    python serve.py --workers 4 --port 8000
+"""
+import argparse
+import os
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--host', default='0.0.0.0')
+parser.add_argument('--port', type=int, default=8000)
+parser.add_argument('--workers', type=int, default=os.cpu_count())
+parser.add_argument('--threads-per-worker', type=int, default=1,
+                    help='Math library threads per worker, keep workers x threads <= cores')
+args = parser.parse_args()
+
+# BLAS/OpenMP pools are sized at import time, so limit them before numpy and torch load
+for variable in ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS']:
+    os.environ[variable] = str(args.threads_per_worker)
+
+import gc
+import signal
+import socket
+import sys
+
+from werkzeug.serving import make_server
+
+import app as api
+
+
+def serve_worker(listener):
+    """Serve requests on the inherited socket until terminated"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if 'torch' in sys.modules:
+        sys.modules['torch'].set_num_threads(args.threads_per_worker)
+    
+    server = make_server(args.host, args.port, api.app, threaded=True, fd=listener.fileno())
+    server.serve_forever()
+
+
+def spawn_worker(listener):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            serve_worker(listener)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def main():
+    shared_bytes = sum(pipeline.share_memory() for pipeline in api.registry.resident())
+    print(f"Shared {shared_bytes / 1024:.0f} KB of model arrays")
+    
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((args.host, args.port))
+    listener.listen(128)
+    listener.set_inheritable(True)
+    
+    # Keep the garbage collector from touching (and so copying) the parent's objects
+    gc.collect()
+    gc.freeze()
+    
+    workers = {spawn_worker(listener) for _ in range(args.workers)}
+    print(f"Serving on {args.host}:{args.port} with {args.workers} workers")
+    
+    stopping = False
+    
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    
+    while workers:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        workers.discard(pid)
+        if not stopping:
+            # Replace workers that crashed
+            print(f"Worker {pid} exited, restarting")
+            workers.add(spawn_worker(listener))
+
+
+if __name__ == '__main__':
+    main()
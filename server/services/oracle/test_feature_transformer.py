@@ -0,0 +1,67 @@
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# Same module aliasing as app.py so the bare imports inside ml/ resolve
+from ml import temporal_features
+sys.modules['temporal_features'] = temporal_features
+
+from ml.feature_transformer import FeatureTransformer
+from ml.temporal_features import InferenceFeatureTransformer
+
+
+class TestFeatureTransformer(unittest.TestCase):
+    def setUp(self):
+        self.transactions = pd.DataFrame({
+            'datetime': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04']),
+            'amount': [10.0, 3000.0, 25.0, 500.0],
+            'type': ['expense', 'income', 'expense', 'transfer'],
+            'category': ['food_and_drink', 'income', 'travel', 'transfer']
+        })
+        self.transformer = FeatureTransformer()
+        self.transformer.fit_transform(self.transactions)
+        self.dates = pd.DataFrame({'datetime': pd.date_range('2025-04-01', periods=30)})
+
+    def test_training_drops_income_and_transfers(self):
+        result = self.transformer.transform_for_training(self.transactions)
+        
+        self.assertEqual(list(result['type']), ['expense', 'expense'])
+
+    def test_inference_adds_expense_type(self):
+        result = self.transformer.transform_for_inference(self.dates)
+        
+        self.assertEqual(len(result), 30)
+        self.assertTrue((result['type'] == 'expense').all())
+        self.assertNotIn('type', self.dates.columns)
+
+    def test_inference_transformer_matches(self):
+        inference_transformer = InferenceFeatureTransformer(
+            self.transformer.mean_year_, self.transformer.std_year_)
+        
+        pd.testing.assert_frame_equal(inference_transformer.transform_for_inference(self.dates),
+                                      self.transformer.transform_for_inference(self.dates))
+
+    def test_explicit_methods_ignore_mode(self):
+        self.transformer.set_mode(training=False)
+        
+        result = self.transformer.transform_for_training(self.transactions)
+        
+        self.assertEqual(len(result), 2)
+        self.assertFalse(self.transformer.training_mode)
+
+    def test_concurrent_training_and_inference(self):
+        def run(index):
+            if index % 2:
+                return len(self.transformer.transform_for_training(self.transactions))
+            return len(self.transformer.transform_for_inference(self.dates))
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            lengths = list(pool.map(run, range(200)))
+        
+        self.assertEqual(lengths, [30, 2] * 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
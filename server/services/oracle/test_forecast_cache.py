@@ -0,0 +1,85 @@
+import unittest
+
+import pandas as pd
+
+from ml.forecast_cache import ForecastCache
+
+
+class FakePredictor:
+    def __init__(self, version='1.0', model_dir='models/oracle_v1'):
+        self.model_dir = model_dir
+        self.metadata = {'model_version': version}
+        self.categories = ['food_and_drink', 'travel']
+        self.requested = []
+
+    def predict_by_category(self, dates):
+        self.requested.append(list(dates))
+        return {
+            'food_and_drink': {date: float(date.day) for date in dates},
+            'travel': {date: float(date.month) for date in dates}
+        }
+
+
+class TestForecastCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ForecastCache(max_entries=100)
+        self.predictor = FakePredictor()
+
+    def test_matches_predictor(self):
+        dates = pd.date_range('2025-04-01', '2025-04-30', freq='D')
+        
+        result = self.cache.predict_by_category(self.predictor, dates)
+        
+        self.assertEqual(result, FakePredictor().predict_by_category(dates))
+
+    def test_overlapping_range_only_computes_missing_dates(self):
+        self.cache.predict_by_category(self.predictor, pd.date_range('2025-04-01', '2025-04-30'))
+        self.cache.predict_by_category(self.predictor, pd.date_range('2025-04-15', '2025-05-05'))
+        
+        self.assertEqual(self.predictor.requested[1], list(pd.date_range('2025-05-01', '2025-05-05')))
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'], 16)
+        self.assertEqual(stats['misses'], 35)
+
+    def test_totals(self):
+        dates = pd.date_range('2025-04-01', '2025-04-03')
+        
+        totals = self.cache.predict(self.predictor, dates)
+        
+        self.assertEqual(totals, {date: date.day + 4.0 for date in dates})
+
+    def test_new_model_version_misses(self):
+        dates = pd.date_range('2025-04-01', '2025-04-03')
+        self.cache.predict_by_category(self.predictor, dates)
+        
+        retrained = FakePredictor(version='1.1')
+        self.cache.predict_by_category(retrained, dates)
+        
+        self.assertEqual(len(retrained.requested), 1)
+
+    def test_models_of_different_users_do_not_collide(self):
+        dates = pd.date_range('2025-04-01', '2025-04-03')
+        self.cache.predict_by_category(self.predictor, dates)
+        
+        other_user = FakePredictor(model_dir='models/users/user123')
+        self.cache.predict_by_category(other_user, dates)
+        
+        self.assertEqual(len(other_user.requested), 1)
+
+    def test_lru_eviction(self):
+        cache = ForecastCache(max_entries=10)
+        cache.predict_by_category(self.predictor, pd.date_range('2025-04-01', periods=10))
+        # Touch the first date so it survives eviction
+        cache.predict_by_category(self.predictor, pd.date_range('2025-04-01', periods=1))
+        cache.predict_by_category(self.predictor, pd.date_range('2025-05-01', periods=5))
+        
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 10)
+        self.assertEqual(stats['evictions'], 5)
+        
+        cache.predict_by_category(self.predictor, pd.date_range('2025-04-01', periods=1))
+        self.assertEqual(len(self.predictor.requested), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from ml.micro_batcher import MicroBatcher
+
+
+class SlowPredictor:
+    def __init__(self, seconds=0.01):
+        self.seconds = seconds
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def predict_by_category(self, dates):
+        with self._lock:
+            self.calls.append(list(dates))
+        time.sleep(self.seconds)
+        return {'food_and_drink': {date: float(date.day) for date in dates}}
+
+
+class FailingPredictor:
+    def predict_by_category(self, dates):
+        raise ValueError('model not loaded')
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_requests_share_inference(self):
+        batcher = MicroBatcher(window_ms=50, max_batch_size=64)
+        predictor = SlowPredictor()
+        ranges = [pd.date_range('2025-04-01', periods=5) + pd.Timedelta(days=i) for i in range(16)]
+        
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda dates: batcher.predict_by_category(predictor, dates), ranges))
+        
+        for dates, result in zip(ranges, results):
+            self.assertEqual(result, {'food_and_drink': {date: float(date.day) for date in dates}})
+        self.assertLess(len(predictor.calls), 16)
+        self.assertEqual(batcher.stats()['batch_size']['count'], len(predictor.calls))
+        self.assertEqual(batcher.stats()['queue_wait_ms']['count'], 16)
+
+    def test_staggered_requests_share_inference(self):
+        batcher = MicroBatcher(window_ms=20, max_batch_size=64)
+        predictor = SlowPredictor(seconds=0.002)
+        
+        with ThreadPoolExecutor(max_workers=40) as pool:
+            futures = []
+            for i in range(40):
+                futures.append(pool.submit(batcher.predict_by_category, predictor, ['2025-04-01']))
+                # Each request reaches the worker on its own before the next one is sent
+                while not futures[-1].done() and (batcher._queue is None or not batcher._queue.empty()):
+                    time.sleep(0.0001)
+                time.sleep(0.0005)
+            for future in futures:
+                future.result()
+        
+        # Requests 0.5 ms apart span a few 20 ms windows
+        self.assertLessEqual(len(predictor.calls), 8)
+        self.assertEqual(batcher.stats()['batch_size']['count'], len(predictor.calls))
+
+    def test_max_batch_size(self):
+        batcher = MicroBatcher(window_ms=50, max_batch_size=2)
+        predictor = SlowPredictor()
+        
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(lambda i: batcher.predict_by_category(predictor, ['2025-04-01']), range(6)))
+        
+        self.assertGreaterEqual(len(predictor.calls), 3)
+
+    def test_lone_request_does_not_wait_for_window(self):
+        batcher = MicroBatcher(window_ms=1000)
+        predictor = SlowPredictor()
+
+        started = time.perf_counter()
+        batcher.predict_by_category(predictor, ['2025-04-01'])
+
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertLess(batcher.stats()['queue_wait_ms']['mean'], 500)
+
+    def test_slow_pipeline_does_not_block_others(self):
+        batcher = MicroBatcher(window_ms=1)
+        released = threading.Event()
+
+        class BlockedPredictor:
+            def predict_by_category(self, dates):
+                released.wait(timeout=5)
+                return {'food_and_drink': {date: 0.0 for date in dates}}
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            blocked = pool.submit(batcher.predict_by_category, BlockedPredictor(), ['2025-04-01'])
+            result = batcher.predict_by_category(SlowPredictor(), ['2025-04-01'])
+            self.assertFalse(blocked.done())
+            released.set()
+            blocked.result()
+
+        self.assertEqual(result, {'food_and_drink': {pd.Timestamp('2025-04-01'): 1.0}})
+
+    def test_errors_reach_every_caller(self):
+        batcher = MicroBatcher(window_ms=1)
+        
+        with self.assertRaises(ValueError):
+            batcher.predict_by_category(FailingPredictor(), ['2025-04-01'])
+
+
+if __name__ == '__main__':
+    unittest.main()
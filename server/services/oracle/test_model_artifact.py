@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from ml.model_artifact import read_artifact, write_artifact
+
+
+class TestModelArtifact(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'model.oracle')
+
+    def test_round_trip(self):
+        arrays = {
+            'weight': np.arange(15, dtype=np.float32).reshape(3, 5),
+            'scale': np.array([0.5, 2.0]),
+            'scalar': np.float64(3.0)
+        }
+        write_artifact(self.path, arrays, {'categories': ['food', 'travel']})
+        
+        header, loaded = read_artifact(self.path)
+        
+        self.assertEqual(header, {'categories': ['food', 'travel']})
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(loaded[name], array)
+            self.assertEqual(loaded[name].dtype, np.asarray(array).dtype)
+            self.assertEqual(loaded[name].ctypes.data % 64, 0)
+            self.assertFalse(loaded[name].flags.writeable)
+
+    def test_string_arrays_rejected(self):
+        with self.assertRaises(ValueError):
+            write_artifact(self.path, {'names': np.array(['food', 'travel'])})
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_not_an_artifact(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\x93NUMPY' + bytes(58))
+        
+        with self.assertRaises(ValueError):
+            read_artifact(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
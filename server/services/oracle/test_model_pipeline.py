@@ -0,0 +1,924 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import torch
+from sklearn.preprocessing import MinMaxScaler
+
+# Same module aliasing as app.py so the bare imports inside ml/ resolve
+from ml import temporal_features
+sys.modules['temporal_features'] = temporal_features
+from ml import feature_transformer
+sys.modules['feature_transformer'] = feature_transformer
+from ml import fused_lstm
+sys.modules['fused_lstm'] = fused_lstm
+from ml import model_artifact
+sys.modules['model_artifact'] = model_artifact
+from ml import inference_pipeline
+sys.modules['inference_pipeline'] = inference_pipeline
+from ml import inference_backends
+sys.modules['inference_backends'] = inference_backends
+from ml import training_plots
+sys.modules['training_plots'] = training_plots
+
+from ml.model_pipeline import (ModelPipeline, LSTMModel, GroupedLSTMModel, category_fingerprint,
+                               create_sequences, split_sequences, stack_to_tensor)
+from ml.fused_lstm import FusedLSTM
+from ml.inference_pipeline import InferencePipeline
+from ml.stateful_forecaster import StatefulForecaster
+
+
+CATEGORIES = ['food_and_drink', 'transportation', 'travel']
+
+
+def build_pipeline(categories=CATEGORIES, seed=0):
+    """Build a small untrained pipeline with fitted transformer and scalers"""
+    torch.manual_seed(seed)
+    rng = np.random.default_rng(seed)
+    
+    history = pd.DataFrame({
+        'datetime': pd.date_range('2023-01-01', '2024-06-30', freq='D'),
+    })
+    history['amount'] = rng.uniform(0, 200, len(history))
+    history['type'] = 'expense'
+    
+    predictor = ModelPipeline()
+    predictor.feature_transformer = feature_transformer.FeatureTransformer()
+    transformed = predictor.feature_transformer.fit_transform(history)
+    feature_columns = [col for col in transformed.select_dtypes(include=[np.number]).columns
+                       if col != 'amount']
+    
+    for category in categories:
+        feature_scaler = MinMaxScaler(feature_range=(0, 1)).fit(transformed[feature_columns])
+        target_scaler = MinMaxScaler(feature_range=(0, 1)).fit(
+            transformed[['amount']] * rng.uniform(0.5, 2.0))
+        predictor.scalers[category] = {
+            'feature_scaler': feature_scaler,
+            'target_scaler': target_scaler,
+            'feature_columns': feature_columns
+        }
+        model = LSTMModel(input_size=len(feature_columns),
+                          hidden_size=predictor.hidden_size,
+                          num_layers=predictor.num_layers)
+        model.eval()
+        predictor.models[category] = model
+    
+    return predictor
+
+
+def predict_date_by_date(predictor, dates):
+    """Reference implementation: one forward pass per date and category"""
+    transformed = predictor.feature_transformer.transform_for_inference(
+        pd.DataFrame({'datetime': pd.to_datetime(dates)}))
+    
+    expected = {category: {} for category in predictor.models}
+    for date in transformed['datetime'].unique():
+        date_data = transformed[transformed['datetime'] == date]
+        for category, model in predictor.models.items():
+            scalers = predictor.scalers[category]
+            scaled = scalers['feature_scaler'].transform(date_data[scalers['feature_columns']])
+            with torch.no_grad():
+                prediction = model(torch.FloatTensor(scaled).unsqueeze(0))
+            expected[category][date] = float(
+                scalers['target_scaler'].inverse_transform(prediction.numpy().reshape(-1, 1))[0][0])
+    return expected
+
+
+class TestCreateSequences(unittest.TestCase):
+    def setUp(self):
+        self.data = np.random.default_rng(0).uniform(size=(50, 6))
+
+    def test_matches_window_loop(self):
+        X, y = create_sequences(self.data, 4, 5)
+        
+        expected_X = np.array([self.data[i:i + 4, :5] for i in range(len(self.data) - 4)])
+        expected_y = np.array([self.data[i + 4, -1] for i in range(len(self.data) - 4)])
+        np.testing.assert_array_equal(X, expected_X)
+        np.testing.assert_array_equal(y, expected_y)
+
+    def test_windows_are_views(self):
+        X, y = create_sequences(self.data, 4, 5)
+        
+        self.assertTrue(np.shares_memory(X, self.data))
+        self.assertTrue(np.shares_memory(y, self.data))
+
+    def test_short_series(self):
+        X, y = create_sequences(self.data[:4], 4, 5)
+        
+        self.assertEqual(X.shape, (0, 4, 5))
+        self.assertEqual(y.shape, (0,))
+
+    def test_stack_to_tensor_matches_np_stack(self):
+        windows = [create_sequences(self.data[:, [i, i + 1, -1]], 4, 2)[0] for i in range(3)]
+        
+        stacked = stack_to_tensor(windows, torch.device('cpu'))
+        
+        self.assertEqual(stacked.dtype, torch.float32)
+        np.testing.assert_array_equal(stacked.numpy(), np.stack(windows).astype(np.float32))
+
+    def test_split_matches_train_test_split(self):
+        from sklearn.model_selection import train_test_split
+        data = np.random.default_rng(1).uniform(size=(200, 6))
+        for length in [5, 46, 47, 101, 196]:
+            X, y = create_sequences(data[:length + 4], 4, 5)
+            
+            for split, expected in zip(split_sequences(X, y, test_size=0.2),
+                                       train_test_split(X, y, test_size=0.2, shuffle=False)):
+                np.testing.assert_array_equal(split, expected)
+
+
+class TestParallelTraining(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        dates = pd.date_range('2023-01-01', '2023-12-31', freq='D')
+        self.transactions = pd.DataFrame({
+            'datetime': np.tile(dates, 2),
+            'amount': rng.uniform(0, 200, 2 * len(dates)),
+            'type': 'expense',
+            'category': np.repeat(['food_and_drink', 'travel'], len(dates))
+        })
+
+    def test_workers_return_models_scalers_and_history(self):
+        predictor = ModelPipeline()
+        predictor.train(self.transactions, num_epochs=2, workers=2)
+        
+        self.assertEqual(predictor.categories, ['food_and_drink', 'travel'])
+        for category in predictor.categories:
+            history = predictor.metadata['training_history'][category]
+            self.assertEqual(history['epochs_trained'], 2)
+            self.assertIn('mae', history)
+            self.assertIn('feature_scaler', predictor.scalers[category])
+            self.assertFalse(predictor.models[category].training)
+        
+        predictions = predictor.predict_by_category(pd.date_range('2024-01-01', periods=7))
+        self.assertTrue(np.isfinite(list(predictions['travel'].values())).all())
+
+
+class TestGroupedTraining(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.models = [LSTMModel(input_size=12).eval() for _ in range(3)]
+        self.x = torch.randn(3, 8, 4, 12)
+        self.y = torch.randn(3, 8)
+
+    def test_forward_matches_each_model(self):
+        grouped_model = GroupedLSTMModel(self.models).eval()
+        with torch.no_grad():
+            outputs = grouped_model(self.x)
+        
+        for index, model in enumerate(self.models):
+            with torch.no_grad():
+                expected = model(self.x[index]).squeeze(-1)
+            torch.testing.assert_close(outputs[index], expected, rtol=1e-5, atol=1e-6)
+
+    def test_optimizer_step_matches_per_category_training(self):
+        import copy
+        grouped_model = GroupedLSTMModel(self.models).eval()
+        optimizer = torch.optim.Adam(grouped_model.parameters(), lr=0.001)
+        loss = ((grouped_model(self.x) - self.y) ** 2).mean(dim=1)
+        loss.sum().backward()
+        optimizer.step()
+        
+        for index, model in enumerate(self.models):
+            model = copy.deepcopy(model)
+            optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+            category_loss = torch.nn.MSELoss()(model(self.x[index]), self.y[index].view(-1, 1))
+            category_loss.backward()
+            optimizer.step()
+            
+            for key, value in grouped_model.category_state_dict(index).items():
+                torch.testing.assert_close(value, model.state_dict()[key], rtol=1e-5, atol=1e-6)
+
+    def test_train_stores_models_scalers_and_history(self):
+        rng = np.random.default_rng(0)
+        dates = pd.date_range('2023-01-01', '2023-06-30', freq='D')
+        transactions = pd.DataFrame({
+            'datetime': np.tile(dates, 2),
+            'amount': rng.uniform(0, 200, 2 * len(dates)),
+            'type': 'expense',
+            'category': np.repeat(['food_and_drink', 'travel'], len(dates))
+        })
+        predictor = ModelPipeline()
+        predictor.train(transactions, num_epochs=2)
+        
+        self.assertEqual(predictor.categories, ['food_and_drink', 'travel'])
+        for category in predictor.categories:
+            history = predictor.metadata['training_history'][category]
+            self.assertEqual(history['epochs_trained'], 2)
+            self.assertEqual(history['training_samples'] + history['validation_samples'], len(dates) - 4)
+            self.assertIn('mae', history)
+            self.assertIsInstance(predictor.models[category], LSTMModel)
+        
+        predictions = predictor.predict_by_category(pd.date_range('2024-01-01', periods=7))
+        self.assertTrue(np.isfinite(list(predictions['travel'].values())).all())
+
+
+class TestIncrementalRetrain(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        dates = pd.date_range('2023-01-01', '2023-06-30', freq='D')
+        self.transactions = pd.DataFrame({
+            'datetime': np.tile(dates, 2),
+            'amount': rng.uniform(0, 200, 2 * len(dates)),
+            'type': 'expense',
+            'category': np.repeat(['food_and_drink', 'travel'], len(dates))
+        })
+        self.cutoff = pd.Timestamp('2023-06-15')
+        self.predictor = ModelPipeline()
+        self.predictor.train(self.transactions[self.transactions['datetime'] <= self.cutoff],
+                             num_epochs=2)
+
+    def test_trains_on_new_transactions_from_current_weights(self):
+        self.transactions.loc[self.transactions['datetime'] > self.cutoff, 'amount'] += 1000
+        weights = self.predictor.models['travel'].fc.weight.detach().clone()
+        transformer = self.predictor.feature_transformer
+        
+        with patch.object(LSTMModel, '__init__', side_effect=AssertionError("not a warm start")):
+            self.predictor.retrain(self.transactions, num_epochs=1, incremental=True)
+        
+        self.assertEqual(self.predictor.metadata['model_version'], '1.1')
+        self.assertEqual(self.predictor.metadata['trained_through'], '2023-06-30T00:00:00')
+        self.assertIs(self.predictor.feature_transformer, transformer)
+        history = self.predictor.metadata['training_history']['travel']
+        # 15 new days plus sequence_length days of context, minus the first window
+        self.assertEqual(history['training_samples'] + history['validation_samples'], 15)
+        self.assertIn('retraining_history', history)
+        
+        target_scaler = self.predictor.scalers['travel']['target_scaler']
+        self.assertEqual(target_scaler.data_min_[0], self.transactions['amount'].min())
+        self.assertGreater(target_scaler.data_max_[0], 1000)
+        # Small update from the previous weights rather than a new initialization
+        self.assertLess((self.predictor.models['travel'].fc.weight - weights).abs().max().item(), 0.01)
+
+    def test_failed_retrain_keeps_scalers_in_use(self):
+        self.transactions.loc[self.transactions['datetime'] > self.cutoff, 'amount'] += 1000
+        models = dict(self.predictor.models)
+        # The first category preprocessed, before split_sequences fails
+        target_scaler = self.predictor.scalers['food_and_drink']['target_scaler']
+        data_max = target_scaler.data_max_.copy()
+        
+        with patch('ml.model_pipeline.split_sequences', side_effect=ValueError("Not enough sequences")):
+            with self.assertRaises(ValueError):
+                self.predictor.retrain(self.transactions, num_epochs=1, incremental=True)
+        
+        self.assertEqual(self.predictor.models, models)
+        self.assertIs(self.predictor.scalers['food_and_drink']['target_scaler'], target_scaler)
+        np.testing.assert_array_equal(target_scaler.data_max_, data_max)
+
+    def test_no_new_transactions_keeps_models(self):
+        models = dict(self.predictor.models)
+        self.predictor.retrain(self.transactions[self.transactions['datetime'] <= self.cutoff],
+                               incremental=True)
+        
+        self.assertEqual(self.predictor.models, models)
+        self.assertEqual(self.predictor.metadata['model_version'], '1.0')
+
+    def test_new_category_trained_on_full_history(self):
+        dates = pd.date_range('2023-01-01', '2023-06-30', freq='D')
+        transactions = pd.concat([self.transactions, pd.DataFrame({
+            'datetime': dates, 'amount': 50.0, 'type': 'expense', 'category': 'transportation'
+        })])
+        self.predictor.retrain(transactions, num_epochs=1, incremental=True)
+        
+        self.assertEqual(self.predictor.categories, ['food_and_drink', 'travel', 'transportation'])
+        history = self.predictor.metadata['training_history']['transportation']
+        self.assertEqual(history['training_samples'] + history['validation_samples'], len(dates) - 4)
+
+
+class TestRetrainChangeDetection(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        dates = pd.date_range('2023-01-01', '2023-06-30', freq='D')
+        self.transactions = pd.DataFrame({
+            'datetime': np.tile(dates, 2),
+            'amount': rng.uniform(0, 200, 2 * len(dates)),
+            'type': 'expense',
+            'category': np.repeat(['food_and_drink', 'travel'], len(dates))
+        })
+        self.predictor = ModelPipeline()
+        self.predictor.train(self.transactions, num_epochs=1)
+
+    def test_fingerprint_ignores_row_order_and_other_categories(self):
+        shuffled = self.transactions.sample(frac=1, random_state=0)
+        shuffled.loc[shuffled['category'] == 'travel', 'amount'] += 1
+        
+        self.assertEqual(category_fingerprint(shuffled, 'food_and_drink'),
+                         category_fingerprint(self.transactions, 'food_and_drink'))
+        self.assertNotEqual(category_fingerprint(shuffled, 'travel'),
+                            category_fingerprint(self.transactions, 'travel'))
+
+    def test_retrain_skips_unchanged_categories(self):
+        food_model = self.predictor.models['food_and_drink']
+        transformer = self.predictor.feature_transformer
+        self.transactions.loc[self.transactions.index[-1], 'amount'] += 1
+        
+        self.predictor.retrain(self.transactions, num_epochs=1)
+        
+        history = self.predictor.metadata['training_history']
+        self.assertIs(self.predictor.models['food_and_drink'], food_model)
+        self.assertIs(self.predictor.feature_transformer, transformer)
+        self.assertEqual(history['food_and_drink']['skipped_retrains'], 1)
+        self.assertGreater(history['food_and_drink']['skipped_seconds'], 0)
+        self.assertNotIn('retraining_history', history['food_and_drink'])
+        self.assertNotIn('skipped_retrains', history['travel'])
+        self.assertIn('retraining_history', history['travel'])
+        self.assertEqual(self.predictor.metadata['model_version'], '1.1')
+        json.dumps(self.predictor.metadata)
+
+    def test_retrain_without_changes_keeps_models(self):
+        models = dict(self.predictor.models)
+        self.predictor.retrain(self.transactions, num_epochs=1)
+        
+        self.assertEqual(self.predictor.models, models)
+        self.assertEqual(self.predictor.metadata['model_version'], '1.0')
+        self.assertEqual(self.predictor.metadata['training_history']['travel']['skipped_retrains'], 1)
+
+    def test_skip_unchanged_false_retrains_everything(self):
+        food_model = self.predictor.models['food_and_drink']
+        self.predictor.retrain(self.transactions, num_epochs=1, skip_unchanged=False)
+        
+        self.assertIsNot(self.predictor.models['food_and_drink'], food_model)
+
+
+class TestTrainingMatrix(unittest.TestCase):
+    def setUp(self):
+        self.transactions = pd.DataFrame({
+            'datetime': pd.to_datetime(['2023-01-01 09:00', '2023-01-01 09:00', '2023-01-01 18:30',
+                                        '2023-01-03 12:00', '2023-01-04 08:00']),
+            'amount': [10.0, 5.0, 20.0, 7.0, 3.0],
+            'type': 'expense',
+            'category': ['food_and_drink', 'food_and_drink', 'travel', 'travel', 'food_and_drink']
+        })
+        self.transformer = feature_transformer.FeatureTransformer()
+        self.df_train = self.transformer.fit_transform(self.transactions)
+        self.predictor = ModelPipeline()
+
+    def test_amounts_summed_per_day_on_a_continuous_calendar(self):
+        features, amounts = self.predictor._build_training_matrix(self.df_train, self.transformer)
+        
+        self.assertEqual(list(amounts.columns), ['food_and_drink', 'travel'])
+        self.assertEqual(list(amounts.index), list(pd.date_range('2023-01-01', '2023-01-04')))
+        np.testing.assert_array_equal(amounts['food_and_drink'], [15.0, 0.0, 0.0, 3.0])
+        np.testing.assert_array_equal(amounts['travel'], [20.0, 0.0, 7.0, 0.0])
+
+    def test_features_match_prediction_features(self):
+        features, _ = self.predictor._build_training_matrix(self.df_train, self.transformer)
+        expected = self.transformer.transform_for_inference(
+            pd.DataFrame({'datetime': pd.date_range('2023-01-01', '2023-01-04')}))
+        
+        pd.testing.assert_frame_equal(features, expected.drop(columns=['type']))
+
+    def test_category_frame_slices_the_matrix(self):
+        matrix = self.predictor._build_training_matrix(self.df_train, self.transformer, ['travel'])
+        category_df = self.predictor._build_category_frame(matrix, 'travel', start=2)
+        
+        self.assertEqual(list(matrix[1].columns), ['travel'])
+        self.assertEqual(list(category_df['datetime']), list(pd.date_range('2023-01-03', '2023-01-04')))
+        self.assertEqual(list(category_df['amount']), [7.0, 0.0])
+        self.assertTrue((category_df['category'] == 'travel').all())
+
+
+class TestTrainingPlots(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        dates = pd.date_range('2023-01-01', '2023-03-31', freq='D')
+        self.transactions = pd.DataFrame({
+            'datetime': np.tile(dates, 2),
+            'amount': rng.uniform(0, 200, 2 * len(dates)),
+            'type': 'expense',
+            'category': np.repeat(['food_and_drink', 'travel'], len(dates))
+        })
+
+    def test_plots_off_by_default(self):
+        predictor = ModelPipeline()
+        predictor.train(self.transactions, num_epochs=1)
+        
+        self.assertIsNone(predictor._plot_series)
+        self.assertIsNone(predictor._plot_process)
+
+    def test_plots_render_in_background_from_recorded_series(self):
+        preprocess_data = ModelPipeline.preprocess_data
+        preprocessed = []
+        def counting_preprocess(pipeline, df, category, refit=True):
+            preprocessed.append(category)
+            return preprocess_data(pipeline, df, category, refit)
+        
+        predictor = ModelPipeline()
+        with tempfile.TemporaryDirectory() as plot_dir:
+            with patch.object(ModelPipeline, 'preprocess_data', counting_preprocess):
+                predictor.train(self.transactions, num_epochs=1, plots=True, plot_dir=plot_dir)
+            predictor.wait_for_plots(timeout=120)
+            
+            self.assertEqual(predictor._plot_process.exitcode, 0)
+            self.assertEqual(sorted(os.listdir(os.path.join(plot_dir, 'plots'))),
+                             ['food_and_drink_prediction.png', 'total_predictions.png',
+                              'travel_prediction.png'])
+        # Scalers fitted once by training, not again for the plots
+        self.assertEqual(preprocessed, ['food_and_drink', 'travel'])
+        self.assertIsNone(predictor._plot_series)
+
+
+class TestModelPipelinePredict(unittest.TestCase):
+    def setUp(self):
+        self.predictor = build_pipeline()
+        self.dates = pd.date_range('2025-04-01', '2025-06-29', freq='D')
+        self.expected = predict_date_by_date(self.predictor, self.dates)
+
+    def test_predict_by_category_matches_per_date(self):
+        predictions = self.predictor.predict_by_category(self.dates)
+        
+        self.assertEqual(sorted(predictions), sorted(CATEGORIES))
+        for category in CATEGORIES:
+            self.assertEqual(list(predictions[category]), list(self.dates))
+            np.testing.assert_allclose(
+                list(predictions[category].values()),
+                list(self.expected[category].values()),
+                rtol=1e-5, atol=1e-4)
+
+    def test_predict_sums_categories(self):
+        predictions = self.predictor.predict(self.dates)
+        
+        self.assertEqual(list(predictions), list(self.dates))
+        for date, amount in predictions.items():
+            expected_total = sum(self.expected[category][date] for category in CATEGORIES)
+            self.assertAlmostEqual(float(amount), expected_total, places=2)
+
+    def test_duplicate_dates_predicted_once(self):
+        dates = list(self.dates[:5]) + list(self.dates[:5])
+        predictions = self.predictor.predict(dates)
+        
+        self.assertEqual(list(predictions), list(self.dates[:5]))
+
+
+class TestFusedEngine(unittest.TestCase):
+    def setUp(self):
+        self.predictor = build_pipeline()
+        self.dates = pd.date_range('2025-04-01', '2025-06-29', freq='D')
+        self.expected = predict_date_by_date(self.predictor, self.dates)
+        self.predictor._build_engine()
+
+    def test_engine_built_for_all_categories(self):
+        self.assertIsNotNone(self.predictor.engine)
+        self.assertEqual(self.predictor.engine.categories, CATEGORIES)
+
+    def test_engine_matches_per_category_models(self):
+        predictions = self.predictor.predict_by_category(self.dates)
+        
+        for category in CATEGORIES:
+            np.testing.assert_allclose(
+                list(predictions[category].values()),
+                list(self.expected[category].values()),
+                rtol=1e-5, atol=1e-4)
+
+    def test_engine_matches_torch_on_sequences(self):
+        features = np.random.default_rng(1).uniform(0, 1, (16, 4, 10))
+        engine_predictions = self.predictor.engine.predict(features)
+        
+        for index, category in enumerate(CATEGORIES):
+            scalers = self.predictor.scalers[category]
+            flat = pd.DataFrame(features.reshape(-1, 10), columns=scalers['feature_columns'])
+            scaled = scalers['feature_scaler'].transform(flat).reshape(16, 4, 10)
+            with torch.no_grad():
+                prediction = self.predictor.models[category](torch.FloatTensor(scaled)).numpy()
+            expected = scalers['target_scaler'].inverse_transform(prediction)[:, 0]
+            np.testing.assert_allclose(engine_predictions[index], expected, rtol=1e-5, atol=1e-4)
+
+    def test_mismatched_features_rejected(self):
+        self.predictor.scalers['travel']['feature_columns'] = \
+            self.predictor.scalers['travel']['feature_columns'][::-1]
+        
+        with self.assertRaises(ValueError):
+            FusedLSTM.from_pipeline(self.predictor.models, self.predictor.scalers)
+
+
+class TestForecastHorizon(unittest.TestCase):
+    def setUp(self):
+        self.predictor = build_pipeline()
+        self.predictor._build_engine()
+        self.dates = pd.date_range('2025-04-20', '2025-05-10', freq='D')
+        self.expected = self.predictor.predict_by_category(self.dates)
+        self.predictor.build_forecast_horizon(horizon_days=30, start_date='2025-04-01')
+
+    def test_metadata_reports_build(self):
+        horizon = self.predictor.metadata['forecast_horizon']
+        
+        self.assertEqual(horizon['start_date'], '2025-04-01')
+        self.assertEqual(horizon['end_date'], '2025-04-30')
+        self.assertEqual(horizon['memory_bytes'], 3 * 30 * 4 + 30 * 8)
+
+    def test_range_partly_outside_horizon_matches_live(self):
+        predictions = self.predictor.predict_by_category(self.dates)
+        
+        for category in CATEGORIES:
+            self.assertEqual(list(predictions[category]), list(self.dates))
+            np.testing.assert_allclose(list(predictions[category].values()),
+                                       list(self.expected[category].values()), rtol=1e-6)
+
+    def test_range_inside_horizon_skips_inference(self):
+        self.predictor.engine = None
+        self.predictor.models = {category: None for category in CATEGORIES}
+        
+        predictions = self.predictor.predict(pd.date_range('2025-04-20', '2025-04-30'))
+        
+        for date, amount in predictions.items():
+            self.assertAlmostEqual(
+                float(amount), sum(self.expected[category][date] for category in CATEGORIES), places=3)
+
+
+class TestInferencePipeline(unittest.TestCase):
+    def setUp(self):
+        self.predictor = build_pipeline()
+        self.predictor._build_engine()
+        self.dates = pd.date_range('2025-04-01', '2025-04-30', freq='D')
+        self.save_dir = tempfile.mkdtemp()
+        self.predictor.save(self.save_dir)
+
+    def test_export_matches_model_pipeline(self):
+        loaded = InferencePipeline.load(self.save_dir)
+        
+        self.assertEqual(loaded.categories, CATEGORIES)
+        self.assertEqual(loaded.metadata['model_version'], '1.0')
+        expected = self.predictor.predict_by_category(self.dates)
+        predictions = loaded.predict_by_category(self.dates)
+        for category in CATEGORIES:
+            self.assertEqual(predictions[category], expected[category])
+
+    def test_save_with_non_fused_backend_rewrites_export(self):
+        predictor = ModelPipeline.load(self.save_dir, backend='eager')
+        self.assertIsNone(predictor.engine)
+        with torch.no_grad():
+            predictor.models['travel'].fc.bias += 1.0
+        predictor.metadata['model_version'] = '1.1'
+        expected = predictor.predict_by_category(self.dates)
+        
+        predictor.save(self.save_dir)
+        loaded = InferencePipeline.load(self.save_dir)
+        
+        self.assertEqual(loaded.metadata['model_version'], '1.1')
+        predictions = loaded.predict_by_category(self.dates)
+        for category in CATEGORIES:
+            np.testing.assert_allclose(list(predictions[category].values()),
+                                       list(expected[category].values()), rtol=1e-5, atol=1e-4)
+
+    def test_save_removes_export_that_cannot_be_fused(self):
+        predictor = ModelPipeline.load(self.save_dir, backend='eager')
+        predictor.scalers['travel']['feature_columns'] = predictor.scalers['travel']['feature_columns'][::-1]
+        
+        predictor.save(self.save_dir)
+        
+        self.assertFalse(os.path.exists(os.path.join(self.save_dir, InferencePipeline.EXPORT_FILE)))
+
+    def test_share_memory_keeps_predictions(self):
+        loaded = InferencePipeline.load(self.save_dir)
+        loaded.build_forecast_horizon(horizon_days=10, start_date='2025-04-01')
+        expected = loaded.predict_by_category(self.dates)
+        
+        loaded.share_memory()
+        
+        self.assertEqual(loaded.predict_by_category(self.dates), expected)
+        self.assertFalse(loaded.engine.weights['lstm1_weight_ih'].flags.writeable)
+        self.assertFalse(loaded.forecast_horizon['values'].flags.writeable)
+
+    def test_predict_subset_of_categories(self):
+        loaded = InferencePipeline.load(self.save_dir)
+        expected = loaded.predict_by_category(self.dates)
+        loaded.build_forecast_horizon(horizon_days=10, start_date='2025-04-01')
+        
+        predictions = loaded.predict_by_category(self.dates, categories=['travel', 'unknown'])
+        
+        self.assertEqual(predictions, {'travel': expected['travel']})
+
+    def test_weights_mapped_from_single_file(self):
+        loaded = InferencePipeline.load(self.save_dir)
+        
+        weights = loaded.engine.weights['lstm1_weight_ih']
+        self.assertTrue(loaded.file_mapped)
+        self.assertFalse(weights.flags.writeable)
+        self.assertFalse(weights.flags.owndata)
+        self.assertEqual(weights.ctypes.data % 64, 0)
+        # Only the forecast table still needs moving into shared memory
+        loaded.build_forecast_horizon(horizon_days=10, start_date='2025-04-01')
+        self.assertLess(loaded.share_memory(), loaded.forecast_horizon['values'].nbytes + 64)
+        self.assertIs(loaded.engine.weights['lstm1_weight_ih'], weights)
+
+    def test_convert_model_dir(self):
+        os.remove(os.path.join(self.save_dir, InferencePipeline.EXPORT_FILE))
+        server_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = subprocess.run([sys.executable, 'ml/convert_model.py', self.save_dir],
+                                cwd=server_dir, capture_output=True, text=True)
+        
+        self.assertEqual(result.returncode, 0, result.stderr)
+        loaded = InferencePipeline.load(self.save_dir)
+        self.assertEqual(loaded.predict_by_category(self.dates),
+                         self.predictor.predict_by_category(self.dates))
+
+    def test_load_without_torch(self):
+        # Make torch unimportable in a fresh interpreter
+        code = (
+            "import sys; sys.path.insert(0, 'ml')\n"
+            "class BlockTorch:\n"
+            "    def find_spec(self, name, path=None, target=None):\n"
+            "        if name.split('.')[0] == 'torch':\n"
+            "            raise ImportError(name)\n"
+            "sys.meta_path.insert(0, BlockTorch())\n"
+            "import pandas as pd\n"
+            "from inference_pipeline import InferencePipeline\n"
+            f"predictor = InferencePipeline.load({self.save_dir!r})\n"
+            "print(len(predictor.predict(pd.date_range('2025-04-01', periods=7))))\n"
+        )
+        server_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = subprocess.run([sys.executable, '-c', code], cwd=server_dir,
+                                capture_output=True, text=True)
+        
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], '7')
+
+
+class TestDropoutIntervals(unittest.TestCase):
+    def setUp(self):
+        self.predictor = build_pipeline()
+        self.predictor._build_engine()
+        self.dates = pd.date_range('2025-04-01', '2025-04-30', freq='D')
+
+    def test_bands_around_point_forecast(self):
+        point = self.predictor.predict_by_category(self.dates)
+        
+        intervals = self.predictor.predict_by_category(self.dates, quantiles=(0.05, 0.5, 0.95),
+                                                       samples=64, seed=0)
+        
+        for category in CATEGORIES:
+            self.assertEqual(list(intervals[category]), list(point[category]))
+            for date, interval in intervals[category].items():
+                self.assertEqual(interval['prediction'], point[category][date])
+                bands = interval['quantiles']
+                self.assertLessEqual(bands[0.05], bands[0.5])
+                self.assertLessEqual(bands[0.5], bands[0.95])
+                self.assertLess(bands[0.05], bands[0.95])
+
+    def test_seed_reproducible(self):
+        first = self.predictor.predict_by_category(self.dates, quantiles=(0.1, 0.9), seed=3)
+        second = self.predictor.predict_by_category(self.dates, quantiles=(0.1, 0.9), seed=3)
+        
+        self.assertEqual(first, second)
+
+    def test_samples_run_as_one_batch(self):
+        batch_sizes = []
+        for model in self.predictor.models.values():
+            model.register_forward_hook(lambda module, args, output: batch_sizes.append(len(output)))
+        
+        self.predictor.predict_by_category(self.dates, quantiles=(0.1, 0.9), samples=16)
+        
+        self.assertEqual(batch_sizes, [16 * len(self.dates)] * len(CATEGORIES))
+        self.assertFalse(any(model.training for model in self.predictor.models.values()))
+
+    def test_without_dropout_bands_collapse(self):
+        for model in self.predictor.models.values():
+            model.dropout1.p = model.dropout2.p = 0.0
+        point = self.predictor.predict_by_category(self.dates)
+        
+        intervals = self.predictor.predict_by_category(self.dates, quantiles=(0.05, 0.95), samples=4)
+        
+        for category in CATEGORIES:
+            for date, interval in intervals[category].items():
+                np.testing.assert_allclose(list(interval['quantiles'].values()),
+                                           [point[category][date]] * 2, rtol=1e-5, atol=1e-4)
+
+
+class TestStatefulForecaster(unittest.TestCase):
+    def setUp(self):
+        self.predictor = build_pipeline()
+        self.predictor._build_engine()
+        self.dates = pd.date_range('2025-04-01', '2025-04-10', freq='D')
+        transformed = self.predictor._prepare_prediction_data(self.dates)
+        self.features = transformed[self.predictor.engine.feature_columns].to_numpy()
+
+    def test_steps_match_full_sequence(self):
+        engine = self.predictor.engine
+        state = engine.initial_state()
+        
+        for length in range(1, len(self.dates) + 1):
+            prediction, state = engine.step(self.features[length - 1], state)
+            expected = engine.predict(self.features[None, :length])[:, 0]
+            np.testing.assert_allclose(prediction, expected, rtol=1e-5, atol=1e-4)
+
+    def test_first_day_matches_stateless_predict(self):
+        # From a zero state, the first step is the stateless length-1 prediction
+        forecaster = StatefulForecaster(self.predictor)
+        forecaster.last_date = self.dates[0] - pd.Timedelta(days=1)
+        
+        forecast = forecaster.forecast(1)
+        expected = self.predictor.predict_by_category(self.dates[:1])
+        for category in CATEGORIES:
+            self.assertAlmostEqual(forecast[category][self.dates[0]],
+                                   expected[category][self.dates[0]], places=3)
+
+    def test_update_advances_one_step_per_day(self):
+        forecaster = StatefulForecaster(self.predictor)
+        
+        self.assertEqual(forecaster.update(self.dates[0]), 1)
+        self.assertEqual(forecaster.update(self.dates[0]), 0)
+        self.assertEqual(forecaster.update(self.dates[4]), 4)
+        
+        # Same state as stepping through the five days directly
+        state = self.predictor.engine.initial_state()
+        for features in self.features[:5]:
+            _, state = self.predictor.engine.step(features, state)
+        for name in state:
+            np.testing.assert_allclose(forecaster.state[name], state[name])
+
+    def test_forecast_rolls_forward_without_committing(self):
+        forecaster = StatefulForecaster(self.predictor)
+        forecaster.update(self.dates[4])
+        
+        forecast = forecaster.forecast(5)
+        
+        self.assertEqual(list(forecast[CATEGORIES[0]]), list(self.dates[5:]))
+        self.assertEqual(forecaster.last_date, self.dates[4])
+        # Forecasting day by day with update() gives the same values
+        for date in self.dates[5:]:
+            expected = forecaster.forecast(1)
+            forecaster.update(date)
+            for category in CATEGORIES:
+                self.assertAlmostEqual(forecast[category][date], expected[category][date], places=3)
+
+    def test_save_and_load_state(self):
+        forecaster = StatefulForecaster(self.predictor)
+        forecaster.update(self.dates[4])
+        path = os.path.join(tempfile.mkdtemp(), StatefulForecaster.STATE_FILE)
+        
+        forecaster.save(path)
+        restored = StatefulForecaster.load(self.predictor, path)
+        
+        self.assertEqual(restored.last_date, self.dates[4])
+        self.assertEqual(restored.forecast(3), forecaster.forecast(3))
+        self.predictor.metadata['model_version'] = '2.0'
+        with self.assertRaises(ValueError):
+            StatefulForecaster.load(self.predictor, path)
+
+
+class TestLazyLoad(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.save_dir = tempfile.mkdtemp()
+        build_pipeline().save(cls.save_dir)
+        cls.dates = pd.date_range('2025-04-01', '2025-04-30', freq='D')
+        cls.eager = ModelPipeline.load(cls.save_dir, backend='eager').predict_by_category(cls.dates)
+        cls.fused = ModelPipeline.load(cls.save_dir).predict_by_category(cls.dates)
+
+    def test_load_only_indexes_categories(self):
+        predictor = ModelPipeline.load(self.save_dir, lazy=True)
+        
+        self.assertEqual(sorted(predictor.categories), CATEGORIES)
+        self.assertEqual(predictor.models, {})
+        self.assertIsNone(predictor.engine)
+
+    def test_category_materialized_on_first_use(self):
+        predictor = ModelPipeline.load(self.save_dir, lazy=True)
+        
+        predictions = predictor.predict_by_category(self.dates, categories=['travel'])
+        
+        self.assertEqual(list(predictor.models), ['travel'])
+        self.assertEqual(predictions, {'travel': self.eager['travel']})
+
+    def test_fused_engine_built_once_all_loaded(self):
+        predictor = ModelPipeline.load(self.save_dir, lazy=True)
+        predictor.predict_by_category(self.dates, categories=['travel'])
+        
+        predictor.materialize()
+        
+        self.assertIsNotNone(predictor.engine)
+        self.assertEqual(predictor.predict_by_category(self.dates), self.fused)
+
+    def test_background_warm_up(self):
+        predictor = ModelPipeline.load(self.save_dir, horizon_days=30, lazy=True, warm_up=True)
+        predictor.wait_for_warm_up(timeout=60)
+        
+        self.assertEqual(sorted(predictor.models), CATEGORIES)
+        self.assertIsNotNone(predictor.engine)
+        self.assertEqual(len(predictor.forecast_horizon['dates']), 30)
+
+    def test_save_materializes_everything(self):
+        save_dir = tempfile.mkdtemp()
+        ModelPipeline.load(self.save_dir, lazy=True).save(save_dir)
+        
+        self.assertEqual(ModelPipeline.load(save_dir).predict_by_category(self.dates), self.fused)
+
+
+class TestImportGraph(unittest.TestCase):
+    def imported_modules(self, *modules):
+        """Modules loaded by importing the given ml modules in a fresh interpreter"""
+        code = ("import sys; sys.path.insert(0, 'ml')\n"
+                + ''.join(f"import {module}\n" for module in modules)
+                + "print(' '.join(sys.modules))\n")
+        server_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = subprocess.run([sys.executable, '-c', code], cwd=server_dir,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return set(result.stdout.split())
+
+    def test_serving_modules_skip_training_dependencies(self):
+        modules = self.imported_modules('inference_pipeline', 'forecast_cache',
+                                        'micro_batcher', 'model_registry')
+        
+        for heavy in ['torch', 'sklearn', 'scipy', 'matplotlib']:
+            self.assertNotIn(heavy, modules)
+
+    def test_model_pipeline_defers_plotting_and_training(self):
+        modules = self.imported_modules('model_pipeline')
+        
+        for heavy in ['matplotlib', 'sklearn.model_selection', 'sklearn.metrics']:
+            self.assertNotIn(heavy, modules)
+
+
+class TestInferenceBackends(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.save_dir = tempfile.mkdtemp()
+        build_pipeline().save(cls.save_dir)
+        cls.dates = pd.date_range('2025-04-01', '2025-04-30', freq='D')
+        cls.expected = ModelPipeline.load(cls.save_dir, backend='eager').predict_by_category(cls.dates)
+
+    def assert_matches_eager(self, backend):
+        predictions = ModelPipeline.load(self.save_dir, backend=backend).predict_by_category(self.dates)
+        
+        for category in CATEGORIES:
+            np.testing.assert_allclose(list(predictions[category].values()),
+                                       list(self.expected[category].values()), rtol=1e-5, atol=1e-4)
+
+    def test_fused(self):
+        self.assert_matches_eager('fused')
+
+    def test_torchscript(self):
+        self.assert_matches_eager('torchscript')
+
+    def test_onnx(self):
+        try:
+            import onnxruntime
+        except ImportError:
+            self.skipTest('onnxruntime is not installed')
+        self.assert_matches_eager('onnx')
+
+    def test_quantized(self):
+        predictions = ModelPipeline.load(self.save_dir, backend='quantized').predict_by_category(self.dates)
+        
+        for category in CATEGORIES:
+            np.testing.assert_allclose(list(predictions[category].values()),
+                                       list(self.expected[category].values()), rtol=0.05)
+
+    def test_quantized_keeps_only_int8_weights_resident(self):
+        quantized = ModelPipeline.load(self.save_dir, backend='quantized')
+        eager = ModelPipeline.load(self.save_dir, backend='eager')
+        
+        for model in quantized.models.values():
+            self.assertFalse(any(type(module) is torch.nn.LSTM for module in model.modules()))
+        self.assertLess(quantized.memory_bytes(), eager.memory_bytes() / 2)
+        
+        # fp32 weights come back from disk for dropout bands, once, and for save()
+        bands = quantized.predict_by_category(self.dates[:3], quantiles=[0.5], samples=5, seed=0)
+        self.assertEqual(sorted(bands), sorted(CATEGORIES))
+        with patch('ml.model_pipeline.torch.load', side_effect=AssertionError("read from disk")):
+            quantized.predict_by_category(self.dates[:3], quantiles=[0.5], samples=5, seed=0)
+        save_dir = tempfile.mkdtemp()
+        quantized.save(save_dir)
+        predictions = ModelPipeline.load(save_dir, backend='eager').predict_by_category(self.dates)
+        for category in CATEGORIES:
+            self.assertEqual(predictions[category], self.expected[category])
+
+    def test_quantization_report(self):
+        rng = np.random.default_rng(0)
+        transactions = pd.DataFrame({
+            'datetime': pd.date_range('2023-01-01', periods=300, freq='D'),
+            'amount': rng.uniform(0, 100, 300),
+            'type': 'expense',
+            'category': rng.choice(CATEGORIES, 300)
+        })
+        
+        report = ModelPipeline.load(self.save_dir).quantization_report(transactions)
+        
+        self.assertEqual(sorted(report), sorted(CATEGORIES))
+        for metrics in report.values():
+            self.assertEqual(metrics['validation_samples'], 60)
+            self.assertAlmostEqual(metrics['int8_mae'], metrics['fp32_mae'], delta=0.05 * metrics['fp32_mae'])
+            self.assertLess(metrics['int8_bytes'], metrics['fp32_bytes'])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            ModelPipeline.load(self.save_dir, backend='tensorrt')
+
+    def test_compare_backends_reports_every_backend(self):
+        results = ModelPipeline.compare_backends(self.save_dir, self.dates,
+                                                 backends=('eager', 'fused'), repeats=2)
+        
+        self.assertEqual(set(results), {'eager', 'fused'})
+        self.assertEqual(results['eager']['max_abs_diff'], 0.0)
+        self.assertLess(results['fused']['max_abs_diff'], 1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
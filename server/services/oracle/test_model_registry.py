@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from ml.model_registry import ModelRegistry
+
+
+class FakePipeline:
+    def __init__(self, model_dir, nbytes):
+        self.model_dir = model_dir
+        self.nbytes = nbytes
+
+    def memory_bytes(self):
+        return self.nbytes
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        for user_id in ['alice', 'bob', 'carol']:
+            os.makedirs(os.path.join(self.root_dir, user_id))
+        self.loaded = []
+        self._lock = threading.Lock()
+
+    def tearDown(self):
+        shutil.rmtree(self.root_dir)
+
+    def loader(self, model_dir):
+        with self._lock:
+            self.loaded.append(model_dir)
+        time.sleep(0.01)
+        return FakePipeline(model_dir, 100)
+
+    def registry(self, max_bytes=1000):
+        return ModelRegistry(self.loader, root_dir=self.root_dir, default_dir='default',
+                             max_bytes=max_bytes)
+
+    def test_lazy_load_and_hit(self):
+        registry = self.registry()
+        
+        first = registry.get('alice')
+        second = registry.get('alice')
+        
+        self.assertIs(first, second)
+        self.assertEqual(self.loaded, [os.path.join(self.root_dir, 'alice')])
+        stats = registry.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['loads']), (1, 1, 1))
+
+    def test_users_without_model_share_default(self):
+        registry = self.registry()
+        
+        self.assertIs(registry.get('dave'), registry.get('erin'))
+        self.assertEqual(self.loaded, ['default'])
+
+    def test_lru_eviction_keeps_default(self):
+        registry = self.registry(max_bytes=200)
+        registry.get()
+        registry.get('alice')
+        registry.get('bob')
+        registry.get('alice')
+        registry.get('carol')
+        
+        resident = {pipeline.model_dir for pipeline in registry.resident()}
+        self.assertEqual(resident, {'default', os.path.join(self.root_dir, 'alice'),
+                                    os.path.join(self.root_dir, 'carol')})
+        self.assertEqual(registry.stats()['evictions'], 1)
+
+    def test_default_model_is_outside_the_budget(self):
+        sizes = {'default': 400, os.path.join(self.root_dir, 'alice'): 200}
+        registry = ModelRegistry(lambda model_dir: FakePipeline(model_dir, sizes[model_dir]),
+                                 root_dir=self.root_dir, default_dir='default', max_bytes=512)
+        registry.get()
+        
+        for _ in range(5):
+            registry.get('alice')
+        
+        stats = registry.stats()
+        self.assertEqual((stats['loads'], stats['evictions'], stats['hits']), (2, 0, 4))
+        self.assertEqual(stats['resident_models'], 2)
+
+    def test_model_larger_than_budget_stays_for_its_caller(self):
+        registry = self.registry(max_bytes=50)
+        
+        alice = registry.get('alice')
+        
+        self.assertIs(registry.get('alice'), alice)
+        self.assertEqual(registry.stats()['evictions'], 0)
+
+    def test_concurrent_first_requests_load_once(self):
+        registry = self.registry()
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            pipelines = list(pool.map(lambda _: registry.get('bob'), range(8)))
+        
+        self.assertEqual(len(self.loaded), 1)
+        self.assertTrue(all(pipeline is pipelines[0] for pipeline in pipelines))
+
+    def test_invalid_user_id(self):
+        with self.assertRaises(ValueError):
+            self.registry().get('../oracle_v1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ml.scenario_engine import ScenarioEngine
+
+
+def apply_scenario_date_by_date(predictions_by_category, dates, scenario):
+    """Reference implementation: the per-date loops predict_params used to run"""
+    totals = {}
+    for date in dates:
+        totals[date] = sum(predictions.get(date, 0) for predictions in predictions_by_category.values())
+    for scenario_type, sign in [('skip_expense', -1), ('new_expense', 1), ('reduce_expense', -1)]:
+        settings = scenario.get(scenario_type, {})
+        if not settings.get('active') or settings['category'] not in predictions_by_category:
+            continue
+        percent = 1.0 if scenario_type == 'skip_expense' else float(settings['percent'])
+        for date in dates:
+            totals[date] += sign * predictions_by_category[settings['category']].get(date, 0) * percent
+    return [totals[date] for date in dates]
+
+
+class TestScenarioEngine(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.dates = pd.date_range('2025-04-01', '2025-04-30', freq='D')
+        self.predictions = {
+            category: {date: float(amount) for date, amount in zip(self.dates, rng.uniform(0, 100, 30))}
+            for category in ['food_and_drink', 'travel', 'entertainment']
+        }
+        # A date without a forecast counts as 0
+        del self.predictions['travel'][self.dates[3]]
+        self.engine = ScenarioEngine.from_predictions(self.predictions, self.dates)
+        self.scenarios = [
+            {},
+            {'skip_expense': {'category': 'travel', 'active': True}},
+            {'new_expense': {'category': 'food_and_drink', 'active': True, 'percent': '0.25'},
+             'reduce_expense': {'category': 'entertainment', 'active': True, 'percent': 0.5}},
+            {'skip_expense': {'category': 'travel', 'active': False},
+             'reduce_expense': {'category': 'travel', 'active': True, 'percent': 0.1},
+             'new_expense': {'category': 'unknown', 'active': True, 'percent': 3}},
+        ]
+
+    def test_baseline_sums_categories(self):
+        expected = apply_scenario_date_by_date(self.predictions, self.dates, {})
+        
+        np.testing.assert_allclose(self.engine.baseline(), expected)
+
+    def test_matches_date_by_date(self):
+        totals = self.engine.apply(self.scenarios)
+        
+        self.assertEqual(totals.shape, (len(self.scenarios), len(self.dates)))
+        for scenario, scenario_totals in zip(self.scenarios, totals):
+            np.testing.assert_allclose(
+                scenario_totals, apply_scenario_date_by_date(self.predictions, self.dates, scenario))
+
+    def test_multipliers(self):
+        multipliers = self.engine.multipliers(self.scenarios[1:3])
+        
+        np.testing.assert_allclose(multipliers, [[1.0, 0.0, 1.0], [1.25, 1.0, 0.5]])
+
+    def test_invalid_percent(self):
+        with self.assertRaises(ValueError):
+            self.engine.apply([{'new_expense': {'category': 'travel', 'active': True, 'percent': 'x'}}])
+
+
+if __name__ == '__main__':
+    unittest.main()
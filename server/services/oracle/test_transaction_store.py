@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Same module aliasing as app.py so the bare imports inside ml/ resolve
+from ml import model_artifact
+sys.modules['model_artifact'] = model_artifact
+
+from ml import transaction_store
+from ml.transaction_store import cache_path, load_transactions, load_transactions_dir
+
+
+CSV = """account_id,transaction_id,date,time,activity,amount,category,type,vendor_name
+user_a,1,2023-01-01,11:53,food_and_drink,10.11,food_and_drink,expense,starbucks
+user_a,2,2023-01-01,9:00,monthly_salary,3932.41,income,income,employer
+user_a,3,2023-01-02,10:5,travel,250.0,travel,expense,airline
+"""
+
+
+class TestTransactionStore(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.path = self.write_csv('financial_transactions.csv', CSV)
+
+    def write_csv(self, name, content):
+        path = os.path.join(self.data_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_schema(self):
+        df = load_transactions(self.path)
+
+        self.assertEqual(list(df.columns), ['account_id', 'transaction_id', 'activity', 'amount',
+                                            'category', 'type', 'vendor_name', 'datetime'])
+        for column in ['account_id', 'activity', 'category', 'type', 'vendor_name']:
+            self.assertIsInstance(df[column].dtype, pd.CategoricalDtype)
+        self.assertEqual(df['amount'].dtype, np.float32)
+        self.assertEqual(df['transaction_id'].dtype, np.int64)
+        self.assertEqual(list(df['datetime']), list(pd.to_datetime(
+            ['2023-01-01 11:53', '2023-01-01 09:00', '2023-01-02 10:05'])))
+
+    def test_second_load_reads_cache(self):
+        parsed = load_transactions(self.path)
+        self.assertTrue(os.path.exists(cache_path(self.path)))
+
+        with patch.object(transaction_store, 'parse_transactions', side_effect=AssertionError("parsed")):
+            cached = load_transactions(self.path)
+
+        pd.testing.assert_frame_equal(cached, parsed)
+
+    def test_columns_subset(self):
+        load_transactions(self.path)
+        df = load_transactions(self.path, ['amount', 'type', 'datetime', 'category'])
+
+        self.assertEqual(list(df.columns), ['amount', 'type', 'datetime', 'category'])
+        self.assertEqual(list(df['type']), ['expense', 'income', 'expense'])
+        with self.assertRaises(ValueError):
+            load_transactions(self.path, ['date'])
+
+    def test_changed_source_is_parsed_again(self):
+        load_transactions(self.path)
+        with open(self.path, 'a') as f:
+            f.write("user_a,4,2023-01-03,12:00,travel,99.5,travel,expense,hotel\n")
+
+        df = load_transactions(self.path)
+
+        self.assertEqual(len(df), 4)
+        self.assertIn('hotel', df['vendor_name'].cat.categories)
+
+    def test_touched_source_keeps_cache(self):
+        load_transactions(self.path)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with patch.object(transaction_store, 'parse_transactions', side_effect=AssertionError("parsed")):
+            df = load_transactions(self.path)
+        self.assertEqual(len(df), 3)
+        
+        # The new mtime is recorded, the next load does not hash the CSV again
+        with patch.object(transaction_store, '_file_sha256', side_effect=AssertionError("hashed")):
+            pd.testing.assert_frame_equal(load_transactions(self.path), df)
+
+    def test_load_dir_unions_categoricals(self):
+        self.write_csv('financial_transactions_1.csv', CSV.replace('user_a', 'user_b').replace('airline', 'rail'))
+
+        df = load_transactions_dir(self.data_dir, ['account_id', 'vendor_name', 'amount'])
+
+        self.assertEqual(len(df), 6)
+        self.assertEqual(sorted(df['account_id'].cat.categories), ['user_a', 'user_b'])
+        self.assertEqual(list(df['vendor_name'][-1:]), ['rail'])
+        self.assertEqual(df['amount'].dtype, np.float32)
+
+
+if __name__ == '__main__':
+    unittest.main()